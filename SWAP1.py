@@ -1,17 +1,25 @@
+import argparse
+import math
 import pygame
 import sys
-pygame.init()
+
+from asset_manager import AssetManager
+from swap_board import UP, DOWN, LEFT, RIGHT, Board, goal_mask
+from swap_generator import load_board_sets
+from swap_input import InputHandler, now_ms
+from text_cache import render_text
 
 # --- Screen Setup ---
+# The window and fonts are created by setup() from main(), so importing this
+# module doesn't open a window or initialise pygame
 WIDTH, HEIGHT = 1000, 700
-WIN = pygame.display.set_mode((WIDTH, HEIGHT))
-pygame.display.set_caption("Quad Multiplayer Grid Game")
+WIN = None
+FONT = BIG_FONT = None
+ASSETS = AssetManager()
 
 # --- Constants ---
 WHITE, BLACK, GRAY, BUTTON_COLOR = (255,255,255), (0,0,0), (200,200,200), (180,180,250)
-FONT = pygame.font.SysFont(None, 30)
-BIG_FONT = pygame.font.SysFont(None, 50)
-TILE_SIZE, ROWS, COLS = 50, 5, 5
+TILE_SIZE = 50
 center_tile = pygame.Rect(WIDTH//2 - TILE_SIZE//2, HEIGHT//2 - TILE_SIZE//2, TILE_SIZE, TILE_SIZE)
 winner = None
 
@@ -24,54 +32,67 @@ player_keys = [
 ]
 grid_offsets = [(100,50),(WIDTH-350,50),(100,HEIGHT-300),(WIDTH-350,HEIGHT-300)]
 
-player_matrices = {
-    "P1": [['X','.','.','X','X'],['.','S','.','.','X'],['X','.','X','.','X'],['X','.','.','.','X'],['X','X','X','X','X']],
-    "P2": [['X','X','.','S','X'],['.','.','.','.','X'],['X','.','X','.','X'],['X','.','.','.','X'],['X','X','X','X','X']],
-    "P3": [['X','X','X','X','X'],['.','.','.','.','X'],['X','.','S','.','X'],['X','.','.','.','X'],['X','X','X','X','X']],
-    "P4": [['X','X','X','X','X'],['.','.','.','.','X'],['X','.','.','S','X'],['X','.','.','.','X'],['X','X','X','X','X']]
+# 'X' wall, 'S' swap tile, '.' floor; each player starts on their last 'S'
+player_layouts = {
+    "P1": ["X..XX", ".S..X", "X.X.X", "X...X", "XXXXX"],
+    "P2": ["XX.SX", "....X", "X.X.X", "X...X", "XXXXX"],
+    "P3": ["XXXXX", "....X", "X.S.X", "X...X", "XXXXX"],
+    "P4": ["XXXXX", "....X", "X..SX", "X...X", "XXXXX"],
 }
 
-players = {}
-for i, pid in enumerate(["P1","P2","P3","P4"]):
-    matrix = player_matrices[pid]
-    for r in range(ROWS):
-        for c in range(COLS):
-            if matrix[r][c] == 'S':
-                players[pid] = {
-                    "pos":[r,c],
-                    "keys":player_keys[i],
-                    "cooldown":0,
-                    "offset":grid_offsets[i],
-                    "matrix":matrix
-                }
+def make_board(layout, offset):
+    """Board for layout drawn at offset; its goal cells are the ones over the center tile."""
+    rows, cols = len(layout), len(layout[0])
+    x, y = offset
+    goals = goal_mask(rows, cols, lambda r, c: layout[r][c] != 'X' and center_tile.collidepoint(
+        x + c * TILE_SIZE + TILE_SIZE // 2, y + r * TILE_SIZE + TILE_SIZE // 2))
+    return Board.from_strings(layout, goals=goals)
+
+def make_players(boards=None):
+    """Player state for the built-in layouts, or for a generated set of four Boards."""
+    result = {}
+    for i, pid in enumerate(["P1","P2","P3","P4"]):
+        board = boards[i] if boards else make_board(player_layouts[pid], grid_offsets[i])
+        result[pid] = {
+            "pos":board.start,
+            "keys":player_keys[i],
+            "offset":grid_offsets[i],
+            "board":board
+        }
+    return result
+
+players = make_players()
 
 # --- Drawing Functions ---
-def draw_grid(pid):
+# Everything but the player tokens and the winner box is drawn once into a
+# static layer. A frame puts back the static tiles under tokens that moved,
+# draws those tokens and updates just those rects.
+def tile_rect(p, i):
+    r, c = p['board'].cell(i)
+    x, y = p['offset']
+    return pygame.Rect(x + c * TILE_SIZE, y + r * TILE_SIZE, TILE_SIZE, TILE_SIZE)
+
+def draw_grid(surface, pid):
     p = players[pid]
     x, y = p['offset']
-    mat = p['matrix']
-    btn = pygame.Rect(x, y - 40, COLS * TILE_SIZE, 30)
-    pygame.draw.rect(WIN, BUTTON_COLOR, btn)
-    pygame.draw.rect(WIN, BLACK, btn, 2)
-    WIN.blit(FONT.render("SWAP", True, BLACK), (btn.x + btn.width // 2 - 25, btn.y + 5))
+    board = p['board']
+    btn = pygame.Rect(x, y - 40, board.cols * TILE_SIZE, 30)
+    pygame.draw.rect(surface, BUTTON_COLOR, btn)
+    pygame.draw.rect(surface, BLACK, btn, 2)
+    surface.blit(render_text(FONT, "SWAP", BLACK), (btn.x + btn.width // 2 - 25, btn.y + 5))
     p['swap_rect'] = btn
 
-    for r in range(ROWS):
-        for c in range(COLS):
-            rect = pygame.Rect(x + c * TILE_SIZE, y + r * TILE_SIZE, TILE_SIZE, TILE_SIZE)
-            pygame.draw.rect(WIN, WHITE, rect)
-            pygame.draw.rect(WIN, BLACK, rect, 2)
+    for i in range(board.size):
+        rect = tile_rect(p, i)
+        pygame.draw.rect(surface, WHITE, rect)
+        pygame.draw.rect(surface, BLACK, rect, 2)
+        symbol = board.symbol(i)
+        if symbol != '.':
+            surface.blit(render_text(FONT, symbol, BLACK), (rect.x + 15, rect.y + 12))
 
-            if [r, c] == p['pos']:
-                WIN.blit(FONT.render(pid, True, BLACK), (rect.x + 5, rect.y + 12))
-            else:
-                symbol = mat[r][c]
-                if symbol != '.':
-                    WIN.blit(FONT.render(symbol, True, BLACK), (rect.x + 15, rect.y + 12))
-
-def draw_controls(pid):
+def draw_controls(surface, pid):
     p = players[pid]
-    x = p['offset'][0] + COLS*TILE_SIZE + 20
+    x = p['offset'][0] + p['board'].cols*TILE_SIZE + 20
     y = p['offset'][1]
     control_labels = {
         "P1": ["W = Up", "A = Left", "S = Down", "D = Right", "F = Swap"],
@@ -79,87 +100,164 @@ def draw_controls(pid):
         "P3": ["1 = Up", "2 = Left", "3 = Down", "4 = Right", "5 = Swap"],
         "P4": ["↑ = Up", "← = Left", "↓ = Down", "→ = Right", "M = Swap"]
     }
-    WIN.blit(FONT.render("Controls:", True, BLACK), (x, y))
+    surface.blit(render_text(FONT, "Controls:", BLACK), (x, y))
     for i, line in enumerate(control_labels[pid]):
-        WIN.blit(FONT.render(line, True, BLACK), (x, y + 25 + i*25))
+        surface.blit(render_text(FONT, line, BLACK), (x, y + 25 + i*25))
+
+def draw_center_tile(surface):
+    pygame.draw.rect(surface, GRAY, center_tile)
+    pygame.draw.rect(surface, BLACK, center_tile, 2)
 
-def draw_center_tile():
-    pygame.draw.rect(WIN, GRAY, center_tile)
-    pygame.draw.rect(WIN, BLACK, center_tile, 2)
+def build_static_layer():
+    surface = pygame.Surface((WIDTH, HEIGHT)).convert()
+    surface.fill(WHITE)
+    for pid in players:
+        draw_grid(surface, pid)
+        draw_controls(surface, pid)
+    draw_center_tile(surface)
+    return surface
 
-def draw_winner_box():
+def draw_token(surface, pid):
+    """Draws pid over its current tile and returns the tile's rect."""
+    rect = tile_rect(players[pid], players[pid]['pos'])
+    pygame.draw.rect(surface, WHITE, rect)
+    pygame.draw.rect(surface, BLACK, rect, 2)
+    surface.blit(render_text(FONT, pid, BLACK), (rect.x + 5, rect.y + 12))
+    if rect.colliderect(center_tile):
+        draw_center_tile(surface)
+    return rect
+
+def draw_winner_box(surface):
     box = pygame.Rect(WIDTH//2 - 150, HEIGHT//2 - 50, 300, 100)
-    pygame.draw.rect(WIN, GRAY, box)
-    pygame.draw.rect(WIN, BLACK, box, 3)
-    WIN.blit(BIG_FONT.render(f"{winner} WINS!", True, BLACK), (box.x + 60, box.y + 30))
+    pygame.draw.rect(surface, GRAY, box)
+    pygame.draw.rect(surface, BLACK, box, 3)
+    surface.blit(render_text(BIG_FONT, f"{winner} WINS!", BLACK), (box.x + 60, box.y + 30))
+    return box
 
 # --- Game Logic ---
-def move_player(pid, dr, dc):
+def move_player(pid, direction):
     global winner
     p = players[pid]
-    r, c = p['pos']
-    nr, nc = r + dr, c + dc
-    if 0 <= nr < ROWS and 0 <= nc < COLS and p['matrix'][nr][nc] != 'X':
-        p['pos'] = [nr, nc]
-        ax = p['offset'][0] + nc*TILE_SIZE
-        ay = p['offset'][1] + nr*TILE_SIZE
-        if center_tile.collidepoint(ax + TILE_SIZE//2, ay + TILE_SIZE//2):
-            winner = pid
+    p['pos'] = p['board'].move(p['pos'], direction)
+    if p['board'].is_goal(p['pos']):
+        winner = pid
 
 def swap_player(pid):
     global winner
     p = players[pid]
-    r, c = p['pos']
-    for sr in range(ROWS):
-        for sc in range(COLS):
-            if p['matrix'][sr][sc] == 'S' and [sr, sc] != [r, c]:
-                p['pos'] = [sr, sc]
-                ax = p['offset'][0] + sc*TILE_SIZE
-                ay = p['offset'][1] + sr*TILE_SIZE
-                if center_tile.collidepoint(ax + TILE_SIZE//2, ay + TILE_SIZE//2):
-                    winner = pid
-                return
+    p['pos'] = p['board'].swap(p['pos'])
+    if p['board'].is_goal(p['pos']):
+        winner = pid
 
 # --- Main Loop ---
+def setup():
+    global WIN, FONT, BIG_FONT
+    ASSETS.timed("pygame.init", pygame.init)
+    WIN = ASSETS.timed("set_mode", pygame.display.set_mode, (WIDTH, HEIGHT))
+    pygame.display.set_caption("Quad Multiplayer Grid Game")
+    FONT = ASSETS.timed("font 30", pygame.font.SysFont, None, 30)
+    BIG_FONT = ASSETS.timed("font 50", pygame.font.SysFont, None, 50)
+
+def parse_args(argv=None):
+    """Parsed arguments; with --boards, args.board_set holds the chosen set's Boards."""
+    parser = argparse.ArgumentParser(description="Quad Multiplayer Grid Game")
+    parser.add_argument("--boards", metavar="PATH", help="play a board set written by swap_generator.py")
+    parser.add_argument("--set", type=int, default=0, help="which set in --boards to play")
+    parser.add_argument("--input-latency", action="store_true",
+                        help="print input-to-display latency percentiles on exit")
+    args = parser.parse_args(argv)
+    args.board_set = None
+    if args.boards:
+        try:
+            sets = load_board_sets(args.boards)
+        except (OSError, ValueError) as e:
+            parser.error(f"can't read {args.boards}: {e}")
+        if not sets:
+            parser.error(f"{args.boards} has no board sets")
+        if not 0 <= args.set < len(sets):
+            parser.error(f"--set must be between 0 and {len(sets) - 1} for {args.boards}")
+        args.board_set = sets[args.set]
+    return args
+
+ACTIONS = {"up": UP, "down": DOWN, "left": LEFT, "right": RIGHT}
+
+def apply_action(pid, action):
+    if action == "swap":
+        swap_player(pid)
+    else:
+        move_player(pid, ACTIONS[action])
+
 def main():
-    global winner
-    clock = pygame.time.Clock()
+    global winner, players
+    args = parse_args()
+    if args.board_set:
+        players = make_players(args.board_set)
+    setup()
+    static = build_static_layer()
+    inputs = InputHandler({pid: p['keys'] for pid, p in players.items()},
+                          {pid: p['swap_rect'] for pid, p in players.items()})
+    repaint = True
+    drawn = {}  # pid -> cell its token was last drawn on
     running = True
     while running:
-        clock.tick(30)
-        WIN.fill(WHITE)
-        keys = pygame.key.get_pressed()
-        for pid, p in players.items():
-            if p['cooldown'] > 0:
-                p['cooldown'] -= 1
-                continue
-            k = p['keys']
-            if keys[k['up']]: move_player(pid, -1, 0); p['cooldown'] = 5
-            elif keys[k['down']]: move_player(pid, 1, 0); p['cooldown'] = 5
-            elif keys[k['left']]: move_player(pid, 0, -1); p['cooldown'] = 5
-            elif keys[k['right']]: move_player(pid, 0, 1); p['cooldown'] = 5
-            elif keys[k['swap']]: swap_player(pid); p['cooldown'] = 5
-        for event in pygame.event.get():
+        # Sleep until the next event, or until a held key is due to repeat;
+        # there is no frame timer, so nothing is redrawn while idle
+        timeout = inputs.timeout()
+        if timeout is None:
+            events = [pygame.event.wait()] + pygame.event.get()
+        else:
+            events = [pygame.event.wait(max(1, math.ceil(timeout)))] + pygame.event.get()
+        now = now_ms()
+        for event in events:
             if event.type == pygame.QUIT:
                 running = False
-            if event.type == pygame.MOUSEBUTTONDOWN:
-                mx, my = pygame.mouse.get_pos()
-                for pid, p in players.items():
-                    if 'swap_rect' in p and p['swap_rect'].collidepoint(mx, my):
-                        swap_player(pid)
-        for pid in players:
-            draw_grid(pid)
-            draw_controls(pid)
-        draw_center_tile()
-        if winner:
-            draw_winner_box()
-        pygame.display.update()
+            if event.type in (pygame.VIDEOEXPOSE, pygame.WINDOWEXPOSED):
+                repaint = True
+            inputs.handle(event, now)
+        inputs.poll(now)
+        stamps = []
+        for pid, action, stamp in inputs.drain():
+            apply_action(pid, action)
+            stamps.append(stamp)
+
+        if repaint:
+            WIN.blit(static, (0, 0))
+            for pid in players:
+                draw_token(WIN, pid)
+            if winner:
+                draw_winner_box(WIN)
+            pygame.display.flip()
+            ASSETS.mark("first frame")
+            inputs.presented(stamps)
+            drawn = {pid: p['pos'] for pid, p in players.items()}
+            shown_winner = winner
+            repaint = False
+            continue
+
+        dirty = []
+        for pid, p in players.items():
+            if p['pos'] != drawn[pid]:
+                old = tile_rect(p, drawn[pid])
+                WIN.blit(static, old, old)
+                dirty += [old, draw_token(WIN, pid)]
+                drawn[pid] = p['pos']
+        if winner and (winner != shown_winner or dirty):
+            dirty.append(draw_winner_box(WIN))
+            shown_winner = winner
+        if dirty:
+            pygame.display.update(dirty)
+        # A move into a wall leaves the screen as it was, which is still the
+        # frame that answers it
+        inputs.presented(stamps)
+    if args.input_latency:
+        print(inputs.report())
     pygame.quit()
     sys.exit()
 
-try:
-    main()
-except Exception as e:
-    print("Error:", e)
-    pygame.quit()
-    sys.exit()
\ No newline at end of file
+if __name__ == "__main__":
+    try:
+        main()
+    except Exception as e:
+        print("Error:", e)
+        pygame.quit()
+        sys.exit()
\ No newline at end of file
@@ -0,0 +1,275 @@
+import math
+from collections import deque
+from time import perf_counter_ns
+
+from arena_bots import EDGE_MARGIN, PREFERRED_RANGE, wants_skill
+from arena_sim import (
+    WIDTH, HEIGHT, BEAST_ATTACK_RANGE, MOVE_SCALE, IN_UP, IN_DOWN, IN_LEFT, IN_RIGHT, IN_ATTACK, IN_SKILL,
+)
+from frame_profiler import PERCENTILES, PROFILE_WINDOW, percentile
+
+# Utility AI for Beasts and bot-controlled players. An AIDirector owns one
+# Agent per controlled entity. Agents re-decide ("think") on a staggered
+# schedule: agent n thinks on ticks where tick % THINK_INTERVAL equals
+# n % THINK_INTERVAL, so a burst of spawns spreads over several ticks. The
+# thinking in one update stops once AI_BUDGET_MS is spent; the agents it
+# didn't reach go first next tick and keep their last decision meanwhile.
+# Acting on a decision (moving, shooting) happens every tick and is cheap.
+#
+# Put a director in state["ai"] and arena_sim moves Beasts by it instead of
+# the built-in chase. With a budget, which tick an agent thinks on depends on
+# wall time, so such a match no longer replays from its inputs alone; pass
+# budget_ms=None for a fixed schedule.
+
+AI_BUDGET_MS = 1.0  # thinking per tick; two ticks fit in a 60 FPS frame with room to spare
+THINK_INTERVAL = 12  # ticks between an agent's decisions (10 Hz at 120 Hz)
+DANGER_CELL = 60  # enemy shots in the same cell of this size count as incoming
+BEAST_RANGE = BEAST_ATTACK_RANGE * 0.6  # where a Beast likes to stand while reloading
+DEFAULT_ACTION = "chase"  # until an agent's first think, matching the built-in rule
+AXIS_THRESHOLD = 0.38  # ~sin(22.5 deg): a bot's heading snaps to eight-way key presses
+
+
+# ---------------- UTILITY SCORING ----------------
+class Perception:
+    """What one agent knows when it thinks."""
+    __slots__ = ("distance", "hp", "attack_ready", "skill_ready", "danger", "preferred", "wants_skill")
+
+    def __init__(self, distance, hp, attack_ready, skill_ready, danger, preferred, wants_skill):
+        self.distance = distance
+        self.hp = hp  # fraction of maxHp
+        self.attack_ready = attack_ready
+        self.skill_ready = skill_ready
+        self.danger = danger  # enemy shots nearby
+        self.preferred = preferred
+        self.wants_skill = wants_skill
+
+
+def score_chase(view):
+    return 0.2 + min(1.0, max(0.0, (view.distance - view.preferred) / view.preferred))
+
+
+def score_kite(view):
+    if view.distance >= view.preferred:
+        return 0.0
+    return (0.3 if view.attack_ready else 0.7) * (1 - view.distance / view.preferred) + 0.1
+
+
+def score_retreat(view):
+    return (1 - view.hp) * 0.6 + min(view.danger, 3) * 0.15
+
+
+def score_skill(view):
+    return 0.9 if view.skill_ready and view.wants_skill else 0.0
+
+
+SCORERS = {"chase": score_chase, "kite": score_kite, "retreat": score_retreat, "skill": score_skill}
+
+
+class UtilityBrain:
+    """Scores every action for an agent and picks the highest."""
+
+    def __init__(self, scorers=None):
+        self.scorers = scorers or SCORERS
+
+    def perceive(self, director, state, e, enemy):
+        dx, dy = enemy.x - e.x, enemy.y - e.y
+        distance = math.sqrt(dx * dx + dy * dy)
+        if e.isPlayer:
+            preferred = PREFERRED_RANGE.get(e.className, 200)
+            skill_ready = e.skillCooldown <= 0
+            wants = skill_ready and wants_skill(state, e, enemy, distance)
+        else:
+            preferred, skill_ready, wants = BEAST_RANGE, False, False
+        return Perception(distance, e.hp / e.maxHp, e.attackCooldown <= 0, skill_ready,
+                          director.danger(state, e), preferred, wants)
+
+    def think(self, director, state, e, enemy):
+        view = self.perceive(director, state, e, enemy)
+        best, best_score = DEFAULT_ACTION, -1.0
+        for action, scorer in self.scorers.items():
+            score = scorer(view)
+            if score > best_score:
+                best, best_score = action, score
+        return best
+
+
+# ---------------- AGENTS ----------------
+class Agent:
+    __slots__ = ("entity", "serial", "action", "last_think", "queued", "thinks", "think_ns", "max_think_ns")
+
+    def __init__(self, entity, serial):
+        self.entity = entity
+        self.serial = serial
+        self.action = DEFAULT_ACTION
+        self.last_think = None
+        self.queued = False  # waiting in the director's work queue
+        self.thinks = 0
+        self.think_ns = 0
+        self.max_think_ns = 0
+
+    def heading(self, dx, dy, distance):
+        """Unit direction to move in for the current action, given the vector to the enemy."""
+        if distance <= 0:
+            return 0.0, 0.0
+        ux, uy = dx / distance, dy / distance
+        if self.action == "retreat":
+            return -ux, -uy
+        if self.action == "kite":
+            side = 1 if self.serial % 2 else -1  # circle the enemy, half the agents each way
+            return -uy * side, ux * side
+        return ux, uy
+
+
+def enemy_of(state, e):
+    return state["player1"] if e.team == "B" else state["player2"]
+
+
+class AIDirector:
+    def __init__(self, budget_ms=AI_BUDGET_MS, think_interval=THINK_INTERVAL, brain=None):
+        self.budget_ns = None if budget_ms is None else int(budget_ms * 1e6)
+        self.interval = think_interval
+        self.brain = brain or UtilityBrain()
+        self.agents = {}  # entity -> Agent
+        self.buckets = [[] for _ in range(think_interval)]
+        self.deferred = deque()
+        self.serial = 0
+        self.tick = None
+        self._danger = {}  # {(team, cx, cy): shots}, rebuilt on ticks where someone thinks
+        self.update_ns = deque(maxlen=PROFILE_WINDOW)
+        self.thinks = 0
+        self.deferrals = 0
+        self.max_staleness = 0  # most ticks an agent has gone between thinks
+
+    def agent(self, e):
+        a = self.agents.get(e)
+        if a is None:
+            a = self.agents[e] = Agent(e, self.serial)
+            self.buckets[self.serial % self.interval].append(a)
+            self.serial += 1
+        return a
+
+    def _bin_projectiles(self, state):
+        cells = {}
+        for proj in state["projectiles"]:
+            key = (proj.team, int(proj.x // DANGER_CELL), int(proj.y // DANGER_CELL))
+            cells[key] = cells.get(key, 0) + 1
+        self._danger = cells
+
+    def danger(self, state, e):
+        """Enemy shots in e's cell this tick."""
+        cx, cy = int(e.x // DANGER_CELL), int(e.y // DANGER_CELL)
+        enemy_team = "B" if e.team == "A" else "A"
+        return self._danger.get((enemy_team, cx, cy), 0)
+
+    def update(self, state):
+        """Runs this tick's thinking. Safe to call more than once per tick."""
+        tick = state["tick"]
+        if tick == self.tick:
+            return
+        self.tick = tick
+        start = now = perf_counter_ns()
+        deadline = None if self.budget_ns is None else start + self.budget_ns
+        entities = state["entities"]
+
+        index = tick % self.interval
+        bucket = self.buckets[index]
+        alive = [a for a in bucket if a.entity in entities]
+        if len(alive) != len(bucket):
+            for a in bucket:
+                if a.entity not in entities:
+                    del self.agents[a.entity]
+            self.buckets[index] = alive
+        work = self.deferred
+        self.deferred = deque()
+        for a in alive:
+            if not a.queued:
+                a.queued = True
+                work.append(a)
+        if work:
+            self._bin_projectiles(state)
+            now = perf_counter_ns()
+
+        while work:
+            if deadline is not None and now >= deadline:
+                self.deferrals += len(work)
+                self.deferred = work
+                break
+            a = work.popleft()
+            a.queued = False
+            if a.entity not in entities:
+                continue
+            a.action = self.brain.think(self, state, a.entity, enemy_of(state, a.entity))
+            end = perf_counter_ns()
+            ns = end - now
+            now = end
+            if a.last_think is not None:
+                self.max_staleness = max(self.max_staleness, tick - a.last_think)
+            a.last_think = tick
+            a.thinks += 1
+            a.think_ns += ns
+            a.max_think_ns = max(a.max_think_ns, ns)
+            self.thinks += 1
+        self.update_ns.append(perf_counter_ns() - start)
+
+    # ---- acting ----
+
+    def move_beast(self, state, e, dx, dy, distance, dt):
+        """Moves Beast e for one tick; (dx, dy) and distance are to its enemy."""
+        self.update(state)
+        mx, my = self.agent(e).heading(dx, dy, distance)
+        step_len = e.speed * MOVE_SCALE * dt
+        e.x = min(max(e.x + mx * step_len, 0.0), WIDTH)
+        e.y = min(max(e.y + my * step_len, 0.0), HEIGHT)
+
+    def stats(self):
+        """Thinking cost so far: update and per-think ns percentiles plus scheduling counters."""
+        updates = sorted(self.update_ns)
+        per_agent = sorted(a.think_ns / a.thinks for a in self.agents.values() if a.thinks)
+        result = {
+            "agents": len(self.agents),
+            "thinks": self.thinks,
+            "deferred": self.deferrals,
+            "max_staleness_ticks": self.max_staleness,
+            "update_ns": {f"p{pct}": percentile(updates, pct) for pct in PERCENTILES},
+            "agent_think_ns": {f"p{pct}": percentile(per_agent, pct) for pct in PERCENTILES},
+        }
+        result["update_ns"]["max"] = updates[-1] if updates else 0
+        result["agent_think_ns"]["max"] = max((a.max_think_ns for a in self.agents.values()), default=0)
+        return result
+
+
+# ---------------- BOT PLAYERS ----------------
+class UtilityBot:
+    """Input bits for one player slot, decided by a director's utility brain.
+
+    Drop-in for arena_bots.ScriptedBot; share one director between the bots
+    and state["ai"] so they are scheduled under the same budget.
+    """
+
+    def __init__(self, player_index, director=None):
+        self.player_index = player_index
+        self.director = director or AIDirector()
+
+    def __call__(self, state):
+        p = state["player1"] if self.player_index == 0 else state["player2"]
+        enemy = state["player2"] if self.player_index == 0 else state["player1"]
+        self.director.update(state)
+        agent = self.director.agent(p)
+
+        bits = IN_ATTACK
+        if agent.action == "skill" and p.skillCooldown <= 0:
+            bits |= IN_SKILL
+            agent.action = DEFAULT_ACTION  # the press is spent; chase until the next think
+        dx, dy = enemy.x - p.x, enemy.y - p.y
+        mx, my = agent.heading(dx, dy, math.sqrt(dx * dx + dy * dy))
+        if mx > AXIS_THRESHOLD: bits |= IN_RIGHT
+        elif mx < -AXIS_THRESHOLD: bits |= IN_LEFT
+        if my > AXIS_THRESHOLD: bits |= IN_DOWN
+        elif my < -AXIS_THRESHOLD: bits |= IN_UP
+
+        # Never walk out of the arena
+        if p.x < EDGE_MARGIN: bits = (bits & ~IN_LEFT) | IN_RIGHT
+        if p.x > WIDTH - EDGE_MARGIN: bits = (bits & ~IN_RIGHT) | IN_LEFT
+        if p.y < EDGE_MARGIN: bits = (bits & ~IN_UP) | IN_DOWN
+        if p.y > HEIGHT - EDGE_MARGIN: bits = (bits & ~IN_DOWN) | IN_UP
+        return bits
@@ -0,0 +1,95 @@
+import math
+import random
+
+from arena_sim import (
+    WIDTH, HEIGHT, TICK_RATE, IN_UP, IN_DOWN, IN_LEFT, IN_RIGHT, IN_ATTACK, IN_SKILL,
+)
+
+# Scripted opponents for headless matches. A bot looks at the match state and
+# returns the input bits for its player, exactly like a keyboard would.
+
+# Distance each class tries to hold from the enemy player
+PREFERRED_RANGE = {
+    "Knight": 180,
+    "Assassin": 220,
+    "Mage": 300,
+    "Healer": 320,
+    "Summoner": 280,
+    "Warrior": 150,
+}
+RANGE_SLACK = 30
+EDGE_MARGIN = 40
+STRAFE_TICKS = (TICK_RATE // 2, TICK_RATE * 3 // 2)  # how long a bot keeps one dodge direction
+DANGER_RADIUS = 60  # enemy shots closer than this count as incoming
+
+
+def _incoming(state, p):
+    r2 = DANGER_RADIUS * DANGER_RADIUS
+    for proj in state["projectiles"]:
+        if proj.team != p.team:
+            dx, dy = proj.x - p.x, proj.y - p.y
+            if dx * dx + dy * dy < r2:
+                return True
+    return False
+
+
+def wants_skill(state, p, enemy, distance):
+    """Class-specific rule for when to spend the skill."""
+    name = p.className
+    if name == "Healer":
+        return p.hp < 0.7 * p.maxHp
+    if name == "Knight":
+        return _incoming(state, p)
+    if name == "Assassin":
+        return p.hp < 0.5 * p.maxHp or _incoming(state, p)
+    if name == "Warrior":
+        return distance < 220
+    return True  # Mage and Summoner fire whenever ready
+
+
+class ScriptedBot:
+    """Holds a preferred range, strafes to dodge, shoots and uses its skill by rule."""
+
+    def __init__(self, player_index, seed=None):
+        self.player_index = player_index
+        self.rng = random.Random(seed)
+        self.strafe = 1
+        self.strafe_until = 0
+
+    def __call__(self, state):
+        p = state["player1"] if self.player_index == 0 else state["player2"]
+        enemy = state["player2"] if self.player_index == 0 else state["player1"]
+        dx, dy = enemy.x - p.x, enemy.y - p.y
+        distance = math.sqrt(dx * dx + dy * dy)
+
+        bits = IN_ATTACK
+        if p.skillCooldown <= 0 and wants_skill(state, p, enemy, distance):
+            bits |= IN_SKILL
+
+        # Close or open the gap along the line to the enemy
+        preferred = PREFERRED_RANGE.get(p.className, 200)
+        if distance > preferred + RANGE_SLACK:
+            bits |= (IN_RIGHT if dx > 0 else IN_LEFT) if abs(dx) > abs(dy) else (IN_DOWN if dy > 0 else IN_UP)
+        elif distance < preferred - RANGE_SLACK:
+            bits |= (IN_LEFT if dx > 0 else IN_RIGHT) if abs(dx) > abs(dy) else (IN_UP if dy > 0 else IN_DOWN)
+
+        # Strafe across the line of fire, flipping direction every so often
+        if state["tick"] >= self.strafe_until:
+            self.strafe = -self.strafe
+            self.strafe_until = state["tick"] + self.rng.randint(*STRAFE_TICKS)
+        if abs(dx) > abs(dy):
+            bits |= IN_DOWN if self.strafe > 0 else IN_UP
+        else:
+            bits |= IN_RIGHT if self.strafe > 0 else IN_LEFT
+
+        # Never walk out of the arena
+        if p.x < EDGE_MARGIN: bits = (bits & ~IN_LEFT) | IN_RIGHT
+        if p.x > WIDTH - EDGE_MARGIN: bits = (bits & ~IN_RIGHT) | IN_LEFT
+        if p.y < EDGE_MARGIN: bits = (bits & ~IN_UP) | IN_DOWN
+        if p.y > HEIGHT - EDGE_MARGIN: bits = (bits & ~IN_DOWN) | IN_UP
+        return bits
+
+
+def bot_policy(bot1, bot2):
+    """Combines two per-player bots into an arena_sim.run_match policy."""
+    return lambda state: (bot1(state), bot2(state))
@@ -0,0 +1,734 @@
+import argparse
+import asyncio
+import json
+import random
+import struct
+import sys
+import time
+from collections import OrderedDict, deque
+from time import perf_counter_ns
+
+from arena_sim import (
+    CLASSES, ROLE_NAMES, TICK_RATE, TICK_DT, IN_UP, IN_DOWN, IN_LEFT, IN_RIGHT, IN_ATTACK, IN_SKILL,
+    new_match, step,
+)
+from frame_profiler import FrameProfiler
+
+# Authoritative arena server over TCP. Clients join a named match and stream
+# their input bits; the server steps every match at the fixed TICK_RATE and
+# sends each client a snapshot every SNAPSHOT_INTERVAL ticks, delta-encoded
+# against the last snapshot that client acknowledged. One process hosts any
+# number of matches on a single tick loop.
+#
+# Every message is a u16 length followed by a payload whose first byte is
+# the message type (little endian throughout):
+#   client JOIN      type, 3 x (u8 length + UTF-8): match name, player id, role
+#   client INPUT     type, seq u32, input bits u8, acked snapshot tick u32
+#   server WELCOME   type, side u8, tick rate u16, snapshot interval u8
+#   server SNAPSHOT  type, tick u32, base tick u32 (NO_BASE = full snapshot),
+#                    u16 count + entity records, u16 count + removed net ids,
+#                    u16 count + projectiles
+#   server END       type, u8 length + UTF-8 winner id (empty for none)
+#   server ERROR     type, u8 length + UTF-8 reason
+#
+# An entity record is net id u16 and a field mask u8. Each set bit carries
+# that field; SPAWN_BIT marks an entity the base doesn't have and is followed
+# by its class, team, player flag and max hp before the fields. Projectiles
+# move every tick, so they are always sent whole.
+#
+# IN_SKILL is edge-triggered as in arena_sim: send it in one INPUT only.
+# The server latches it until the next tick consumes it.
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 7777
+SNAPSHOT_INTERVAL = 4  # ticks between snapshots (30 Hz at TICK_RATE 120)
+SNAPSHOT_HISTORY = 64  # snapshots kept per match and per client as delta bases
+MAX_CATCH_UP_TICKS = 10  # further behind than this, the tick loop drops the backlog
+WRITE_BUFFER_LIMIT = 64 * 1024  # a client this backed up skips snapshots until it drains
+RESULTS_KEPT = 1000  # most recent finished matches kept in ArenaServer.results
+MAX_NET_IDS = 0x10000
+POSITION_SCALE = 4  # positions travel in quarter pixels
+COOLDOWN_SCALE = 100  # cooldowns travel in hundredths of a second
+
+MSG_JOIN = 1
+MSG_INPUT = 2
+MSG_WELCOME = 1
+MSG_SNAPSHOT = 2
+MSG_END = 3
+MSG_ERROR = 4
+NO_BASE = 0xFFFFFFFF
+
+FIELDS = ("x", "y", "hp", "skill_cd", "flags")
+FIELD_FORMATS = "hhhHB"
+ALL_FIELDS = (1 << len(FIELDS)) - 1
+SPAWN_BIT = 0x80
+FLAG_STEALTHED = 1
+FLAG_INVULNERABLE = 2
+FLAG_CHARGING = 4
+CLASS_NAMES = list(CLASSES)
+
+_FRAME = struct.Struct("<H")
+_INPUT = struct.Struct("<BIBI")
+_WELCOME = struct.Struct("<BBHB")
+_SNAPSHOT = struct.Struct("<BII")
+_COUNT = struct.Struct("<H")
+_RECORD = struct.Struct("<HB")
+_SPAWN = struct.Struct("<BBBH")
+_PROJECTILE = struct.Struct("<hhhhBB")  # x, y, dx, dy, radius, team
+_FIELD_STRUCTS = [
+    struct.Struct("<" + "".join(f for i, f in enumerate(FIELD_FORMATS) if mask >> i & 1))
+    for mask in range(ALL_FIELDS + 1)
+]
+
+
+class ProtocolError(Exception):
+    pass
+
+
+def _clamp(value, lo, hi):
+    return lo if value < lo else hi if value > hi else value
+
+
+def _pack_str(text):
+    raw = text.encode("utf-8")[:255]
+    return bytes([len(raw)]) + raw
+
+
+def _unpack_str(data, pos):
+    if pos >= len(data) or pos + 1 + data[pos] > len(data):
+        raise ProtocolError("truncated string")
+    end = pos + 1 + data[pos]
+    return data[pos + 1:end].decode("utf-8", "replace"), end
+
+
+async def _read_frame(reader):
+    (size,) = _FRAME.unpack(await reader.readexactly(_FRAME.size))
+    if size == 0:
+        raise ProtocolError("empty message")
+    return await reader.readexactly(size)
+
+
+# ---------------- SNAPSHOTS ----------------
+# A snapshot is {"tick", "entities": {net id: (spawn, fields)}, "projectiles"}
+# with every value already quantized, so server and client hold identical
+# copies and deltas compare exact integers.
+
+class NetIds:
+    """Entity ids to u16 net ids for one match.
+
+    An entity that has left gives its net id back, but the id is only handed
+    out again once SNAPSHOT_HISTORY more snapshots have been taken. By then
+    no snapshot a client could still ack as a delta base holds the old
+    entity, so a reused id always arrives as a fresh spawn.
+    """
+
+    def __init__(self):
+        self.ids = {}
+        self.free = deque()  # (snapshot number it was released at, net id), oldest first
+        self.next_id = 0
+        self.snapshots = 0
+
+    def update(self, entities):
+        """Releases the ids of entities that are gone and assigns ids to new ones."""
+        self.snapshots += 1
+        live = {e.id for e in entities}
+        for entity_id in [entity_id for entity_id in self.ids if entity_id not in live]:
+            self.free.append((self.snapshots, self.ids.pop(entity_id)))
+        for e in entities:
+            if e.id not in self.ids:
+                self.ids[e.id] = self._allocate()
+
+    def _allocate(self):
+        if self.free and self.snapshots - self.free[0][0] >= SNAPSHOT_HISTORY:
+            return self.free.popleft()[1]
+        if self.next_id < MAX_NET_IDS:
+            self.next_id += 1
+            return self.next_id - 1
+        raise ProtocolError(f"more than {MAX_NET_IDS} entities to identify")
+
+    def __getitem__(self, entity_id):
+        return self.ids[entity_id]
+
+    def __len__(self):
+        return len(self.ids)
+
+
+def take_snapshot(state, net_ids):
+    """Quantizes state, giving its entities net ids from net_ids (a NetIds)."""
+    entities = {}
+    net_ids.update(state["entities"])
+    for e in state["entities"]:
+        nid = net_ids[e.id]
+        flags = ((FLAG_STEALTHED if e.is_stealthed else 0) | (FLAG_INVULNERABLE if e.is_invulnerable else 0)
+                 | (FLAG_CHARGING if e.is_charging else 0))
+        entities[nid] = (
+            (CLASS_NAMES.index(e.className), e.team == "B", e.isPlayer, _clamp(round(e.maxHp), 0, 65535)),
+            (_clamp(round(e.x * POSITION_SCALE), -32768, 32767), _clamp(round(e.y * POSITION_SCALE), -32768, 32767),
+             _clamp(round(e.hp), -32768, 32767), _clamp(round(e.skillCooldown * COOLDOWN_SCALE), 0, 65535), flags),
+        )
+    pool = state["projectiles"]
+    projectiles = bytearray(_COUNT.pack(len(pool)))
+    for proj in pool:
+        projectiles += _PROJECTILE.pack(
+            _clamp(round(proj.x * POSITION_SCALE), -32768, 32767), _clamp(round(proj.y * POSITION_SCALE), -32768, 32767),
+            _clamp(round(proj.dx), -32768, 32767), _clamp(round(proj.dy), -32768, 32767),
+            _clamp(proj.radius, 0, 255), proj.team == "B",
+        )
+    return {"tick": state["tick"], "entities": entities, "projectiles": bytes(projectiles)}
+
+
+def encode_snapshot(snapshot, base=None):
+    """SNAPSHOT payload for snapshot, as a delta against base (None = full)."""
+    base_entities = base["entities"] if base else {}
+    records = []
+    for nid, (spawn, fields) in snapshot["entities"].items():
+        old = base_entities.get(nid)
+        if old is None:
+            records.append(_RECORD.pack(nid, SPAWN_BIT | ALL_FIELDS) + _SPAWN.pack(*spawn)
+                           + _FIELD_STRUCTS[ALL_FIELDS].pack(*fields))
+            continue
+        mask = 0
+        changed = []
+        for i, (value, old_value) in enumerate(zip(fields, old[1])):
+            if value != old_value:
+                mask |= 1 << i
+                changed.append(value)
+        if mask:
+            records.append(_RECORD.pack(nid, mask) + _FIELD_STRUCTS[mask].pack(*changed))
+    removed = [nid for nid in base_entities if nid not in snapshot["entities"]]
+
+    out = [_SNAPSHOT.pack(MSG_SNAPSHOT, snapshot["tick"], NO_BASE if base is None else base["tick"]),
+           _COUNT.pack(len(records))]
+    out.extend(records)
+    out.append(_COUNT.pack(len(removed)))
+    out.extend(_COUNT.pack(nid) for nid in removed)
+    out.append(snapshot["projectiles"])
+    return b"".join(out)
+
+
+def decode_snapshot(data, history):
+    """Rebuilds a snapshot from a SNAPSHOT payload; history maps tick -> earlier snapshots."""
+    try:
+        _, tick, base_tick = _SNAPSHOT.unpack_from(data)
+        if base_tick == NO_BASE:
+            entities = {}
+        elif base_tick in history:
+            entities = dict(history[base_tick]["entities"])
+        else:
+            raise ProtocolError(f"snapshot {tick} is based on unknown tick {base_tick}")
+        pos = _SNAPSHOT.size
+        (count,) = _COUNT.unpack_from(data, pos)
+        pos += _COUNT.size
+        for _ in range(count):
+            nid, mask = _RECORD.unpack_from(data, pos)
+            pos += _RECORD.size
+            if mask & SPAWN_BIT:
+                spawn = _SPAWN.unpack_from(data, pos)
+                pos += _SPAWN.size
+                fields = [0] * len(FIELDS)
+            elif nid in entities:
+                spawn, fields = entities[nid]
+                fields = list(fields)
+            else:
+                raise ProtocolError(f"update for unknown entity {nid}")
+            fmt = _FIELD_STRUCTS[mask & ALL_FIELDS]
+            values = iter(fmt.unpack_from(data, pos))
+            pos += fmt.size
+            for i in range(len(FIELDS)):
+                if mask >> i & 1:
+                    fields[i] = next(values)
+            entities[nid] = (tuple(spawn), tuple(fields))
+        (count,) = _COUNT.unpack_from(data, pos)
+        pos += _COUNT.size
+        for _ in range(count):
+            (nid,) = _COUNT.unpack_from(data, pos)
+            pos += _COUNT.size
+            entities.pop(nid, None)
+        (count,) = _COUNT.unpack_from(data, pos)
+        end = pos + _COUNT.size + count * _PROJECTILE.size
+        if end != len(data):
+            raise ProtocolError("snapshot length mismatch")
+    except struct.error as e:
+        raise ProtocolError(f"truncated snapshot: {e}") from None
+    return {"tick": tick, "entities": entities, "projectiles": data[pos:end]}
+
+
+def snapshot_projectiles(snapshot):
+    """(x, y, dx, dy, radius, team) tuples in pixels for the snapshot's projectiles."""
+    return [(x / POSITION_SCALE, y / POSITION_SCALE, dx, dy, radius, "AB"[team])
+            for x, y, dx, dy, radius, team in _PROJECTILE.iter_unpack(snapshot["projectiles"][_COUNT.size:])]
+
+
+# ---------------- SERVER ----------------
+class ClientConnection:
+    def __init__(self, reader, writer):
+        self.reader = reader
+        self.writer = writer
+        self.match = None
+        self.side = None
+        self.acked = None  # last snapshot tick the client confirmed
+        self.connected_at = time.perf_counter()
+        self.bytes_sent = 0
+        self.bytes_received = 0
+        self.full_snapshots = 0
+        self.full_bytes = 0
+        self.delta_snapshots = 0
+        self.delta_bytes = 0
+        self.skipped_snapshots = 0
+
+    def send(self, payload):
+        self.writer.write(_FRAME.pack(len(payload)) + payload)
+        self.bytes_sent += _FRAME.size + len(payload)
+
+    def stats(self):
+        elapsed = max(time.perf_counter() - self.connected_at, 1e-9)
+        return {
+            "match": self.match.name if self.match else None,
+            "side": self.side,
+            "down_bytes_per_sec": self.bytes_sent / elapsed,
+            "up_bytes_per_sec": self.bytes_received / elapsed,
+            "full_snapshots": self.full_snapshots,
+            "delta_snapshots": self.delta_snapshots,
+            "skipped_snapshots": self.skipped_snapshots,
+            "avg_full_bytes": self.full_bytes / self.full_snapshots if self.full_snapshots else 0.0,
+            "avg_delta_bytes": self.delta_bytes / self.delta_snapshots if self.delta_snapshots else 0.0,
+        }
+
+
+class Match:
+    def __init__(self, name, seed):
+        self.name = name
+        self.seed = seed
+        self.clients = [None, None]
+        self.players = [None, None]  # (player id, role) per side
+        self.state = None  # created once both sides have joined
+        self.held = [0, 0]
+        self.skill = [False, False]
+        self.net_ids = NetIds()
+        self.history = OrderedDict()
+
+
+class ArenaServer:
+    def __init__(self, host=DEFAULT_HOST, port=DEFAULT_PORT, snapshot_interval=SNAPSHOT_INTERVAL, seed=None):
+        self.host = host
+        self.port = port
+        self.snapshot_interval = snapshot_interval
+        self.rng = random.Random(seed)
+        self.matches = {}
+        self.clients = set()
+        self.results = deque(maxlen=RESULTS_KEPT)  # (match name, winner id), most recent last
+        self.finished = 0
+        self.profiler = FrameProfiler()
+        self.ticks = 0
+        self.ticks_dropped = 0
+        self.server = None
+        self.tick_task = None
+        self.handlers = set()
+
+    async def start(self):
+        self.server = await asyncio.start_server(self._handle, self.host, self.port)
+        self.port = self.server.sockets[0].getsockname()[1]
+        self.tick_task = asyncio.create_task(self._run())
+
+    async def close(self):
+        if self.tick_task:
+            self.tick_task.cancel()
+        if self.server:
+            self.server.close()
+            await self.server.wait_closed()
+        # Closing the sockets ends every handler at its next read; waiting for
+        # them keeps asyncio.run() from cancelling them mid-read on shutdown
+        for client in list(self.clients):
+            client.writer.close()
+        await asyncio.gather(*self.handlers, return_exceptions=True)
+
+    async def _handle(self, reader, writer):
+        client = ClientConnection(reader, writer)
+        self.clients.add(client)
+        task = asyncio.current_task()
+        self.handlers.add(task)
+        try:
+            while True:
+                payload = await _read_frame(reader)
+                client.bytes_received += _FRAME.size + len(payload)
+                self._on_message(client, payload)
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        except ProtocolError as e:
+            client.send(bytes([MSG_ERROR]) + _pack_str(str(e)))
+        finally:
+            self._drop(client)
+            self.handlers.discard(task)
+            writer.close()
+
+    def _on_message(self, client, payload):
+        kind = payload[0]
+        if kind == MSG_INPUT:
+            if client.match is None:
+                raise ProtocolError("input before joining a match")
+            try:
+                _, _, bits, ack = _INPUT.unpack(payload)
+            except struct.error:
+                raise ProtocolError("malformed input") from None
+            match = client.match
+            match.held[client.side] = bits & ~IN_SKILL
+            if bits & IN_SKILL:
+                match.skill[client.side] = True
+            client.acked = None if ack == NO_BASE else ack
+        elif kind == MSG_JOIN:
+            name, pos = _unpack_str(payload, 1)
+            player_id, pos = _unpack_str(payload, pos)
+            role, pos = _unpack_str(payload, pos)
+            self._join(client, name, player_id, role)
+        else:
+            raise ProtocolError(f"unknown message type {kind}")
+
+    def _join(self, client, name, player_id, role):
+        if client.match is not None:
+            raise ProtocolError("already in a match")
+        if role not in ROLE_NAMES:
+            raise ProtocolError(f"unknown role {role!r}")
+        match = self.matches.get(name)
+        if match is None:
+            match = self.matches[name] = Match(name, self.rng.getrandbits(32))
+        if match.state is not None or None not in match.clients:
+            raise ProtocolError(f"match {name!r} is full")
+        side = match.clients.index(None)
+        match.clients[side] = client
+        match.players[side] = (player_id, role)
+        client.match, client.side = match, side
+        client.send(_WELCOME.pack(MSG_WELCOME, side, TICK_RATE, self.snapshot_interval))
+        if None not in match.clients:
+            (p1_id, p1_role), (p2_id, p2_role) = match.players
+            match.state = new_match(p1_id, p1_role, p2_id, p2_role, seed=match.seed)
+
+    def _drop(self, client):
+        self.clients.discard(client)
+        match = client.match
+        if match is None:
+            return
+        match.clients[client.side] = None
+        match.held[client.side] = 0
+        if match.state is None:
+            match.players[client.side] = None
+        if match.clients == [None, None] and self.matches.get(match.name) is match:
+            del self.matches[match.name]
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        next_tick = loop.time()
+        while True:
+            delay = next_tick - loop.time()
+            # Yield even when late so client reads aren't starved during catch-up
+            await asyncio.sleep(max(delay, 0.0))
+            self.tick()
+            next_tick += TICK_DT
+            behind = loop.time() - next_tick
+            if behind > MAX_CATCH_UP_TICKS * TICK_DT:
+                self.ticks_dropped += int(behind / TICK_DT)
+                next_tick = loop.time()
+
+    def tick(self):
+        """Steps every running match once and sends whatever snapshots are due."""
+        start = perf_counter_ns()
+        running = [m for m in self.matches.values() if m.state is not None]
+        for match in running:
+            skill = match.skill
+            step(match.state, (match.held[0] | (IN_SKILL if skill[0] else 0),
+                               match.held[1] | (IN_SKILL if skill[1] else 0)))
+            match.skill = [False, False]
+        simulated = perf_counter_ns()
+
+        for match in running:
+            winner = match.state["winner"]
+            if winner is not None or match.state["tick"] % self.snapshot_interval == 0:
+                self._broadcast(match)
+            if winner is not None:
+                self._finish(match)
+        end = perf_counter_ns()
+
+        self.profiler.add("simulate", simulated - start)
+        self.profiler.add("snapshot", end - simulated)
+        self.profiler.add("tick", end - start)
+        self.profiler.end_frame()
+        self.ticks += 1
+
+    def _broadcast(self, match):
+        snapshot = take_snapshot(match.state, match.net_ids)
+        history = match.history
+        history[snapshot["tick"]] = snapshot
+        while len(history) > SNAPSHOT_HISTORY:
+            history.popitem(last=False)
+
+        encoded = {}  # base tick -> payload, shared by clients that acked the same tick
+        for client in match.clients:
+            if client is None:
+                continue
+            if client.writer.transport.get_write_buffer_size() > WRITE_BUFFER_LIMIT:
+                client.skipped_snapshots += 1
+                continue
+            base = history.get(client.acked)
+            key = base and base["tick"]
+            if key not in encoded:
+                encoded[key] = encode_snapshot(snapshot, base)
+            payload = encoded[key]
+            if base is None:
+                client.full_snapshots += 1
+                client.full_bytes += len(payload)
+            else:
+                client.delta_snapshots += 1
+                client.delta_bytes += len(payload)
+            client.send(payload)
+
+    def _finish(self, match):
+        winner = match.state["winner"] or ""
+        for client in match.clients:
+            if client is not None:
+                client.send(bytes([MSG_END]) + _pack_str(winner))
+                client.match = None
+        self.results.append((match.name, winner))
+        self.finished += 1
+        if self.matches.get(match.name) is match:
+            del self.matches[match.name]
+
+    def metrics(self):
+        """Server tick latency percentiles (us) and per-client bandwidth."""
+        summary = self.profiler.summary()
+        latency = {phase: {k: v / 1000 for k, v in summary[phase].items()}
+                   for phase in ("tick", "simulate", "snapshot", "frame") if phase in summary}
+        return {
+            "ticks": self.ticks,
+            "ticks_dropped": self.ticks_dropped,
+            "matches": len(self.matches),
+            "finished": self.finished,
+            "latency_us": latency,
+            "clients": [client.stats() for client in self.clients],
+        }
+
+
+# ---------------- CLIENT ----------------
+class ArenaClient:
+    """Minimal client: joins a match, sends inputs and keeps decoded snapshots."""
+
+    def __init__(self):
+        self.reader = None
+        self.writer = None
+        self.side = None
+        self.tick_rate = None
+        self.snapshot_interval = None
+        self.snapshots = OrderedDict()
+        self.latest = None
+        self.winner = None
+        self.error = None
+        self.done = asyncio.Event()
+        self.updated = asyncio.Event()
+        self.seq = 0
+        self.bytes_sent = 0
+        self.bytes_received = 0
+        self.receiver = None
+
+    async def connect(self, host, port, match, player_id, role):
+        self.reader, self.writer = await asyncio.open_connection(host, port)
+        self._send(bytes([MSG_JOIN]) + _pack_str(match) + _pack_str(player_id) + _pack_str(role))
+        payload = await self._read()
+        if payload[0] == MSG_ERROR:
+            raise ProtocolError(_unpack_str(payload, 1)[0])
+        _, self.side, self.tick_rate, self.snapshot_interval = _WELCOME.unpack(payload)
+        self.receiver = asyncio.create_task(self._receive())
+
+    def send_input(self, bits):
+        """Sends the held input bits and acknowledges the latest snapshot."""
+        self.seq += 1
+        self._send(_INPUT.pack(MSG_INPUT, self.seq, bits, self.latest["tick"] if self.latest else NO_BASE))
+
+    async def close(self):
+        if self.receiver:
+            self.receiver.cancel()
+        if self.writer:
+            self.writer.close()
+
+    def _send(self, payload):
+        self.writer.write(_FRAME.pack(len(payload)) + payload)
+        self.bytes_sent += _FRAME.size + len(payload)
+
+    async def _read(self):
+        payload = await _read_frame(self.reader)
+        self.bytes_received += _FRAME.size + len(payload)
+        return payload
+
+    async def _receive(self):
+        try:
+            while True:
+                payload = await self._read()
+                kind = payload[0]
+                if kind == MSG_SNAPSHOT:
+                    snapshot = decode_snapshot(payload, self.snapshots)
+                    self.snapshots[snapshot["tick"]] = snapshot
+                    while len(self.snapshots) > SNAPSHOT_HISTORY:
+                        self.snapshots.popitem(last=False)
+                    self.latest = snapshot
+                    self.updated.set()
+                elif kind == MSG_END:
+                    self.winner = _unpack_str(payload, 1)[0] or None
+                    break
+                elif kind == MSG_ERROR:
+                    self.error = _unpack_str(payload, 1)[0]
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError) as e:
+            self.error = self.error or f"connection lost: {e!r}"
+        except ProtocolError as e:
+            self.error = str(e)
+        finally:
+            self.done.set()
+            self.updated.set()
+
+
+# ---------------- LOOPBACK ----------------
+LOOPBACK_SKILL_CHANCE = 0.05  # per snapshot while the skill is ready
+LOOPBACK_RANGE = 200  # px the loopback bots try to keep from their enemy
+
+
+def _players(snapshot, side):
+    me = enemy = None
+    for spawn, fields in snapshot["entities"].values():
+        if spawn[2]:
+            if spawn[1] == side:
+                me = fields
+            else:
+                enemy = fields
+    return me, enemy
+
+
+async def _drive(client, rng):
+    """Plays one side from snapshots alone: hold range, strafe, shoot, sometimes cast."""
+    strafe = IN_UP
+    while not client.done.is_set():
+        await client.updated.wait()
+        client.updated.clear()
+        if client.latest is None or client.done.is_set():
+            continue
+        me, enemy = _players(client.latest, client.side)
+        if me is None or enemy is None:
+            client.send_input(0)
+            continue
+        dx = (enemy[0] - me[0]) / POSITION_SCALE
+        bits = IN_ATTACK
+        if abs(dx) > LOOPBACK_RANGE:
+            bits |= IN_RIGHT if dx > 0 else IN_LEFT
+        elif abs(dx) < LOOPBACK_RANGE / 2:
+            bits |= IN_LEFT if dx > 0 else IN_RIGHT
+        if rng.random() < 0.02:
+            strafe = IN_DOWN if strafe == IN_UP else IN_UP
+        bits |= strafe
+        if me[3] == 0 and rng.random() < LOOPBACK_SKILL_CHANCE:
+            bits |= IN_SKILL
+        client.send_input(bits)
+
+
+async def run_loopback(num_matches, seconds, snapshot_interval=SNAPSHOT_INTERVAL, seed=None):
+    """Serves num_matches bot matches over 127.0.0.1 for seconds.
+
+    Returns (server metrics, whether every client's decoded snapshots equal
+    the server's own copies).
+    """
+    rng = random.Random(seed)
+    server = ArenaServer(port=0, snapshot_interval=snapshot_interval, seed=seed)
+    await server.start()
+    clients, tasks = [], []
+    try:
+        for m in range(num_matches):
+            for side in range(2):
+                client = ArenaClient()
+                await client.connect(DEFAULT_HOST, server.port, f"match-{m}", f"bot-{m}-{side}", rng.choice(ROLE_NAMES))
+                clients.append((f"match-{m}", client))
+                tasks.append(asyncio.create_task(_drive(client, random.Random(rng.getrandbits(32)))))
+        await asyncio.sleep(seconds)
+        metrics = server.metrics()
+
+        consistent = True
+        for name, client in clients:
+            match = server.matches.get(name)
+            if match is None:
+                continue
+            for tick, snapshot in client.snapshots.items():
+                if tick in match.history and match.history[tick] != snapshot:
+                    consistent = False
+            consistent = consistent and client.error is None
+    finally:
+        for task in tasks:
+            task.cancel()
+        for _, client in clients:
+            await client.close()
+        await server.close()
+    return metrics, consistent
+
+
+def print_metrics(metrics):
+    latency = metrics["latency_us"]
+    print(f"{metrics['ticks']} ticks ({metrics['ticks_dropped']} dropped), "
+          f"{metrics['matches']} matches running, {metrics['finished']} finished")
+    for phase in ("tick", "simulate", "snapshot", "frame"):
+        if phase in latency:
+            s = latency[phase]
+            print(f"  {phase:<10} p50 {s['p50']:8.0f} us   p95 {s['p95']:8.0f} us   p99 {s['p99']:8.0f} us")
+    clients = metrics["clients"]
+    if clients:
+        down = [c["down_bytes_per_sec"] for c in clients]
+        up = [c["up_bytes_per_sec"] for c in clients]
+        full = sum(c["avg_full_bytes"] * c["full_snapshots"] for c in clients)
+        nfull = sum(c["full_snapshots"] for c in clients)
+        delta = sum(c["avg_delta_bytes"] * c["delta_snapshots"] for c in clients)
+        ndelta = sum(c["delta_snapshots"] for c in clients)
+        print(f"  {len(clients)} clients: down avg {sum(down) / len(down):.0f} B/s (max {max(down):.0f}), "
+              f"up avg {sum(up) / len(up):.0f} B/s")
+        print(f"  snapshots: {nfull} full avg {full / nfull if nfull else 0:.0f} B, "
+              f"{ndelta} delta avg {delta / ndelta if ndelta else 0:.0f} B, "
+              f"{sum(c['skipped_snapshots'] for c in clients)} skipped")
+
+
+async def _serve(args):
+    server = ArenaServer(args.host, args.port, args.snapshot_interval)
+    await server.start()
+    print(f"Serving arena matches on {args.host}:{server.port}")
+    try:
+        while True:
+            await asyncio.sleep(args.report_every)
+            print_metrics(server.metrics())
+    finally:
+        await server.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Authoritative arena server and loopback load test.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    serve = sub.add_parser("serve", help="run a server until interrupted")
+    serve.add_argument("--host", default=DEFAULT_HOST)
+    serve.add_argument("--port", type=int, default=DEFAULT_PORT)
+    serve.add_argument("--snapshot-interval", type=int, default=SNAPSHOT_INTERVAL, help="ticks between snapshots")
+    serve.add_argument("--report-every", type=float, default=10.0, help="seconds between metric reports")
+    loopback = sub.add_parser("loopback", help="serve bot matches over 127.0.0.1 and report metrics")
+    loopback.add_argument("-m", "--matches", type=int, default=8)
+    loopback.add_argument("--seconds", type=float, default=5.0)
+    loopback.add_argument("--snapshot-interval", type=int, default=SNAPSHOT_INTERVAL, help="ticks between snapshots")
+    loopback.add_argument("--seed", type=int)
+    loopback.add_argument("--json", metavar="PATH", help="also write the metrics as JSON")
+    args = parser.parse_args(argv)
+
+    if args.command == "serve":
+        try:
+            asyncio.run(_serve(args))
+        except KeyboardInterrupt:
+            pass
+        return 0
+
+    metrics, consistent = asyncio.run(run_loopback(args.matches, args.seconds, args.snapshot_interval, args.seed))
+    print_metrics(metrics)
+    print(f"client snapshots match server: {consistent}")
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(metrics, f, indent=2)
+    return 0 if consistent else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,206 @@
+import math
+
+import pygame
+
+from arena_sim import WIDTH, CLASSES, ENTITY_RADIUS, TICK_DT
+from text_cache import render_text
+
+# Draws an arena_sim match state. "full" repaints and flips the whole window
+# every frame; "dirty" restores the background only under what was drawn on
+# the previous frame and pushes just those rectangles to the display.
+
+RENDER_MODES = ("full", "dirty")
+
+BACKGROUND_FILL = (243, 244, 246)
+TEXT_COLOR = (0, 0, 0)
+HP_BACK_COLOR = (200, 0, 0)
+HP_FRONT_COLOR = (0, 200, 0)
+SHIELD_COLOR = (255, 255, 0)
+PROJECTILE_COLOR = (0, 0, 0)
+OVERLAY_FILL = (20, 20, 20)
+OVERLAY_TEXT_COLOR = (230, 230, 230)
+HP_BAR_WIDTH = 40
+HP_BAR_HEIGHT = 6
+
+
+def cooldown_text(label, cooldown):
+    # Rounded up to 0.1s so the readout only changes ten times a second and
+    # the rendered strings are shared through the text cache
+    if cooldown <= 0:
+        return f"{label} Skill Ready"
+    return f"{label} Skill CD: {math.ceil(cooldown * 10) / 10:.1f}"
+
+
+SPRITE_COLORKEY = (255, 0, 255)
+
+
+def circle_sprite(color, radius, width=0):
+    """Pre-renders a colour-keyed circle; returns (surface, offset from centre)."""
+    size = 2 * radius + 2
+    surface = pygame.Surface((size, size))
+    surface.fill(SPRITE_COLORKEY)
+    rect = pygame.draw.circle(surface, color, (radius + 1, radius + 1), radius, width)
+    sprite = surface.subsurface(rect).copy()
+    sprite.set_colorkey(SPRITE_COLORKEY, pygame.RLEACCEL)
+    if pygame.display.get_surface() is not None:
+        sprite = sprite.convert()
+    return sprite, (rect.x - radius - 1, rect.y - radius - 1)
+
+
+def bar_sprite(color):
+    sprite = pygame.Surface((HP_BAR_WIDTH, HP_BAR_HEIGHT))
+    sprite.fill(color)
+    if pygame.display.get_surface() is not None:
+        sprite = sprite.convert()
+    return sprite
+
+
+class ArenaRenderer:
+    def __init__(self, screen, font, background=None, mode="full"):
+        if mode not in RENDER_MODES:
+            raise ValueError(f"Unknown render mode {mode!r}, expected one of {RENDER_MODES}")
+        self.screen = screen
+        self.font = font
+        self.background = background
+        self.mode = mode
+        self.prev_rects = []
+        self.dirty = None
+        self.full_redraw = True
+        self.build_sprites()
+
+    def build_sprites(self):
+        """Rasterises every body, projectile, ring and bar once up front."""
+        self.body_sprites = {
+            name: circle_sprite(c["color"], ENTITY_RADIUS) for name, c in CLASSES.items()
+        }
+        self.projectile_sprites = {}
+        self.shield_sprite = circle_sprite(SHIELD_COLOR, ENTITY_RADIUS + 5, 3)
+        self.hp_back_sprite = bar_sprite(HP_BACK_COLOR)
+        self.hp_front_sprite = bar_sprite(HP_FRONT_COLOR)
+
+    def projectile_sprite(self, radius):
+        sprite = self.projectile_sprites.get(radius)
+        if sprite is None:
+            sprite = self.projectile_sprites[radius] = circle_sprite(PROJECTILE_COLOR, radius)
+        return sprite
+
+    def invalidate(self):
+        """Forces a full repaint next frame, e.g. after an overlay covered the arena."""
+        self.full_redraw = True
+
+    def clear(self, rect=None):
+        if self.background:
+            if rect is None:
+                self.screen.blit(self.background, (0, 0))
+            else:
+                self.screen.blit(self.background, rect, rect)
+        else:
+            self.screen.fill(BACKGROUND_FILL, rect)
+
+    def draw(self, state, alpha=1.0):
+        """Draws the match onto the screen and returns the rects that were touched.
+
+        alpha in [0, 1] places entities between their position before and
+        after the last tick. Each layer is collected into a list and pushed
+        with one blits() call.
+        """
+        screen, font = self.screen, self.font
+        idle_offset = math.sin(pygame.time.get_ticks() / 200.0) * 3
+        player1, player2 = state["player1"], state["player2"]
+        bodies, bars, labels, overlays = [], [], [], []
+        hp_back, hp_front = self.hp_back_sprite, self.hp_front_sprite
+        positions = {}
+
+        for e in state["entities"]:
+            if e.hp <= 0:
+                continue
+
+            # Skip drawing if the Assassin is stealthed
+            if e.className == "Assassin" and e.is_stealthed:
+                continue
+
+            x = e.prev_x + (e.x - e.prev_x) * alpha
+            y = e.prev_y + (e.y - e.prev_y) * alpha
+            positions[e.id] = (x, y)
+            draw_x = int(x)
+            draw_y = int(y)
+
+            if e.isPlayer:
+                draw_y += idle_offset
+
+            sprite, (ox, oy) = self.body_sprites[e.className]
+            bodies.append((sprite, (draw_x + ox, draw_y + oy)))
+
+            hp_ratio = e.hp / e.maxHp
+            hp_bar_pos = (x - HP_BAR_WIDTH // 2, (y - e.radius - 10) + idle_offset)
+            bars.append((hp_back, hp_bar_pos))
+            bars.append((hp_front, hp_bar_pos, (0, 0, HP_BAR_WIDTH * hp_ratio, HP_BAR_HEIGHT)))
+
+            label = render_text(font, e.className, TEXT_COLOR)
+            labels.append((label, (x - label.get_width() // 2, (y + e.radius + 5) + idle_offset)))
+
+        # Draw cooldowns
+        overlays.append((render_text(font, cooldown_text("P1", player1.skillCooldown), TEXT_COLOR), (10, 10)))
+        overlays.append((render_text(font, cooldown_text("P2", player2.skillCooldown), TEXT_COLOR), (WIDTH - 150, 10)))
+
+        shield, (ox, oy) = self.shield_sprite
+        for p in (player1, player2):
+            if p.className == "Knight" and p.is_invulnerable:
+                x, y = positions.get(p.id, (p.x, p.y))
+                overlays.append((shield, (int(x) + ox, int(y) + oy)))
+
+        # Draw projectiles. They fly in straight lines, so the position one
+        # tick back is recovered from the velocity instead of being stored
+        back = (1.0 - alpha) * TICK_DT
+        for proj in state["projectiles"]:
+            sprite, (ox, oy) = self.projectile_sprite(proj.radius)
+            overlays.append((sprite, (int(proj.x - proj.dx * back) + ox, int(proj.y - proj.dy * back) + oy)))
+
+        rects = screen.blits(bodies)
+        rects += screen.blits(bars)
+        rects += screen.blits(labels)
+        rects += screen.blits(overlays)
+        return rects
+
+    def compose(self, state, overlay=None, alpha=1.0):
+        """Draws one frame into the screen surface without presenting it.
+
+        overlay(screen) may draw on top and return the rects it touched.
+        """
+        full = self.mode == "full" or self.full_redraw
+        if full:
+            self.clear()
+        else:
+            # Erase last frame's footprint before redrawing
+            for rect in self.prev_rects:
+                self.clear(rect)
+        rects = self.draw(state, alpha)
+        if overlay is not None:
+            rects += overlay(self.screen)
+        self.dirty = None if full else self.prev_rects + rects
+        self.prev_rects = rects
+        self.full_redraw = False
+
+    def present(self):
+        """Pushes the composed frame: a full flip, or just the old + new dirty areas."""
+        if self.dirty is None:
+            pygame.display.flip()
+        else:
+            pygame.display.update(self.dirty)
+
+    def render(self, state, overlay=None, alpha=1.0):
+        self.compose(state, overlay, alpha)
+        self.present()
+
+
+def draw_profile_overlay(screen, font, summary, x=10, y=40):
+    """Draws a p50/p95/p99 table (ms) from FrameProfiler.summary(); returns its rects."""
+    lines = ["phase          p50    p95    p99"]
+    for phase, stats in summary.items():
+        lines.append(f"{phase:<12}{stats['p50'] / 1e6:6.2f} {stats['p95'] / 1e6:6.2f} {stats['p99'] / 1e6:6.2f}")
+    surfaces = [render_text(font, line, OVERLAY_TEXT_COLOR) for line in lines]
+    line_height = font.get_linesize()
+    panel = pygame.Rect(x, y, max(s.get_width() for s in surfaces) + 12, line_height * len(lines) + 8)
+    screen.fill(OVERLAY_FILL, panel)
+    screen.blits([(surface, (x + 6, y + 4 + i * line_height)) for i, surface in enumerate(surfaces)], False)
+    return [panel]
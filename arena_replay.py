@@ -0,0 +1,160 @@
+import argparse
+import struct
+import sys
+import time
+import zlib
+
+from arena_sim import CLASSES, TICK_RATE, new_match, step
+
+# Match log format (little endian):
+#   header  "TOSR", version u8, tick rate u16, seed u64
+#   4 x     u8 length + UTF-8: player 1 id, player 1 role, player 2 id, player 2 role
+#   u32     tick count
+#   rest    zlib-compressed input bits, two bytes (player 1, player 2) per tick
+# Replaying the inputs against new_match(seed=...) reproduces the match exactly.
+
+REPLAY_MAGIC = b"TOSR"
+REPLAY_VERSION = 1
+REPLAY_EXT = ".tosr"
+_HEADER = struct.Struct("<4sBHQ")
+_COUNT = struct.Struct("<I")
+
+
+class ReplayError(Exception):
+    pass
+
+
+class ReplayRecorder:
+    def __init__(self, seed, player1_id, player1_role, player2_id, player2_role, tick_rate=TICK_RATE):
+        self.seed = seed
+        self.tick_rate = tick_rate
+        self.players = (player1_id, player1_role, player2_id, player2_role)
+        self.inputs = bytearray()
+
+    def record(self, inputs):
+        self.inputs += bytes(inputs)
+
+    def to_bytes(self):
+        out = bytearray(_HEADER.pack(REPLAY_MAGIC, REPLAY_VERSION, self.tick_rate, self.seed))
+        for text in self.players:
+            # Cut to 255 bytes on a character boundary so the id still decodes
+            raw = text.encode("utf-8")[:255].decode("utf-8", "ignore").encode("utf-8")
+            out.append(len(raw))
+            out += raw
+        out += _COUNT.pack(len(self.inputs) // 2)
+        out += zlib.compress(bytes(self.inputs), 9)
+        return bytes(out)
+
+    def save(self, path):
+        with open(path, "wb") as f:
+            f.write(self.to_bytes())
+
+
+def parse_replay(data):
+    """Decodes a match log into a dict with seed, tick_rate, players and inputs.
+
+    Raises ReplayError for anything that isn't a whole, readable match log.
+    """
+    if len(data) < _HEADER.size or data[:4] != REPLAY_MAGIC:
+        raise ReplayError("not an arena replay")
+    magic, version, tick_rate, seed = _HEADER.unpack_from(data)
+    if version != REPLAY_VERSION:
+        raise ReplayError(f"unsupported replay version {version}")
+    if tick_rate == 0:
+        raise ReplayError("replay has a tick rate of 0")
+    pos = _HEADER.size
+    players = []
+    for _ in range(4):
+        if pos >= len(data):
+            raise ReplayError("replay is truncated in the player names")
+        n = data[pos]
+        if pos + 1 + n > len(data):
+            raise ReplayError("replay is truncated in the player names")
+        try:
+            players.append(data[pos + 1:pos + 1 + n].decode("utf-8"))
+        except UnicodeDecodeError as e:
+            raise ReplayError(f"player name is not UTF-8: {e}") from e
+        pos += 1 + n
+    if pos + _COUNT.size > len(data):
+        raise ReplayError("replay is truncated before the tick count")
+    (ticks,) = _COUNT.unpack_from(data, pos)
+    try:
+        inputs = zlib.decompress(data[pos + _COUNT.size:])
+    except zlib.error as e:
+        raise ReplayError(f"corrupt replay inputs: {e}") from e
+    if len(inputs) != 2 * ticks:
+        raise ReplayError(f"replay says {ticks} ticks but holds {len(inputs) // 2}")
+    for role in (players[1], players[3]):
+        if role not in CLASSES:
+            raise ReplayError(f"unknown role {role!r}")
+    return {
+        "seed": seed,
+        "tick_rate": tick_rate,
+        "player1_id": players[0],
+        "player1_role": players[1],
+        "player2_id": players[2],
+        "player2_role": players[3],
+        "ticks": ticks,
+        "inputs": inputs,
+    }
+
+
+def load_replay(path):
+    with open(path, "rb") as f:
+        return parse_replay(f.read())
+
+
+def replay_match(replay):
+    """Fresh match state for a replay, before any tick has run."""
+    return new_match(replay["player1_id"], replay["player1_role"],
+                     replay["player2_id"], replay["player2_role"], seed=replay["seed"])
+
+
+def replay_inputs(replay, tick):
+    inputs = replay["inputs"]
+    return inputs[2 * tick], inputs[2 * tick + 1]
+
+
+def seek(replay, state, target_tick):
+    """Advances state to target_tick, restarting from tick 0 if it is behind state."""
+    target_tick = max(0, min(target_tick, replay["ticks"]))
+    if state is None or target_tick < state["tick"]:
+        state = replay_match(replay)
+    dt = 1.0 / replay["tick_rate"]
+    inputs = replay["inputs"]
+    for t in range(state["tick"], target_tick):
+        step(state, (inputs[2 * t], inputs[2 * t + 1]), dt)
+    return state
+
+
+def run_headless(replay):
+    """Re-simulates the whole log as fast as possible and returns the final state."""
+    return seek(replay, None, replay["ticks"])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Re-simulate recorded arena matches headless.")
+    parser.add_argument("replays", nargs="+", help="match logs written by gc.2.py")
+    args = parser.parse_args(argv)
+
+    total_ticks = 0
+    start = time.perf_counter()
+    for path in args.replays:
+        try:
+            replay = load_replay(path)
+        except (OSError, ReplayError) as e:
+            print(f"{path}: {e}", file=sys.stderr)
+            continue
+        state = run_headless(replay)
+        total_ticks += state["tick"]
+        p1, p2 = state["player1"], state["player2"]
+        print(f"{path}: {replay['player1_role']} vs {replay['player2_role']}, "
+              f"{state['tick']} ticks, winner {state['winner']}, hp {p1.hp}/{p2.hp}")
+    elapsed = time.perf_counter() - start
+    if elapsed > 0:
+        print(f"{len(args.replays)} replays, {total_ticks} ticks in {elapsed:.2f}s "
+              f"({total_ticks / elapsed:.0f} ticks/s)")
+
+
+if __name__ == "__main__":
+    main()
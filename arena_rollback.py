@@ -0,0 +1,146 @@
+import numpy as np
+
+from arena_sim import IN_SKILL, TICK_DT
+from arena_soa import step
+
+# Snapshot/restore and rollback for the array-backed arena_soa world. A
+# snapshot is a set of preallocated arrays mirroring every column store, so
+# taking one is a handful of slice copies plus the RNG state; nothing is
+# walked entity by entity and nothing is allocated once the buffers are big
+# enough.
+
+MAX_ROLLBACK = 8  # ticks a late remote input may reach back
+
+
+class RollbackError(Exception):
+    pass
+
+
+class StoreSnapshot:
+    """Preallocated copy of a ColumnStore's live rows."""
+
+    def __init__(self, store):
+        self.fields = [name for name, _ in store.FIELDS]
+        self.columns = {name: np.zeros(store.capacity, dtype=dtype) for name, dtype in store.FIELDS}
+        self.count = 0
+
+    def save(self, store):
+        n = store.count
+        if n > len(self.columns[self.fields[0]]):
+            self.columns = {name: np.zeros(store.capacity, dtype=column.dtype)
+                            for name, column in self.columns.items()}
+        for name in self.fields:
+            self.columns[name][:n] = getattr(store, name)[:n]
+        self.count = n
+
+    def load(self, store):
+        n = self.count
+        store._reserve(n - store.count)
+        for name in self.fields:
+            getattr(store, name)[:n] = self.columns[name][:n]
+        store.count = n
+
+
+class WorldSnapshot:
+    def __init__(self, world):
+        self.entities = StoreSnapshot(world["entities"])
+        self.projectiles = StoreSnapshot(world["projectiles"])
+        self.ids = []
+        self.tick = 0
+        self.time = 0.0
+        self.winner = None
+        self.rng_state = None
+
+
+def snapshot(world, out=None):
+    """Copies the complete world state into out (reused if given) and returns it."""
+    if out is None:
+        out = WorldSnapshot(world)
+    out.entities.save(world["entities"])
+    out.projectiles.save(world["projectiles"])
+    out.ids = world["entities"].ids[:]
+    out.tick = world["tick"]
+    out.time = world["time"]
+    out.winner = world["winner"]
+    out.rng_state = world["rng"].getstate()
+    return out
+
+
+def restore(world, snap):
+    """Puts world back exactly as it was when snap was taken."""
+    snap.entities.load(world["entities"])
+    snap.projectiles.load(world["projectiles"])
+    world["entities"].ids = snap.ids[:]
+    world["tick"] = snap.tick
+    world["time"] = snap.time
+    world["winner"] = snap.winner
+    world["events"] = []
+    world["rng"].setstate(snap.rng_state)
+    return world
+
+
+class RollbackSession:
+    """Runs a world ahead on predicted remote inputs and corrects it when they arrive.
+
+    local_side is 0 or 1. Each advance() steps one tick with the local input
+    and the remote player's confirmed input for that tick, or a prediction:
+    their last confirmed bits held, minus IN_SKILL since a press never
+    repeats. add_remote_input() for a tick already simulated with a wrong
+    prediction rewinds to that tick and re-simulates up to the present.
+    """
+
+    def __init__(self, world, local_side, max_rollback=MAX_ROLLBACK, dt=TICK_DT):
+        self.world = world
+        self.local_side = local_side
+        self.max_rollback = max_rollback
+        self.dt = dt
+        # Ring of the state before each of the last max_rollback + 1 ticks
+        self.ring = [WorldSnapshot(world) for _ in range(max_rollback + 1)]
+        self.local = {}
+        self.remote = {}
+        self.used = {}  # tick -> remote bits the simulation actually used
+        self.last_remote = 0
+        self.rollbacks = 0
+        self.resimulated = 0
+
+    def _predict(self, tick):
+        bits = self.remote.get(tick)
+        if bits is None:
+            bits = self.last_remote & ~IN_SKILL
+        return bits
+
+    def _step(self, tick):
+        snapshot(self.world, self.ring[tick % len(self.ring)])
+        remote = self._predict(tick)
+        self.used[tick] = remote
+        local = self.local[tick]
+        step(self.world, (local, remote) if self.local_side == 0 else (remote, local), self.dt)
+
+    def advance(self, local_bits):
+        """Steps the world one tick with this machine's input."""
+        tick = self.world["tick"]
+        self.local[tick] = local_bits
+        self._step(tick)
+        self._forget(tick - self.max_rollback)
+
+    def add_remote_input(self, tick, bits):
+        """Records the remote player's input for tick, rolling back if it was mispredicted."""
+        self.remote[tick] = bits
+        if tick >= max(self.remote):
+            self.last_remote = bits
+        now = self.world["tick"]
+        if tick >= now or self.used.get(tick) == bits:
+            return
+        if tick < now - self.max_rollback:
+            raise RollbackError(f"input for tick {tick} arrived {now - tick} ticks late "
+                                f"(limit {self.max_rollback})")
+        restore(self.world, self.ring[tick % len(self.ring)])
+        for t in range(tick, now):
+            self._step(t)
+        self.rollbacks += 1
+        self.resimulated += now - tick
+
+    def _forget(self, before):
+        for table in (self.local, self.remote, self.used):
+            for t in [t for t in table if t < before]:
+                del table[t]
@@ -0,0 +1,413 @@
+import math
+import random
+from itertools import chain
+from time import perf_counter_ns
+
+from entity_registry import EntityRegistry
+from projectile_pool import PROJECTILE_CAPACITY, ProjectilePool
+from spatial_hash import SpatialHash
+
+# Arena rules for gc.2.py. Nothing in here touches pygame, so a match can be
+# stepped headless (balance sims, replays, bots) as well as from the window.
+
+# Arena size
+WIDTH, HEIGHT = 800, 600
+ATTACK_DAMAGE = 25  # Normal attack damage
+SKILL_DAMAGE = 75  # Skill damage
+
+# Define character classes
+CLASSES = {
+    "Knight": {"maxHp": 660, "speed": 1.2, "color": (37, 99, 235), "special_skill": "Divine Shield", "shield_duration": 2.0},
+    "Assassin": {"maxHp": 660, "speed": 2.2, "color": (124, 58, 237), "stealth_duration": 3.0, "special_skill": "Stealth"},
+    "Mage": {"maxHp": 660, "speed": 1.5, "color": (251, 146, 60), "special_skill": "Fireball", "attackDamage": 75},
+    "Healer": {"maxHp": 660, "speed": 1.4, "color": (16, 185, 129), "special_skill": "Heal"},
+    "Summoner": {"maxHp": 660, "speed": 1.3, "color": (146, 64, 14), "special_skill": "Summon Beast"},
+    "Warrior": {"maxHp": 660, "speed": 1.6, "color": (239, 68, 68), "special_skill": "Charge", "charge_speed": 400, "charge_duration": 0.5, "charge_damage": 30},
+    "Beast": {"maxHp": 660, "speed": 1.8, "color": (17, 24, 39), "attackCooldown": 1.5, "attackDamage": 20, "lifespan": 3.0},
+}
+ROLE_NAMES = ["Knight", "Assassin", "Mage", "Healer", "Summoner", "Warrior"]
+
+UNIVERSAL_COOLDOWN = 10.0
+ATTACK_COOLDOWN = 0.6
+MOVE_SCALE = 120  # px/s per point of class speed
+PROJECTILE_SPEED = 300
+BEAST_ATTACK_RANGE = 300
+ENTITY_RADIUS = 16
+SUMMON_OFFSET = {"A": 40, "B": -40}  # Beasts spawn on the side facing the enemy
+
+# Simulation rate. Fixed and independent of how often the window redraws, so
+# a projectile never moves more than a few px (well under ENTITY_RADIUS) per tick.
+TICK_RATE = 120
+TICK_DT = 1.0 / TICK_RATE
+
+# Per-player input bits, sampled once per tick. IN_SKILL is edge-triggered:
+# set it only on the tick the skill key went down.
+IN_UP = 1
+IN_DOWN = 2
+IN_LEFT = 4
+IN_RIGHT = 8
+IN_ATTACK = 16
+IN_SKILL = 32
+
+# Projectile hits go through a uniform-grid broadphase; set to False (or pass
+# spatial_hash=False to new_match) to brute-force every entity instead
+USE_SPATIAL_HASH = True
+
+# Sound cues emitted into state["events"] for whoever is presenting the match
+EV_HIT = "hit_sound"
+EV_SKILL = "skill_sound"
+
+
+# ---------------- ENTITIES ----------------
+# Slotted so a long session with thousands of Beasts and shots doesn't pay a
+# hash table per object. Skill timers only exist on the class that uses them;
+# the is_* flags stay on the base because every entity is checked for them.
+class Entity:
+    __slots__ = (
+        "id", "className", "team", "x", "y", "prev_x", "prev_y", "hp", "maxHp", "speed", "radius",
+        "color", "isPlayer", "attackCooldown", "skillCooldown", "is_stealthed", "is_invulnerable", "is_charging",
+    )
+
+    def __init__(self, entity_id, class_name, team, x, y, stats, is_player):
+        self.id = entity_id
+        self.className = class_name
+        self.team = team
+        self.x = float(x)
+        self.y = float(y)
+        self.prev_x = self.x  # position before the last tick, for render interpolation
+        self.prev_y = self.y
+        self.hp = stats["maxHp"]
+        self.maxHp = stats["maxHp"]
+        self.speed = stats["speed"]
+        self.radius = ENTITY_RADIUS
+        self.color = stats["color"]
+        self.isPlayer = is_player
+        self.attackCooldown = 0
+        self.skillCooldown = 0
+        self.is_stealthed = False
+        self.is_invulnerable = False
+        self.is_charging = False
+
+
+class Knight(Entity):
+    __slots__ = ("invulnerable_timer",)
+
+    def __init__(self, *args):
+        super().__init__(*args)
+        self.invulnerable_timer = 0
+
+
+class Assassin(Entity):
+    __slots__ = ("stealth_timer",)
+
+    def __init__(self, *args):
+        super().__init__(*args)
+        self.stealth_timer = 0
+
+
+class Warrior(Entity):
+    __slots__ = ("charge_timer", "charge_direction_x", "charge_direction_y")
+
+    def __init__(self, *args):
+        super().__init__(*args)
+        self.charge_timer = 0
+        self.charge_direction_x = 0
+        self.charge_direction_y = 0
+
+
+class Beast(Entity):
+    __slots__ = ("lifespan_timer",)
+
+    def __init__(self, *args):
+        super().__init__(*args)
+        self.lifespan_timer = CLASSES["Beast"]["lifespan"]
+
+
+ENTITY_TYPES = {"Knight": Knight, "Assassin": Assassin, "Warrior": Warrior, "Beast": Beast}
+
+
+def create_entity(class_name, team, x, y, is_player=False, player_id="", rng=random):
+    entity_id = f"player-{player_id}" if is_player else f"{team}-{class_name}-{rng.randint(1000,9999)}"
+    stats = CLASSES.get(class_name, CLASSES["Knight"])
+    return ENTITY_TYPES.get(class_name, Entity)(entity_id, class_name, team, x, y, stats, is_player)
+
+
+def dist(a, b):
+    dx = a.x - b.x
+    dy = a.y - b.y
+    return math.sqrt(dx * dx + dy * dy)
+
+
+def new_match(player1_id, player1_role, player2_id, player2_role, spatial_hash=None,
+              projectile_capacity=PROJECTILE_CAPACITY, seed=None):
+    """Builds the starting state for a 1v1 match.
+
+    All randomness inside the match comes from state["rng"], so the same seed
+    and the same per-tick inputs always replay the same match.
+    """
+    if spatial_hash is None:
+        spatial_hash = USE_SPATIAL_HASH
+    player1 = create_entity(player1_role, "A", WIDTH // 4, HEIGHT // 2, True, player1_id)
+    player2 = create_entity(player2_role, "B", 3 * WIDTH // 4, HEIGHT // 2, True, player2_id)
+    return {
+        "entities": EntityRegistry((player1, player2)),
+        "projectiles": ProjectilePool(projectile_capacity),
+        "player1": player1,
+        "player2": player2,
+        "tick": 0,
+        "time": 0.0,
+        "winner": None,
+        "events": [],
+        "seed": seed,
+        "rng": random.Random(seed),
+        "spatial_hash": SpatialHash(WIDTH, HEIGHT) if spatial_hash else None,
+        "ai": None,
+    }
+
+
+def save_previous_positions(state):
+    """Remembers every entity's position so a renderer can interpolate the next tick."""
+    for e in state["entities"]:
+        e.prev_x = e.x
+        e.prev_y = e.y
+
+
+def opponent_of(state, p):
+    return state["player2"] if p is state["player1"] else state["player1"]
+
+
+def _aim(src, target):
+    dx, dy = target.x - src.x, target.y - src.y
+    dist_val = math.sqrt(dx * dx + dy * dy)
+    if dist_val > 0:
+        dx /= dist_val
+        dy /= dist_val
+    return dx, dy
+
+
+def _spawn_projectile(state, src, ndx, ndy, radius, damage):
+    state["projectiles"].spawn(
+        src.x, src.y, ndx * PROJECTILE_SPEED, ndy * PROJECTILE_SPEED, radius, src.team, damage,
+    )
+
+
+def _fire(state, src, target, radius, damage):
+    dx, dy = _aim(src, target)
+    _spawn_projectile(state, src, dx, dy, radius, damage)
+
+
+# ---------------- TICK PHASES ----------------
+def cast_skill(state, p):
+    """Fires p's class skill at the other player and starts the cooldown."""
+    enemy = opponent_of(state, p)
+    state["events"].append(EV_SKILL)
+    if p.className == "Mage":
+        _fire(state, p, enemy, 8, SKILL_DAMAGE)
+    elif p.className == "Healer":
+        for ally in state["entities"].team(p.team):
+            if ally.hp > 0:
+                ally.hp = min(ally.maxHp, ally.hp + SKILL_DAMAGE)
+    elif p.className == "Summoner":
+        state["entities"].add(create_entity("Beast", p.team, p.x + SUMMON_OFFSET[p.team], p.y, False, rng=state["rng"]))
+    elif p.className == "Assassin":
+        p.is_stealthed = True
+        p.stealth_timer = CLASSES["Assassin"]["stealth_duration"]
+    elif p.className == "Warrior":
+        dx, dy = enemy.x - p.x, enemy.y - p.y
+        dist_val = math.sqrt(dx * dx + dy * dy)
+        if dist_val > 0:
+            p.charge_direction_x = dx / dist_val
+            p.charge_direction_y = dy / dist_val
+        p.is_charging = True
+        p.charge_timer = CLASSES["Warrior"]["charge_duration"]
+    elif p.className == "Knight":
+        p.is_invulnerable = True
+        p.invulnerable_timer = CLASSES["Knight"]["shield_duration"]
+
+    p.skillCooldown = UNIVERSAL_COOLDOWN
+
+
+def phase_skills(state, inputs, dt):
+    for p, bits in zip((state["player1"], state["player2"]), inputs):
+        if bits & IN_SKILL and p.skillCooldown <= 0:
+            cast_skill(state, p)
+
+
+def phase_players(state, inputs, dt):
+    for p, bits in zip((state["player1"], state["player2"]), inputs):
+        if not p.is_charging:
+            step_len = p.speed * MOVE_SCALE * dt
+            if bits & IN_UP: p.y -= step_len
+            if bits & IN_DOWN: p.y += step_len
+            if bits & IN_LEFT: p.x -= step_len
+            if bits & IN_RIGHT: p.x += step_len
+
+        if bits & IN_ATTACK and p.attackCooldown <= 0:
+            _fire(state, p, opponent_of(state, p), 5, ATTACK_DAMAGE)
+            p.attackCooldown = ATTACK_COOLDOWN
+
+
+def phase_charge(state, inputs, dt):
+    warrior = CLASSES["Warrior"]
+    for p in (state["player1"], state["player2"]):
+        if not p.is_charging:
+            continue
+        p.x += p.charge_direction_x * warrior["charge_speed"] * dt
+        p.y += p.charge_direction_y * warrior["charge_speed"] * dt
+
+        # Collision check during charge
+        enemy = opponent_of(state, p)
+        if dist(p, enemy) < p.radius + enemy.radius and not enemy.is_invulnerable:
+            enemy.hp -= warrior["charge_damage"]
+            state["events"].append(EV_HIT)
+
+        p.charge_timer -= dt
+        if p.charge_timer <= 0:
+            p.is_charging = False
+
+
+def phase_beasts(state, inputs, dt):
+    entities = state["entities"]
+    beast = CLASSES["Beast"]
+    ai = state["ai"]  # an arena_ai.AIDirector steers Beasts instead of the chase below
+    # Copied since expired Beasts are removed mid-loop
+    for e in list(entities.of_class("Beast")):
+        e.lifespan_timer -= dt
+        if e.lifespan_timer <= 0:
+            entities.remove(e)
+            continue
+
+        enemy = state["player1"] if e.team == "B" else state["player2"]
+        if enemy in entities:
+            dx, dy = enemy.x - e.x, enemy.y - e.y
+            dist_val = dist(e, enemy)
+            if ai is not None:
+                ai.move_beast(state, e, dx, dy, dist_val, dt)
+            elif dist_val > 0:
+                # Chase the enemy
+                e.x += (dx / dist_val) * e.speed * MOVE_SCALE * dt
+                e.y += (dy / dist_val) * e.speed * MOVE_SCALE * dt
+
+            # Attack when close
+            # Aim is taken from where the Beast stood before this tick's step
+            if e.attackCooldown <= 0 and dist_val < BEAST_ATTACK_RANGE:
+                ndx, ndy = dx, dy
+                if dist_val > 0:
+                    ndx /= dist_val
+                    ndy /= dist_val
+                _spawn_projectile(state, e, ndx, ndy, 5, beast["attackDamage"])
+                e.attackCooldown = beast["attackCooldown"]
+
+
+def phase_timers(state, inputs, dt):
+    for e in state["entities"]:
+        if e.attackCooldown > 0: e.attackCooldown -= dt
+        if e.skillCooldown > 0: e.skillCooldown -= dt
+        if e.is_stealthed:
+            e.stealth_timer -= dt
+            if e.stealth_timer <= 0:
+                e.is_stealthed = False
+        if e.is_invulnerable:
+            e.invulnerable_timer -= dt
+            if e.invulnerable_timer <= 0:
+                e.is_invulnerable = False
+
+
+def _first_hit(proj, candidates, ordered):
+    """Returns the earliest (by entity order) live enemy the projectile overlaps."""
+    best = None
+    for order, e in candidates:
+        if e.team != proj.team and e.hp > 0:
+            dx = proj.x - e.x
+            dy = proj.y - e.y
+            if dx * dx + dy * dy < e.radius * e.radius and (best is None or order < best[0]):
+                best = (order, e)
+                if ordered:
+                    break
+    return best and best[1]
+
+
+def phase_projectiles(state, inputs, dt):
+    pool = state["projectiles"]
+    items = pool.items
+    # Immunity can't change during this phase, so filter it out up front
+    targets = [e for e in state["entities"]
+               if e.hp > 0 and not (e.is_invulnerable or e.is_stealthed)]
+    grid = state["spatial_hash"]
+    if grid is not None:
+        grid.rebuild(targets)
+
+    # Survivors are swapped down to items[0:live], keeping their firing order
+    live = 0
+    for i in range(pool.count):
+        proj = items[i]
+        proj.x += proj.dx * dt
+        proj.y += proj.dy * dt
+
+        if not (0 <= proj.x <= WIDTH and 0 <= proj.y <= HEIGHT):
+            continue
+
+        if grid is not None:
+            buckets = grid.near(proj.x, proj.y)
+            e = _first_hit(proj, chain.from_iterable(buckets), False) if buckets else None
+        else:
+            e = _first_hit(proj, enumerate(targets), True)
+        if e is not None:
+            e.hp -= proj.damage
+            state["events"].append(EV_HIT)
+            if e.hp <= 0:
+                e.hp = 0
+            continue
+
+        if i != live:
+            items[i], items[live] = items[live], proj
+        live += 1
+    pool.count = live
+
+
+def phase_winner(state, inputs, dt):
+    if state["player1"].hp <= 0:
+        state["winner"] = state["player2"].id
+    elif state["player2"].hp <= 0:
+        state["winner"] = state["player1"].id
+
+
+# Same order as the original game_loop body; names are the profiler labels
+PHASES = [
+    ("skills", phase_skills),
+    ("movement", phase_players),
+    ("charge", phase_charge),
+    ("beasts", phase_beasts),
+    ("cooldowns", phase_timers),
+    ("projectiles", phase_projectiles),
+    ("winner", phase_winner),
+]
+
+
+def step(state, inputs, dt=TICK_DT, profiler=None):
+    """Advances the match by one tick. inputs is (player1_bits, player2_bits).
+
+    With a frame_profiler.FrameProfiler, each phase is timed into it.
+    """
+    state["events"] = []
+    if profiler is None:
+        for _, phase in PHASES:
+            phase(state, inputs, dt)
+    else:
+        for name, phase in PHASES:
+            t = perf_counter_ns()
+            phase(state, inputs, dt)
+            profiler.add(name, perf_counter_ns() - t)
+    state["tick"] += 1
+    state["time"] += dt
+    return state
+
+
+def run_match(state, policy, max_ticks=TICK_RATE * 180, dt=TICK_DT):
+    """Steps state until someone wins or max_ticks runs out.
+
+    policy(state) returns the inputs tuple for the next tick.
+    """
+    while state["winner"] is None and state["tick"] < max_ticks:
+        step(state, policy(state), dt)
+    return state["winner"]
@@ -0,0 +1,362 @@
+import math
+import random
+from time import perf_counter_ns
+
+import numpy as np
+
+from arena_sim import (
+    WIDTH, HEIGHT, ATTACK_DAMAGE, SKILL_DAMAGE, CLASSES, UNIVERSAL_COOLDOWN,
+    ATTACK_COOLDOWN, MOVE_SCALE, PROJECTILE_SPEED, BEAST_ATTACK_RANGE, SUMMON_OFFSET,
+    TICK_DT, IN_UP, IN_DOWN, IN_LEFT, IN_RIGHT, IN_ATTACK, IN_SKILL, EV_HIT, EV_SKILL,
+)
+
+# Struct-of-arrays version of the arena_sim rules for stress scenes (hundreds
+# of Beasts, thousands of projectiles). Each store keeps one NumPy column per
+# field; rows [0, count) are live. The two players always sit in rows 0 and 1.
+
+CLASS_NAMES = list(CLASSES)
+CLASS_INDEX = {name: i for i, name in enumerate(CLASS_NAMES)}
+BEAST = CLASS_INDEX["Beast"]
+TEAM_NAMES = ("A", "B")
+TEAM_INDEX = {"A": 0, "B": 1}
+
+PROJECTILE_HIT_CHUNK = 2048  # rows per projectile x entity distance block
+
+
+class ColumnStore:
+    """Fixed set of typed columns that grow together by doubling."""
+
+    FIELDS = ()
+
+    def __init__(self, capacity=64):
+        self.capacity = capacity
+        self.count = 0
+        for name, dtype in self.FIELDS:
+            setattr(self, name, np.zeros(capacity, dtype=dtype))
+
+    def _reserve(self, n):
+        if self.count + n <= self.capacity:
+            return
+        capacity = self.capacity
+        while capacity < self.count + n:
+            capacity *= 2
+        for name, dtype in self.FIELDS:
+            column = np.zeros(capacity, dtype=dtype)
+            column[:self.count] = getattr(self, name)[:self.count]
+            setattr(self, name, column)
+        self.capacity = capacity
+
+    def append(self, **values):
+        """Adds one row per element of the (equal length) value arrays."""
+        n = len(next(iter(values.values())))
+        if n == 0:
+            return
+        self._reserve(n)
+        lo, hi = self.count, self.count + n
+        for name, value in values.items():
+            getattr(self, name)[lo:hi] = value
+        self.count = hi
+
+    def compact(self, keep):
+        """Drops rows where keep is False, preserving the order of the rest."""
+        n = int(np.count_nonzero(keep))
+        if n == self.count:
+            return
+        for name, _ in self.FIELDS:
+            column = getattr(self, name)
+            column[:n] = column[:self.count][keep]
+        self.count = n
+
+
+class EntityStore(ColumnStore):
+    FIELDS = (
+        ("x", np.float64), ("y", np.float64),
+        ("hp", np.float64), ("max_hp", np.float64),
+        ("speed", np.float64), ("radius", np.float64),
+        ("team", np.int8), ("cls", np.int8),
+        ("is_player", np.bool_),
+        ("attack_cd", np.float64), ("skill_cd", np.float64),
+        ("stealthed", np.bool_), ("stealth_timer", np.float64),
+        ("charging", np.bool_), ("charge_timer", np.float64),
+        ("charge_dx", np.float64), ("charge_dy", np.float64),
+        ("invulnerable", np.bool_), ("invuln_timer", np.float64),
+        ("lifespan", np.float64),
+    )
+
+    def __init__(self, capacity=64):
+        super().__init__(capacity)
+        self.ids = []
+
+    def add(self, class_name, team, x, y, is_player=False, entity_id=""):
+        c = CLASSES.get(class_name, CLASSES["Knight"])
+        self.append(
+            x=[float(x)], y=[float(y)], hp=[c["maxHp"]], max_hp=[c["maxHp"]],
+            speed=[c["speed"]], radius=[16], team=[TEAM_INDEX[team]],
+            cls=[CLASS_INDEX[class_name]], is_player=[is_player],
+            attack_cd=[0], skill_cd=[0], stealthed=[False], stealth_timer=[0],
+            charging=[False], charge_timer=[0], charge_dx=[0], charge_dy=[0],
+            invulnerable=[False], invuln_timer=[0], lifespan=[c.get("lifespan", 0)],
+        )
+        self.ids.append(entity_id)
+        return self.count - 1
+
+    def compact(self, keep):
+        if np.count_nonzero(keep) != self.count:
+            self.ids = [i for i, k in zip(self.ids, keep) if k]
+        super().compact(keep)
+
+
+class ProjectileStore(ColumnStore):
+    FIELDS = (
+        ("x", np.float64), ("y", np.float64),
+        ("dx", np.float64), ("dy", np.float64),
+        ("radius", np.float64), ("team", np.int8), ("damage", np.float64),
+    )
+
+
+def new_world(player1_id, player1_role, player2_id, player2_role, capacity=64, seed=None):
+    """Array-backed counterpart of arena_sim.new_match()."""
+    entities = EntityStore(capacity)
+    entities.add(player1_role, "A", WIDTH // 4, HEIGHT // 2, True, f"player-{player1_id}")
+    entities.add(player2_role, "B", 3 * WIDTH // 4, HEIGHT // 2, True, f"player-{player2_id}")
+    return {
+        "entities": entities,
+        "projectiles": ProjectileStore(capacity),
+        "tick": 0,
+        "time": 0.0,
+        "winner": None,
+        "events": [],
+        "seed": seed,
+        "rng": random.Random(seed),
+    }
+
+
+def summon_beast(world, team, x, y):
+    entities = world["entities"]
+    return entities.add("Beast", team, x, y, False, f"{team}-Beast-{world['rng'].randint(1000,9999)}")
+
+
+def _fire(world, i, target, radius, damage):
+    ents = world["entities"]
+    dx, dy = ents.x[target] - ents.x[i], ents.y[target] - ents.y[i]
+    dist_val = math.sqrt(dx * dx + dy * dy)
+    if dist_val > 0:
+        dx /= dist_val
+        dy /= dist_val
+    world["projectiles"].append(
+        x=[ents.x[i]], y=[ents.y[i]], dx=[dx * PROJECTILE_SPEED], dy=[dy * PROJECTILE_SPEED],
+        radius=[radius], team=[ents.team[i]], damage=[damage],
+    )
+
+
+# ---------------- TICK PHASES ----------------
+def cast_skill(world, i):
+    ents = world["entities"]
+    enemy = 1 - i
+    name = CLASS_NAMES[ents.cls[i]]
+    world["events"].append(EV_SKILL)
+    if name == "Mage":
+        _fire(world, i, enemy, 8, SKILL_DAMAGE)
+    elif name == "Healer":
+        n = ents.count
+        allies = (ents.team[:n] == ents.team[i]) & (ents.hp[:n] > 0)
+        ents.hp[:n][allies] = np.minimum(ents.max_hp[:n][allies], ents.hp[:n][allies] + SKILL_DAMAGE)
+    elif name == "Summoner":
+        team = TEAM_NAMES[ents.team[i]]
+        summon_beast(world, team, ents.x[i] + SUMMON_OFFSET[team], ents.y[i])
+    elif name == "Assassin":
+        ents.stealthed[i] = True
+        ents.stealth_timer[i] = CLASSES["Assassin"]["stealth_duration"]
+    elif name == "Warrior":
+        dx, dy = ents.x[enemy] - ents.x[i], ents.y[enemy] - ents.y[i]
+        dist_val = math.sqrt(dx * dx + dy * dy)
+        if dist_val > 0:
+            ents.charge_dx[i] = dx / dist_val
+            ents.charge_dy[i] = dy / dist_val
+        ents.charging[i] = True
+        ents.charge_timer[i] = CLASSES["Warrior"]["charge_duration"]
+    elif name == "Knight":
+        ents.invulnerable[i] = True
+        ents.invuln_timer[i] = CLASSES["Knight"]["shield_duration"]
+
+    ents.skill_cd[i] = UNIVERSAL_COOLDOWN
+
+
+def phase_skills(world, inputs, dt):
+    ents = world["entities"]
+    for i, bits in enumerate(inputs):
+        if bits & IN_SKILL and ents.skill_cd[i] <= 0:
+            cast_skill(world, i)
+
+
+def phase_players(world, inputs, dt):
+    ents = world["entities"]
+    for i, bits in enumerate(inputs):
+        if not ents.charging[i]:
+            step_len = ents.speed[i] * MOVE_SCALE * dt
+            if bits & IN_UP: ents.y[i] -= step_len
+            if bits & IN_DOWN: ents.y[i] += step_len
+            if bits & IN_LEFT: ents.x[i] -= step_len
+            if bits & IN_RIGHT: ents.x[i] += step_len
+
+        if bits & IN_ATTACK and ents.attack_cd[i] <= 0:
+            _fire(world, i, 1 - i, 5, ATTACK_DAMAGE)
+            ents.attack_cd[i] = ATTACK_COOLDOWN
+
+
+def phase_charge(world, inputs, dt):
+    ents = world["entities"]
+    warrior = CLASSES["Warrior"]
+    for i in (0, 1):
+        if not ents.charging[i]:
+            continue
+        ents.x[i] += ents.charge_dx[i] * warrior["charge_speed"] * dt
+        ents.y[i] += ents.charge_dy[i] * warrior["charge_speed"] * dt
+
+        enemy = 1 - i
+        dx, dy = ents.x[i] - ents.x[enemy], ents.y[i] - ents.y[enemy]
+        if math.sqrt(dx * dx + dy * dy) < ents.radius[i] + ents.radius[enemy] and not ents.invulnerable[enemy]:
+            ents.hp[enemy] -= warrior["charge_damage"]
+            world["events"].append(EV_HIT)
+
+        ents.charge_timer[i] -= dt
+        if ents.charge_timer[i] <= 0:
+            ents.charging[i] = False
+
+
+def phase_beasts(world, inputs, dt):
+    """Lifespan, chase and attack for every Beast in one pass."""
+    ents = world["entities"]
+    n = ents.count
+    beasts = ents.cls[:n] == BEAST
+    if not beasts.any():
+        return
+    ents.lifespan[:n][beasts] -= dt
+    expired = beasts & (ents.lifespan[:n] <= 0)
+    if expired.any():
+        ents.compact(~expired)
+        n = ents.count
+        beasts = ents.cls[:n] == BEAST
+
+    idx = np.flatnonzero(beasts)
+    if idx.size == 0:
+        return
+    # Team B Beasts hunt player 1 (row 0), team A Beasts hunt player 2 (row 1)
+    enemy = np.where(ents.team[idx] == 1, 0, 1)
+    dx = ents.x[enemy] - ents.x[idx]
+    dy = ents.y[enemy] - ents.y[idx]
+    dist_val = np.sqrt(dx * dx + dy * dy)
+    moving = dist_val > 0
+    safe = np.where(moving, dist_val, 1.0)
+    ndx = np.where(moving, dx / safe, dx)
+    ndy = np.where(moving, dy / safe, dy)
+    speed = ents.speed[idx]
+    ents.x[idx] += np.where(moving, ndx * speed * MOVE_SCALE * dt, 0.0)
+    ents.y[idx] += np.where(moving, ndy * speed * MOVE_SCALE * dt, 0.0)
+
+    shooting = (ents.attack_cd[idx] <= 0) & (dist_val < BEAST_ATTACK_RANGE)
+    if shooting.any():
+        shooters = idx[shooting]
+        k = shooters.size
+        world["projectiles"].append(
+            x=ents.x[shooters], y=ents.y[shooters],
+            dx=ndx[shooting] * PROJECTILE_SPEED, dy=ndy[shooting] * PROJECTILE_SPEED,
+            radius=np.full(k, 5.0), team=ents.team[shooters],
+            damage=np.full(k, float(CLASSES["Beast"]["attackDamage"])),
+        )
+        ents.attack_cd[shooters] = CLASSES["Beast"]["attackCooldown"]
+
+
+def phase_timers(world, inputs, dt):
+    """Cooldown and status-timer decay for all entities in one pass."""
+    ents = world["entities"]
+    n = ents.count
+    for name in ("attack_cd", "skill_cd"):
+        column = getattr(ents, name)[:n]
+        column[column > 0] -= dt
+    for flag_name, timer_name in (("stealthed", "stealth_timer"), ("invulnerable", "invuln_timer")):
+        flag = getattr(ents, flag_name)[:n]
+        timer = getattr(ents, timer_name)[:n]
+        timer[flag] -= dt
+        flag[flag & (timer <= 0)] = False
+
+
+def phase_projectiles(world, inputs, dt):
+    """Integrates, culls and hit-tests every projectile."""
+    projs = world["projectiles"]
+    ents = world["entities"]
+    m = projs.count
+    if m == 0:
+        return
+    px, py = projs.x[:m], projs.y[:m]
+    px += projs.dx[:m] * dt
+    py += projs.dy[:m] * dt
+    projs.compact((px >= 0) & (px <= WIDTH) & (py >= 0) & (py <= HEIGHT))
+    m = projs.count
+    if m == 0:
+        return
+
+    n = ents.count
+    hittable = (ents.hp[:n] > 0) & ~ents.invulnerable[:n] & ~ents.stealthed[:n]
+    targets = np.flatnonzero(hittable)
+    if targets.size == 0:
+        return
+    ex, ey = ents.x[targets], ents.y[targets]
+    er, eteam = ents.radius[targets], ents.team[targets]
+    hp, events = ents.hp, world["events"]
+    spent = np.zeros(m, dtype=np.bool_)
+
+    # Broadphase as one distance block per chunk; hp only goes down within a
+    # tick, so candidates are re-checked in order to keep first-hit semantics.
+    for lo in range(0, m, PROJECTILE_HIT_CHUNK):
+        hi = min(m, lo + PROJECTILE_HIT_CHUNK)
+        dx = projs.x[lo:hi, None] - ex[None, :]
+        dy = projs.y[lo:hi, None] - ey[None, :]
+        hits = (dx * dx + dy * dy < (er * er)[None, :]) & (projs.team[lo:hi, None] != eteam[None, :])
+        for row in np.flatnonzero(hits.any(axis=1)):
+            for col in np.flatnonzero(hits[row]):
+                e = targets[col]
+                if hp[e] > 0:
+                    hp[e] -= projs.damage[lo + row]
+                    events.append(EV_HIT)
+                    if hp[e] <= 0:
+                        hp[e] = 0
+                    spent[lo + row] = True
+                    break
+    if spent.any():
+        projs.compact(~spent)
+
+
+def phase_winner(world, inputs, dt):
+    ents = world["entities"]
+    if ents.hp[0] <= 0:
+        world["winner"] = ents.ids[1]
+    elif ents.hp[1] <= 0:
+        world["winner"] = ents.ids[0]
+
+
+PHASES = [
+    ("skills", phase_skills),
+    ("movement", phase_players),
+    ("charge", phase_charge),
+    ("beasts", phase_beasts),
+    ("cooldowns", phase_timers),
+    ("projectiles", phase_projectiles),
+    ("winner", phase_winner),
+]
+
+
+def step(world, inputs, dt=TICK_DT, profiler=None):
+    """Same contract as arena_sim.step(), on the array-backed world."""
+    world["events"] = []
+    if profiler is None:
+        for _, phase in PHASES:
+            phase(world, inputs, dt)
+    else:
+        for name, phase in PHASES:
+            t = perf_counter_ns()
+            phase(world, inputs, dt)
+            profiler.add(name, perf_counter_ns() - t)
+    world["tick"] += 1
+    world["time"] += dt
+    return world
@@ -0,0 +1,432 @@
+import math
+
+import numpy as np
+
+from arena_sim import (
+    WIDTH, HEIGHT, ATTACK_DAMAGE, SKILL_DAMAGE, CLASSES, ROLE_NAMES, UNIVERSAL_COOLDOWN,
+    ATTACK_COOLDOWN, MOVE_SCALE, PROJECTILE_SPEED, BEAST_ATTACK_RANGE, ENTITY_RADIUS, SUMMON_OFFSET,
+    TICK_RATE, TICK_DT, IN_UP, IN_DOWN, IN_LEFT, IN_RIGHT, IN_ATTACK, IN_SKILL,
+)
+
+# K independent 1v1 matches stepped together for bot training. Every field is
+# an array with one row per match, so a tick costs a fixed number of NumPy
+# calls however large K is. Entity columns 0 and 1 are the players, followed
+# by team A's Beast slots and then team B's.
+#
+# The rules are arena_sim's, with one simplification: projectile hits within
+# a tick are resolved against hp as it stood when the projectile phase
+# started, so a shot can still land on something an earlier shot in the same
+# tick has just killed.
+
+PROJECTILE_SLOTS = 32  # per match; shots fired into a full match are dropped
+MAX_EPISODE_TICKS = TICK_RATE * 180
+WIN_REWARD = 1.0
+ROLE_INDEX = {name: i for i, name in enumerate(ROLE_NAMES)}
+ROLE_IDS = np.array([ROLE_INDEX[name] for name in ("Mage", "Healer", "Summoner", "Assassin", "Warrior", "Knight")])
+MAGE, HEALER, SUMMONER, ASSASSIN, WARRIOR, KNIGHT = ROLE_IDS
+SIDES = np.array([0, 1])
+FOE = np.array([1, 0])  # indexes a per-player array from the other player's side
+
+# Per player, from that player's side of the arena. Positions are fractions
+# of the arena, timers fractions of their full length.
+OBS_FIELDS = (
+    "x", "y", "hp", "attack_cd", "skill_cd", "stealthed", "invulnerable", "charging",
+    "enemy_dx", "enemy_dy", "enemy_hp", "enemy_skill_cd", "enemy_stealthed", "enemy_invulnerable", "enemy_charging",
+    "own_beasts", "enemy_beast", "enemy_beast_dx", "enemy_beast_dy",
+    "shot", "shot_dx", "shot_dy", "shot_vx", "shot_vy",
+) + tuple(f"role_{name}" for name in ROLE_NAMES) + tuple(f"enemy_role_{name}" for name in ROLE_NAMES)
+OBS_SIZE = len(OBS_FIELDS)
+
+
+def _aim(sx, sy, tx, ty):
+    """Unit vectors from (sx, sy) to (tx, ty); zero-length ones are left as is."""
+    dx, dy = tx - sx, ty - sy
+    dist_val = np.sqrt(dx * dx + dy * dy)
+    safe = np.where(dist_val > 0, dist_val, 1.0)
+    return np.where(dist_val > 0, dx / safe, dx), np.where(dist_val > 0, dy / safe, dy), dist_val
+
+
+class VecArena:
+    """Steps num_envs matches in lockstep with reset(seeds) / step(actions).
+
+    roles is a fixed (player1_role, player2_role) pair, or None to draw both
+    from each match's own generator every episode.
+    """
+
+    def __init__(self, num_envs, roles=None, max_ticks=MAX_EPISODE_TICKS, projectile_slots=PROJECTILE_SLOTS):
+        self.num_envs = k = num_envs
+        self.roles = roles and (ROLE_INDEX[roles[0]], ROLE_INDEX[roles[1]])
+        self.max_ticks = max_ticks
+        beast = CLASSES["Beast"]
+        # Enough slots for every Beast a team can have alive at once
+        self.beast_slots = s = max(1, math.ceil(beast["lifespan"] / UNIVERSAL_COOLDOWN))
+        e = 2 + 2 * s
+        self.team = np.array([0, 1] + [0] * s + [1] * s, dtype=np.int8)
+        self.hunts = 1 - self.team[2:]  # the player column each Beast slot chases
+        self.role_hp = np.array([CLASSES[name]["maxHp"] for name in ROLE_NAMES], dtype=np.float64)
+        self.role_speed = np.array([CLASSES[name]["speed"] for name in ROLE_NAMES], dtype=np.float64)
+
+        # Every entity
+        self.x = np.zeros((k, e))
+        self.y = np.zeros((k, e))
+        self.hp = np.zeros((k, e))
+        self.max_hp = np.full((k, e), float(beast["maxHp"]))
+        self.speed = np.full((k, e), float(beast["speed"]))
+        self.attack_cd = np.zeros((k, e))
+        self.present = np.zeros((k, e), dtype=np.bool_)
+        self.lifespan = np.zeros((k, e))
+        # Players only
+        self.cls = np.zeros((k, 2), dtype=np.int64)
+        self.skill_cd = np.zeros((k, 2))
+        self.stealthed = np.zeros((k, 2), dtype=np.bool_)
+        self.stealth_timer = np.zeros((k, 2))
+        self.invulnerable = np.zeros((k, 2), dtype=np.bool_)
+        self.invuln_timer = np.zeros((k, 2))
+        self.charging = np.zeros((k, 2), dtype=np.bool_)
+        self.charge_timer = np.zeros((k, 2))
+        self.charge_dx = np.zeros((k, 2))
+        self.charge_dy = np.zeros((k, 2))
+        # Projectiles
+        p = projectile_slots
+        self.proj_alive = np.zeros((k, p), dtype=np.bool_)
+        self.px = np.zeros((k, p))
+        self.py = np.zeros((k, p))
+        self.pdx = np.zeros((k, p))
+        self.pdy = np.zeros((k, p))
+        self.pteam = np.zeros((k, p), dtype=np.int8)
+        self.pdamage = np.zeros((k, p))
+        self.dropped = 0  # shots refused because a match's slots were full
+
+        self.tick = np.zeros(k, dtype=np.int64)
+        self.rngs = [np.random.default_rng() for _ in range(k)]
+
+    # ---------------- EPISODES ----------------
+    def reset(self, seeds=None):
+        """Starts a fresh episode in every match and returns the observations.
+
+        seeds gives each match its own generator; episodes it auto-resets
+        later draw from the same generator, so a run is reproducible.
+        """
+        if seeds is None:
+            seeds = [None] * self.num_envs
+        if len(seeds) != self.num_envs:
+            raise ValueError(f"expected {self.num_envs} seeds, got {len(seeds)}")
+        self.rngs = [np.random.default_rng(seed) for seed in seeds]
+        self._reset_envs(np.arange(self.num_envs))
+        return self._observe()
+
+    def _reset_envs(self, envs):
+        # Roles are drawn per match in Python; resets are rare next to ticks
+        for i in envs:
+            self.cls[i] = self.roles or self.rngs[i].integers(len(ROLE_NAMES), size=2)
+        cls = self.cls[envs]
+        self.x[envs] = 0.0
+        self.y[envs] = 0.0
+        self.x[envs, 0] = WIDTH // 4
+        self.x[envs, 1] = 3 * WIDTH // 4
+        self.y[envs, :2] = HEIGHT // 2
+        self.hp[envs] = 0.0
+        self.hp[envs, :2] = self.role_hp[cls]
+        self.max_hp[envs, :2] = self.role_hp[cls]
+        self.speed[envs, :2] = self.role_speed[cls]
+        self.attack_cd[envs] = 0.0
+        self.present[envs] = False
+        self.present[envs, :2] = True
+        self.lifespan[envs] = 0.0
+        for column in (self.skill_cd, self.stealth_timer, self.invuln_timer, self.charge_timer,
+                       self.charge_dx, self.charge_dy):
+            column[envs] = 0.0
+        for flag in (self.stealthed, self.invulnerable, self.charging):
+            flag[envs] = False
+        self.proj_alive[envs] = False
+        self.tick[envs] = 0
+
+    def step(self, actions):
+        """Advances every match one tick.
+
+        actions is a (num_envs, 2) array of arena_sim input bits; IN_SKILL is
+        edge-triggered as in arena_sim.step(). Returns (observations, rewards,
+        dones, info). Rewards are per player: the share of the enemy's max hp
+        taken this tick minus the share of one's own lost, plus or minus
+        WIN_REWARD when the match ends in a kill. Finished matches are reset
+        before returning; their last observations are in
+        info["final_observation"] and info["winner"] is 0 or 1 for a kill,
+        -1 otherwise.
+        """
+        actions = np.asarray(actions)
+        hp_before = self.hp[:, :2].copy()
+        self._skills(actions)
+        self._players(actions)
+        self._charge()
+        self._beasts()
+        self._timers()
+        self._projectiles()
+        self.tick += 1
+
+        p1_dead = self.hp[:, 0] <= 0
+        winner = np.where(p1_dead, 1, np.where(self.hp[:, 1] <= 0, 0, -1))
+        killed = winner >= 0
+        dones = killed | (self.tick >= self.max_ticks)
+
+        lost = (hp_before - self.hp[:, :2]) / self.max_hp[:, :2]
+        rewards = lost[:, ::-1] - lost
+        won = winner[:, None] == np.arange(2)
+        rewards += np.where(killed[:, None], np.where(won, WIN_REWARD, -WIN_REWARD), 0.0)
+
+        obs = self._observe()
+        info = {"winner": winner, "ticks": self.tick.copy()}
+        if dones.any():
+            envs = np.flatnonzero(dones)
+            info["final_observation"] = obs[envs]
+            self._reset_envs(envs)
+            obs[envs] = self._observe(envs)
+        return obs, rewards.astype(np.float32), dones, info
+
+    # ---------------- TICK PHASES ----------------
+    def _spawn(self, envs, x, y, dx, dy, team, damage):
+        """Fires one shot in each match of envs (an index array).
+
+        Shots carry no radius: hit tests only use the entity radius, as in
+        arena_sim, and nothing here is drawn.
+        """
+        n = envs.size
+        if n == 0:
+            return
+        free = ~self.proj_alive[envs]
+        slot = free.argmax(axis=1)
+        ok = free[np.arange(n), slot]
+        self.dropped += n - int(np.count_nonzero(ok))
+        envs, slot = envs[ok], slot[ok]
+        self.proj_alive[envs, slot] = True
+        self.px[envs, slot] = np.broadcast_to(x, n)[ok]
+        self.py[envs, slot] = np.broadcast_to(y, n)[ok]
+        self.pdx[envs, slot] = np.broadcast_to(dx, n)[ok] * PROJECTILE_SPEED
+        self.pdy[envs, slot] = np.broadcast_to(dy, n)[ok] * PROJECTILE_SPEED
+        self.pteam[envs, slot] = team
+        self.pdamage[envs, slot] = damage
+
+    def _fire(self, envs, side, target, damage):
+        sx, sy = self.x[envs, side], self.y[envs, side]
+        dx, dy, _ = _aim(sx, sy, self.x[envs, target], self.y[envs, target])
+        self._spawn(envs, sx, sy, dx, dy, side, damage)
+
+    def _skills(self, actions):
+        cast = ((actions & IN_SKILL) != 0) & (self.skill_cd <= 0)
+        if not cast.any():
+            return
+        for side in (0, 1):
+            casting = cast[:, side]
+            if not casting.any():
+                continue
+            enemy = 1 - side
+            role = self.cls[:, side]
+            self._fire(np.flatnonzero(casting & (role == MAGE)), side, enemy, SKILL_DAMAGE)
+
+            envs = np.flatnonzero(casting & (role == HEALER))
+            if envs.size:
+                allies = np.flatnonzero(self.team == side)
+                hp, max_hp = self.hp[envs[:, None], allies], self.max_hp[envs[:, None], allies]
+                alive = self.present[envs[:, None], allies] & (hp > 0)
+                self.hp[envs[:, None], allies] = np.where(alive, np.minimum(max_hp, hp + SKILL_DAMAGE), hp)
+
+            envs = np.flatnonzero(casting & (role == SUMMONER))
+            if envs.size:
+                slots = 2 + side * self.beast_slots + np.arange(self.beast_slots)
+                free = ~self.present[envs[:, None], slots]
+                pick = free.argmax(axis=1)
+                ok = free[np.arange(envs.size), pick]
+                envs, col = envs[ok], slots[pick[ok]]
+                self.x[envs, col] = self.x[envs, side] + SUMMON_OFFSET["AB"[side]]
+                self.y[envs, col] = self.y[envs, side]
+                self.hp[envs, col] = self.max_hp[envs, col]
+                self.attack_cd[envs, col] = 0.0
+                self.lifespan[envs, col] = CLASSES["Beast"]["lifespan"]
+                self.present[envs, col] = True
+
+            envs = casting & (role == ASSASSIN)
+            self.stealthed[envs, side] = True
+            self.stealth_timer[envs, side] = CLASSES["Assassin"]["stealth_duration"]
+
+            envs = np.flatnonzero(casting & (role == WARRIOR))
+            if envs.size:
+                dx, dy, dist_val = _aim(self.x[envs, side], self.y[envs, side], self.x[envs, enemy], self.y[envs, enemy])
+                moved = dist_val > 0
+                self.charge_dx[envs[moved], side] = dx[moved]
+                self.charge_dy[envs[moved], side] = dy[moved]
+                self.charging[envs, side] = True
+                self.charge_timer[envs, side] = CLASSES["Warrior"]["charge_duration"]
+
+            envs = casting & (role == KNIGHT)
+            self.invulnerable[envs, side] = True
+            self.invuln_timer[envs, side] = CLASSES["Knight"]["shield_duration"]
+
+            self.skill_cd[casting, side] = UNIVERSAL_COOLDOWN
+
+    def _players(self, actions):
+        # Player 1 moves and shoots before player 2, as in arena_sim
+        for side in (0, 1):
+            bits = actions[:, side]
+            walking = ~self.charging[:, side]
+            step_len = self.speed[:, side] * MOVE_SCALE * TICK_DT
+            for bit, column, sign in ((IN_UP, self.y, -1), (IN_DOWN, self.y, 1), (IN_LEFT, self.x, -1), (IN_RIGHT, self.x, 1)):
+                moving = walking & ((bits & bit) != 0)
+                column[moving, side] += sign * step_len[moving]
+
+            shooting = ((bits & IN_ATTACK) != 0) & (self.attack_cd[:, side] <= 0)
+            self._fire(np.flatnonzero(shooting), side, 1 - side, ATTACK_DAMAGE)
+            self.attack_cd[shooting, side] = ATTACK_COOLDOWN
+
+    def _charge(self):
+        if not self.charging.any():
+            return
+        warrior = CLASSES["Warrior"]
+        reach = 2 * ENTITY_RADIUS
+        for side in (0, 1):
+            envs = np.flatnonzero(self.charging[:, side])
+            if envs.size == 0:
+                continue
+            enemy = 1 - side
+            self.x[envs, side] += self.charge_dx[envs, side] * warrior["charge_speed"] * TICK_DT
+            self.y[envs, side] += self.charge_dy[envs, side] * warrior["charge_speed"] * TICK_DT
+            dx = self.x[envs, side] - self.x[envs, enemy]
+            dy = self.y[envs, side] - self.y[envs, enemy]
+            hit = (np.sqrt(dx * dx + dy * dy) < reach) & ~self.invulnerable[envs, enemy]
+            self.hp[envs[hit], enemy] -= warrior["charge_damage"]
+            self.charge_timer[envs, side] -= TICK_DT
+            self.charging[envs, side] = self.charge_timer[envs, side] > 0
+
+    def _beasts(self):
+        beasts = self.present[:, 2:]
+        if not beasts.any():
+            return
+        lifespan = self.lifespan[:, 2:]
+        lifespan[beasts] -= TICK_DT
+        expired = beasts & (lifespan <= 0)
+        beasts[expired] = False
+        self.hp[:, 2:][expired] = 0.0
+
+        bx, by = self.x[:, 2:], self.y[:, 2:]
+        dx = self.x[:, self.hunts] - bx
+        dy = self.y[:, self.hunts] - by
+        dist_val = np.sqrt(dx * dx + dy * dy)
+        moving = beasts & (dist_val > 0)
+        safe = np.where(dist_val > 0, dist_val, 1.0)
+        ndx = np.where(dist_val > 0, dx / safe, dx)
+        ndy = np.where(dist_val > 0, dy / safe, dy)
+        speed = self.speed[:, 2:]
+        bx[moving] += (ndx * speed * MOVE_SCALE * TICK_DT)[moving]
+        by[moving] += (ndy * speed * MOVE_SCALE * TICK_DT)[moving]
+
+        # Aim is taken from where the Beast stood before this tick's step
+        shooting = beasts & (self.attack_cd[:, 2:] <= 0) & (dist_val < BEAST_ATTACK_RANGE)
+        damage = CLASSES["Beast"]["attackDamage"]
+        for j in np.flatnonzero(shooting.any(axis=0)):
+            envs = np.flatnonzero(shooting[:, j])
+            self._spawn(envs, bx[envs, j], by[envs, j], ndx[envs, j], ndy[envs, j], self.team[2 + j], damage)
+        self.attack_cd[:, 2:][shooting] = CLASSES["Beast"]["attackCooldown"]
+
+    def _timers(self):
+        for column in (self.attack_cd, self.skill_cd):
+            column[column > 0] -= TICK_DT
+        for flag, timer in ((self.stealthed, self.stealth_timer), (self.invulnerable, self.invuln_timer)):
+            timer[flag] -= TICK_DT
+            flag[flag & (timer <= 0)] = False
+
+    def _projectiles(self):
+        alive = self.proj_alive
+        if not alive.any():
+            return
+        self.px += self.pdx * TICK_DT
+        self.py += self.pdy * TICK_DT
+        alive &= (self.px >= 0) & (self.px <= WIDTH) & (self.py >= 0) & (self.py <= HEIGHT)
+
+        # Only live shots are hit-tested, each against its own match's entities
+        envs, slots = np.nonzero(alive)
+        if envs.size == 0:
+            return
+        targets = self.present & (self.hp > 0)
+        targets[:, :2] &= ~(self.invulnerable | self.stealthed)
+        dx = self.px[envs, slots, None] - self.x[envs]
+        dy = self.py[envs, slots, None] - self.y[envs]
+        hits = (dx * dx + dy * dy < ENTITY_RADIUS * ENTITY_RADIUS) & targets[envs]
+        hits &= self.pteam[envs, slots, None] != self.team[None, :]
+        landed = hits.any(axis=1)
+        if not landed.any():
+            return
+        # Each shot lands on the first entity it overlaps, in column order
+        envs, slots = envs[landed], slots[landed]
+        cols = hits[landed].argmax(axis=1)
+        damage = np.zeros_like(self.hp)
+        np.add.at(damage, (envs, cols), self.pdamage[envs, slots])
+        self.hp -= damage
+        struck = np.zeros_like(self.present)
+        struck[envs, cols] = True
+        self.hp[struck & (self.hp <= 0)] = 0.0
+        alive[envs, slots] = False
+
+    # ---------------- OBSERVATIONS ----------------
+    def _observe(self, envs=slice(None)):
+        """(n, 2, OBS_SIZE) float32 observations laid out as OBS_FIELDS.
+
+        Both players are filled in at once: axis 1 is the observing player,
+        and indexing any per-player array with FOE gives the other one.
+        """
+        x, y, hp, max_hp = self.x[envs], self.y[envs], self.hp[envs], self.max_hp[envs]
+        stealthed, invulnerable, charging = self.stealthed[envs], self.invulnerable[envs], self.charging[envs]
+        n = x.shape[0]
+        s = self.beast_slots
+        obs = np.zeros((n, 2, OBS_SIZE), dtype=np.float32)
+        px, py = x[:, :2], y[:, :2]
+
+        obs[..., 0] = px / WIDTH
+        obs[..., 1] = py / HEIGHT
+        obs[..., 2] = hp[:, :2] / max_hp[:, :2]
+        obs[..., 3] = self.attack_cd[envs, :2] / ATTACK_COOLDOWN
+        obs[..., 4] = self.skill_cd[envs] / UNIVERSAL_COOLDOWN
+        obs[..., 5] = stealthed
+        obs[..., 6] = invulnerable
+        obs[..., 7] = charging
+        # A stealthed enemy's position is hidden, as it is on screen
+        visible = ~stealthed[:, FOE]
+        obs[..., 8] = np.where(visible, (px[:, FOE] - px) / WIDTH, 0.0)
+        obs[..., 9] = np.where(visible, (py[:, FOE] - py) / HEIGHT, 0.0)
+        obs[..., 10] = obs[:, FOE, 2]
+        obs[..., 11] = obs[:, FOE, 4]
+        obs[..., 12] = ~visible
+        obs[..., 13] = invulnerable[:, FOE]
+        obs[..., 14] = charging[:, FOE]
+
+        # Beast slots regrouped as (match, team, slot); nearest enemy Beast
+        beasts = self.present[envs, 2:].reshape(n, 2, s)
+        obs[..., 15] = beasts.sum(axis=2)
+        bdx = x[:, 2:].reshape(n, 2, s)[:, FOE] - px[..., None]
+        bdy = y[:, 2:].reshape(n, 2, s)[:, FOE] - py[..., None]
+        self._nearest(obs, 16, beasts[:, FOE], bdx, bdy)
+
+        # Nearest enemy shot
+        sdx = self.px[envs][:, None, :] - px[..., None]
+        sdy = self.py[envs][:, None, :] - py[..., None]
+        incoming = self.proj_alive[envs][:, None, :] & (self.pteam[envs][:, None, :] != SIDES[None, :, None])
+        near = self._nearest(obs, 19, incoming, sdx, sdy)
+        obs[..., 22] = np.take_along_axis(self.pdx[envs], near.reshape(n, 2), axis=1) / PROJECTILE_SPEED * obs[..., 19]
+        obs[..., 23] = np.take_along_axis(self.pdy[envs], near.reshape(n, 2), axis=1) / PROJECTILE_SPEED * obs[..., 19]
+
+        cls = self.cls[envs]
+        rows = np.arange(n)[:, None]
+        obs[rows, SIDES, 24 + cls] = 1.0
+        obs[rows, SIDES, 24 + len(ROLE_NAMES) + cls[:, FOE]] = 1.0
+        return obs
+
+    @staticmethod
+    def _nearest(obs, field, mask, dx, dy):
+        """Writes found, dx and dy of the closest masked candidate into obs[..., field:field + 3].
+
+        mask, dx and dy are (n, 2, candidates); returns the chosen index.
+        """
+        d2 = np.where(mask, dx * dx + dy * dy, np.inf)
+        near = d2.argmin(axis=2)[..., None]
+        found = np.isfinite(np.take_along_axis(d2, near, axis=2)[..., 0])
+        obs[..., field] = found
+        obs[..., field + 1] = np.where(found, np.take_along_axis(dx, near, axis=2)[..., 0] / WIDTH, 0.0)
+        obs[..., field + 2] = np.where(found, np.take_along_axis(dy, near, axis=2)[..., 0] / HEIGHT, 0.0)
+        return near
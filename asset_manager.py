@@ -0,0 +1,138 @@
+import hashlib
+import os
+import threading
+from time import perf_counter_ns
+
+import pygame
+
+# Startup-friendly asset loading shared by the game front ends. Audio is
+# decoded on a background thread so the first menu frame doesn't wait for it,
+# images are loaded on first use, and a scaled image is kept on disk as an
+# uncompressed BMP keyed by the source file's hash and the target size, so
+# later starts skip the PNG decode and the rescale. Every phase is timed and
+# kept in startup order for report().
+
+CACHE_DIR = ".asset_cache"
+CACHE_EXT = ".bmp"
+HASH_CHUNK = 1 << 16
+
+
+def file_digest(path):
+    """sha1 of the file's contents."""
+    digest = hashlib.sha1()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class AssetManager:
+    def __init__(self, cache_dir=CACHE_DIR):
+        self.cache_dir = cache_dir
+        self.start = perf_counter_ns()
+        self.timings = []  # (phase, ns) in the order they finished
+        self.marks = {}  # name -> ns since the manager was created
+        self.sounds = {}
+        self.images = {}
+        self._audio_thread = None
+        self._lock = threading.Lock()
+
+    # ---- timings ----
+
+    def record(self, phase, ns):
+        with self._lock:
+            self.timings.append((phase, ns))
+
+    def timed(self, phase, fn, *args):
+        """Calls fn(*args) and records how long it took under phase."""
+        start = perf_counter_ns()
+        try:
+            return fn(*args)
+        finally:
+            self.record(phase, perf_counter_ns() - start)
+
+    def mark(self, name):
+        """Records when name first happened, e.g. the first menu frame."""
+        if name not in self.marks:
+            self.marks[name] = perf_counter_ns() - self.start
+
+    def report(self):
+        with self._lock:
+            timings = list(self.timings)
+        lines = [f"{phase:<40}{ns / 1e6:>9.1f} ms" for phase, ns in timings]
+        lines += [f"{'@ ' + name:<40}{ns / 1e6:>9.1f} ms" for name, ns in self.marks.items()]
+        return "\n".join(lines)
+
+    # ---- audio ----
+
+    def load_audio_async(self, sounds, music=None):
+        """Starts loading {name: path} sounds and the looping music track in the background.
+
+        sound(name) returns None until its file has loaded, so callers simply
+        stay quiet for the first moments instead of blocking on the decode.
+        """
+        self._audio_thread = threading.Thread(target=self._load_audio, args=(sounds, music),
+                                              name="asset-audio", daemon=True)
+        self._audio_thread.start()
+
+    def _load_audio(self, sounds, music):
+        start = perf_counter_ns()
+        try:
+            if music:
+                self.timed(f"music {music}", pygame.mixer.music.load, music)
+                pygame.mixer.music.play(-1)
+            for name, path in sounds.items():
+                self.sounds[name] = self.timed(f"sound {path}", pygame.mixer.Sound, path)
+        except pygame.error:
+            print("Warning: Could not load audio files. Sound effects and music will be disabled.")
+        finally:
+            self.record("audio (background)", perf_counter_ns() - start)
+
+    def sound(self, name):
+        return self.sounds.get(name)
+
+    # ---- images ----
+
+    def image(self, path, size, alpha=False):
+        """path scaled to size in the display's pixel format, or None if it can't be loaded.
+
+        Needs the display mode set. The result is kept in memory, and the
+        scaled pixels on disk under cache_dir so the next start only reads
+        the BMP and converts it.
+        """
+        key = (path, tuple(size), alpha)
+        if key not in self.images:
+            start = perf_counter_ns()
+            try:
+                surface, source = self._load_image(path, tuple(size))
+            except (pygame.error, OSError):
+                print(f"Warning: Could not load {path}.")
+                surface, source = None, "missing"
+            self.record(f"image {path} ({source})", perf_counter_ns() - start)
+            if surface is not None:
+                surface = surface.convert_alpha() if alpha else surface.convert()
+            self.images[key] = surface
+        return self.images[key]
+
+    def cache_path(self, path, size):
+        stem = os.path.splitext(os.path.basename(path))[0]
+        return os.path.join(self.cache_dir, f"{stem}-{file_digest(path)[:16]}-{size[0]}x{size[1]}{CACHE_EXT}")
+
+    def _load_image(self, path, size):
+        cached = self.cache_path(path, size)
+        if os.path.exists(cached):
+            try:
+                return pygame.image.load(cached), "cached"
+            except pygame.error:
+                pass  # truncated or foreign file: rebuild it below
+        surface = pygame.image.load(path)
+        if surface.get_size() != size:
+            surface = pygame.transform.scale(surface, size)
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            tmp = f"{cached}.{os.getpid()}.tmp{CACHE_EXT}"
+            pygame.image.save(surface, tmp)
+            os.replace(tmp, cached)
+        except (pygame.error, OSError) as e:
+            print(f"Warning: Could not cache {path}: {e}")
+        return surface, "decoded"
@@ -0,0 +1,10 @@
+"""Headless stress benchmarks for the arena engine.
+
+Run from the repository root with ``python -m benchmarks.run``.
+"""
+
+import os
+
+# Benchmarks never open a real window or audio device
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
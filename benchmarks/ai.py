@@ -0,0 +1,70 @@
+import argparse
+import random
+import sys
+from time import perf_counter_ns
+
+from arena_ai import AI_BUDGET_MS, THINK_INTERVAL, AIDirector, UtilityBot
+from arena_sim import WIDTH, HEIGHT, create_entity, new_match, step
+from frame_profiler import PERCENTILES, percentile
+
+# Per-tick cost of arena_ai with many Beast agents plus two bot players.
+# Run from the repository root with ``python -m benchmarks.ai``; compare
+# --budget 0 (think everything when due) against the default budget.
+
+DEFAULT_AGENTS = 1000
+DEFAULT_TICKS = 1200
+UNKILLABLE_HP = 10 ** 9
+
+
+def build_match(agents, director, seed=0):
+    rng = random.Random(seed)
+    state = new_match("1", "Summoner", "2", "Mage", seed=seed)
+    for p in (state["player1"], state["player2"]):
+        p.hp = p.maxHp = UNKILLABLE_HP
+    for i in range(agents):
+        beast = create_entity("Beast", "AB"[i % 2], rng.uniform(0, WIDTH), rng.uniform(0, HEIGHT), rng=rng)
+        beast.lifespan_timer = float("inf")
+        beast.hp = beast.maxHp = UNKILLABLE_HP
+        state["entities"].add(beast)
+    state["ai"] = director
+    return state
+
+
+def run(agents, ticks, budget_ms, interval):
+    director = AIDirector(budget_ms, interval)
+    state = build_match(agents, director)
+    bots = (UtilityBot(0, director), UtilityBot(1, director))
+    step_ns = []
+    for _ in range(ticks):
+        start = perf_counter_ns()
+        step(state, (bots[0](state), bots[1](state)))
+        step_ns.append(perf_counter_ns() - start)
+    return sorted(step_ns), director.stats()
+
+
+def ms(ns):
+    return f"{ns / 1e6:.3f}"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Cost of the utility AI at scale.")
+    parser.add_argument("--agents", type=int, default=DEFAULT_AGENTS, help="AI-driven Beasts")
+    parser.add_argument("--ticks", type=int, default=DEFAULT_TICKS)
+    parser.add_argument("--budget", type=float, default=AI_BUDGET_MS, help="thinking ms per tick (0 = unlimited)")
+    parser.add_argument("--interval", type=int, default=THINK_INTERVAL, help="ticks between an agent's thinks")
+    args = parser.parse_args(argv)
+
+    step_ns, stats = run(args.agents, args.ticks, args.budget or None, args.interval)
+    print(f"{stats['agents']} agents, {stats['thinks']} thinks over {args.ticks} ticks, "
+          f"{stats['deferred']} deferred, max {stats['max_staleness_ticks']} ticks between thinks")
+    print(f"{'ms':<18}" + "".join(f"{'p' + str(pct):>9}" for pct in PERCENTILES) + f"{'max':>9}")
+    rows = (("step", {**{f"p{pct}": percentile(step_ns, pct) for pct in PERCENTILES}, "max": step_ns[-1]}),
+            ("ai update", stats["update_ns"]),
+            ("think per agent", stats["agent_think_ns"]))
+    for name, row in rows:
+        print(f"{name:<18}" + "".join(f"{ms(row[key]):>9}" for key in [f"p{pct}" for pct in PERCENTILES] + ["max"]))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
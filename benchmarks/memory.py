@@ -0,0 +1,79 @@
+import argparse
+import sys
+import tracemalloc
+
+from arena_sim import CLASSES, ENTITY_RADIUS, ENTITY_TYPES, ROLE_NAMES, Entity
+from projectile_pool import Projectile
+
+# Bytes per entity and per projectile for the slotted types against the
+# dict layout they replaced, measured with tracemalloc over a batch of
+# objects so allocator overhead is included. Run from the repository root
+# with ``python -m benchmarks.memory``.
+
+DEFAULT_COUNTS = (10000, 100000)
+ENTITY_CLASSES = ROLE_NAMES + ["Beast"]
+
+
+def dict_entity(class_name, team, x, y, entity_id):
+    """An entity in the dict layout create_entity() used to return."""
+    c = CLASSES[class_name]
+    entity = {
+        "id": entity_id, "className": class_name, "team": team, "x": float(x), "y": float(y),
+        "prev_x": float(x), "prev_y": float(y), "hp": c["maxHp"], "maxHp": c["maxHp"], "speed": c["speed"],
+        "radius": ENTITY_RADIUS, "color": c["color"], "isPlayer": False, "attackCooldown": 0, "skillCooldown": 0,
+        "is_stealthed": False, "stealth_timer": 0, "is_charging": False, "charge_timer": 0,
+        "charge_direction_x": 0, "charge_direction_y": 0, "is_invulnerable": False, "invulnerable_timer": 0,
+    }
+    if class_name == "Beast":
+        entity["lifespan_timer"] = c["lifespan"]
+    return entity
+
+
+def dict_projectile():
+    """A pool slot in the dict layout ProjectilePool used to preallocate."""
+    return {"x": 0.0, "y": 0.0, "dx": 0.0, "dy": 0.0, "radius": 0, "team": None, "damage": 0}
+
+
+def measure(build, count):
+    """Bytes per object for count objects from build(i), excluding the holding list."""
+    tracemalloc.start()
+    holder = [None] * count
+    base, _ = tracemalloc.get_traced_memory()
+    for i in range(count):
+        holder[i] = build(i)
+    total, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return (total - base) / count
+
+
+def report(counts=DEFAULT_COUNTS, class_name=None):
+    names = [class_name] if class_name else ENTITY_CLASSES
+    rows = []
+    for count in counts:
+        # Ids are made up front so their strings aren't charged to either layout
+        ids = [f"A-Beast-{i}" for i in range(count)]
+        for name in names:
+            cls, stats = ENTITY_TYPES.get(name, Entity), CLASSES[name]
+            rows.append((f"entity {name}", count,
+                         measure(lambda i: dict_entity(name, "A", i % 800, i % 600, ids[i]), count),
+                         measure(lambda i: cls(ids[i], name, "A", i % 800, i % 600, stats, False), count)))
+        rows.append(("projectile", count, measure(lambda i: dict_projectile(), count),
+                     measure(lambda i: Projectile(), count)))
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Memory per entity and projectile, dicts vs slotted types.")
+    parser.add_argument("--count", type=int, action="append", help="objects per measurement (repeatable)")
+    parser.add_argument("--class", dest="class_name", choices=ENTITY_CLASSES, help="only measure this entity class")
+    args = parser.parse_args(argv)
+
+    print(f"{'object':<20}{'count':>9}{'dict B':>10}{'slots B':>10}{'saved':>8}")
+    for label, count, dict_bytes, slot_bytes in report(args.count or DEFAULT_COUNTS, args.class_name):
+        saved = 1 - slot_bytes / dict_bytes if dict_bytes else 0.0
+        print(f"{label:<20}{count:>9}{dict_bytes:>10.0f}{slot_bytes:>10.0f}{saved:>8.0%}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
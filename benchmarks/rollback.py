@@ -0,0 +1,66 @@
+import argparse
+import random
+import sys
+import timeit
+
+import arena_soa
+from arena_rollback import MAX_ROLLBACK, RollbackSession, restore, snapshot
+from arena_sim import IN_ATTACK, IN_LEFT
+
+# Cost of snapshot(), restore() and a full MAX_ROLLBACK-tick rollback on an
+# arena_soa world. Run from the repository root with
+# ``python -m benchmarks.rollback``.
+
+DEFAULT_ENTITIES = 200
+SETTLE_TICKS = 60  # ticks run first so projectiles are in flight
+REPEATS = 3
+
+
+def build_world(entities, seed=0):
+    rng = random.Random(seed)
+    world = arena_soa.new_world("1", "Summoner", "2", "Summoner", seed=seed)
+    for i in range(entities - 2):
+        arena_soa.summon_beast(world, "AB"[i % 2], rng.uniform(0, 800), rng.uniform(0, 600))
+    world["entities"].lifespan[:] = float("inf")
+    for _ in range(SETTLE_TICKS):
+        arena_soa.step(world, (IN_ATTACK, IN_ATTACK))
+    return world
+
+
+def best_us(fn, number):
+    return min(timeit.repeat(fn, number=number, repeat=REPEATS)) / number * 1e6
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Snapshot, restore and rollback timings.")
+    parser.add_argument("--entities", type=int, default=DEFAULT_ENTITIES)
+    parser.add_argument("--number", type=int, default=10000, help="calls per timing run")
+    args = parser.parse_args(argv)
+
+    world = build_world(args.entities)
+    snap = snapshot(world)
+    print(f"{world['entities'].count} entities, {world['projectiles'].count} projectiles")
+    print(f"snapshot  {best_us(lambda: snapshot(world, snap), args.number):8.1f} us")
+    print(f"restore   {best_us(lambda: restore(world, snap), args.number):8.1f} us")
+
+    # Worst case: the remote input for the oldest tick still in reach differs
+    # from the prediction, so all MAX_ROLLBACK ticks are re-simulated
+    session = RollbackSession(world, 0)
+    for _ in range(MAX_ROLLBACK):
+        session.advance(IN_ATTACK)
+    state = snapshot(world)
+    late = world["tick"] - MAX_ROLLBACK
+
+    def rollback():
+        session.remote.pop(late, None)
+        session.add_remote_input(late, IN_LEFT)
+        restore(world, state)
+        session.used[late] = 0
+
+    print(f"rollback  {best_us(rollback, max(1, args.number // 100)) / 1000:8.2f} ms "
+          f"({MAX_ROLLBACK} ticks re-simulated)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,171 @@
+import argparse
+import json
+import os
+import sys
+import tracemalloc
+from time import perf_counter_ns
+
+from arena_sim import step
+from benchmarks.scenarios import SCENARIOS
+from frame_profiler import percentile
+
+# Runs each scenario for a fixed number of ticks and reports ticks/s, per-tick
+# latency percentiles and peak traced memory. Results are compared against a
+# stored baseline; a scenario whose median tick latency rises more than the
+# threshold above its baseline counts as a regression and the run exits
+# non-zero. The median is used because it shrugs off scheduler noise that
+# swings the mean on shared machines, and a calibration loop timed alongside
+# the scenarios factors out overall machine speed.
+
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), "baseline.json")
+DEFAULT_TICKS = 600
+WARMUP_TICKS = 30
+MEMORY_TICKS = 60
+REPEATS = 3
+CALIBRATION_KEY = "calibration_ns"
+CALIBRATION_LOOP = 200000
+CALIBRATION_RUNS = 5
+REGRESSION_THRESHOLD = 0.20
+
+
+def make_renderer():
+    import pygame
+    from arena_render import ArenaRenderer
+    from arena_sim import WIDTH, HEIGHT
+
+    pygame.init()
+    screen = pygame.display.set_mode((WIDTH, HEIGHT))
+    return ArenaRenderer(screen, pygame.font.Font(None, 22), mode="dirty")
+
+
+def time_ticks(build, ticks, spatial_hash, renderer):
+    state, before_tick = build(spatial_hash)
+    for _ in range(WARMUP_TICKS):
+        step(state, before_tick(state))
+
+    latencies = []
+    for _ in range(ticks):
+        inputs = before_tick(state)
+        t = perf_counter_ns()
+        step(state, inputs)
+        if renderer is not None:
+            renderer.render(state)
+        latencies.append(perf_counter_ns() - t)
+    latencies.sort()
+    return latencies
+
+
+def run_scenario(build, ticks, spatial_hash=True, renderer=None, repeats=REPEATS):
+    # Keep the quietest of a few runs; background load only ever adds time
+    latencies = min((time_ticks(build, ticks, spatial_hash, renderer) for _ in range(repeats)),
+                    key=lambda values: percentile(values, 50))
+
+    # Peak memory comes from a separate, shorter traced pass since tracing
+    # slows every allocation down
+    tracemalloc.start()
+    state, before_tick = build(spatial_hash)
+    for _ in range(MEMORY_TICKS):
+        step(state, before_tick(state))
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    total = sum(latencies)
+    return {
+        "ticks": ticks,
+        "ticks_per_sec": ticks * 1e9 / total if total else 0.0,
+        "p50_us": percentile(latencies, 50) / 1000,
+        "p95_us": percentile(latencies, 95) / 1000,
+        "p99_us": percentile(latencies, 99) / 1000,
+        "peak_kib": peak / 1024,
+    }
+
+
+def calibrate():
+    """Times a fixed pure-Python loop so results can be scaled by machine speed."""
+    best = None
+    for _ in range(CALIBRATION_RUNS):
+        t = perf_counter_ns()
+        total = 0
+        for i in range(CALIBRATION_LOOP):
+            total += i * i
+        elapsed = perf_counter_ns() - t
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def compare(results, baseline, threshold):
+    """Returns the names of scenarios that regressed against the baseline.
+
+    The allowance is stretched by how much slower the calibration loop ran
+    than it did for the baseline, so a slower or busier machine doesn't read
+    as a regression. It is never tightened when the machine is faster.
+    """
+    regressions = []
+    speed = max(1.0, results[CALIBRATION_KEY] / baseline.get(CALIBRATION_KEY, results[CALIBRATION_KEY]))
+    for name, result in results.items():
+        base = baseline.get(name)
+        if name != CALIBRATION_KEY and base and result["p50_us"] > base["p50_us"] * speed * (1 + threshold):
+            regressions.append(name)
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Headless stress benchmarks for the arena engine.")
+    parser.add_argument("scenarios", nargs="*", help=f"scenarios to run (default: all of {', '.join(SCENARIOS)})")
+    parser.add_argument("--ticks", type=int, default=DEFAULT_TICKS, help="timed ticks per scenario")
+    parser.add_argument("--repeats", type=int, default=REPEATS, help="timed runs per scenario; the quietest is kept")
+    parser.add_argument("--render", action="store_true", help="also render each tick on the dummy display")
+    parser.add_argument("--no-spatial-hash", action="store_true", help="brute-force projectile hits")
+    parser.add_argument("--baseline", default=BASELINE_PATH, help="baseline JSON to compare against")
+    parser.add_argument("--threshold", type=float, default=REGRESSION_THRESHOLD,
+                        help="allowed median tick latency rise over baseline, as a fraction")
+    parser.add_argument("--update-baseline", action="store_true", help="write these results as the new baseline")
+    parser.add_argument("--json", metavar="PATH", help="also write results as JSON")
+    args = parser.parse_args(argv)
+
+    unknown = [name for name in args.scenarios if name not in SCENARIOS]
+    if unknown:
+        parser.error(f"unknown scenario(s): {', '.join(unknown)}")
+    names = args.scenarios or list(SCENARIOS)
+    renderer = make_renderer() if args.render else None
+    results = {CALIBRATION_KEY: calibrate()}
+    print(f"{'scenario':<22}{'ticks/s':>10}{'p50 us':>10}{'p95 us':>10}{'p99 us':>10}{'peak KiB':>11}")
+    for name in names:
+        r = run_scenario(SCENARIOS[name], args.ticks, not args.no_spatial_hash, renderer, args.repeats)
+        results[name] = r
+        print(f"{name:<22}{r['ticks_per_sec']:>10.0f}{r['p50_us']:>10.1f}{r['p95_us']:>10.1f}"
+              f"{r['p99_us']:>10.1f}{r['peak_kib']:>11.0f}")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+
+    if args.update_baseline:
+        baseline = {}
+        if os.path.exists(args.baseline):
+            with open(args.baseline) as f:
+                baseline = json.load(f)
+        baseline.update(results)
+        with open(args.baseline, "w") as f:
+            json.dump(baseline, f, indent=2)
+        print(f"Baseline written to {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print(f"No baseline at {args.baseline}; run with --update-baseline to create one")
+        return 0
+    if args.render or args.no_spatial_hash:
+        print("Baseline covers the default configuration only; skipping regression check")
+        return 0
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    results[CALIBRATION_KEY] = min(results[CALIBRATION_KEY], calibrate())
+    regressions = compare(results, baseline, args.threshold)
+    for name in regressions:
+        print(f"REGRESSION {name}: p50 {results[name]['p50_us']:.1f} us vs baseline "
+              f"{baseline[name]['p50_us']:.1f} us (threshold {args.threshold:.0%})")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
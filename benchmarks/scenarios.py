@@ -0,0 +1,100 @@
+import random
+
+from arena_sim import (
+    WIDTH, HEIGHT, ATTACK_DAMAGE, PROJECTILE_SPEED, IN_ATTACK, IN_LEFT, IN_RIGHT, IN_SKILL,
+    cast_skill, create_entity, new_match,
+)
+
+# Each scenario builds a match state and returns it with a per-tick hook.
+# The hook runs before every tick, outside the timed section, and returns
+# that tick's inputs; it is where scenarios top up whatever the rules drain.
+
+UNKILLABLE_HP = 10 ** 9
+
+
+def _unkillable(state):
+    for p in (state["player1"], state["player2"]):
+        p.hp = p.maxHp = UNKILLABLE_HP
+
+
+def idle_1v1(spatial_hash=True):
+    """Two players trading basic attacks while walking back and forth."""
+    state = new_match("1", "Knight", "2", "Mage", spatial_hash, seed=1)
+    _unkillable(state)
+
+    def before_tick(state):
+        walk = IN_RIGHT if state["tick"] // 60 % 2 else IN_LEFT
+        return (IN_ATTACK | walk, IN_ATTACK | walk)
+
+    return state, before_tick
+
+
+def summoner_200_beasts(spatial_hash=True):
+    """200 Beasts from repeated Summoner casts, all chasing and shooting."""
+    state = new_match("1", "Summoner", "2", "Summoner", spatial_hash, seed=2)
+    _unkillable(state)
+    for i in range(200):
+        p = state["player1"] if i % 2 == 0 else state["player2"]
+        p.y = HEIGHT * (i // 2 + 1) / 101
+        cast_skill(state, p)
+    for e in state["entities"].of_class("Beast"):
+        e.lifespan_timer = float("inf")
+
+    def before_tick(state):
+        return (0, 0)
+
+    return state, before_tick
+
+
+def projectiles_5000(spatial_hash=True):
+    """5,000 projectiles in flight across a field of 100 Beasts; culled shots are re-fired."""
+    state = new_match("1", "Knight", "2", "Knight", spatial_hash, projectile_capacity=5000, seed=3)
+    _unkillable(state)
+    rng = random.Random(3)
+    for i in range(100):
+        beast = create_entity("Beast", "AB"[i % 2], rng.uniform(0, WIDTH), rng.uniform(0, HEIGHT), rng=rng)
+        beast.lifespan_timer = float("inf")
+        beast.attackCooldown = float("inf")
+        beast.hp = beast.maxHp = UNKILLABLE_HP
+        state["entities"].add(beast)
+
+    def before_tick(state):
+        pool = state["projectiles"]
+        while len(pool) < pool.capacity:
+            dx, dy = rng.uniform(-1, 1), rng.uniform(-1, 1)
+            pool.spawn(rng.uniform(0, WIDTH), rng.uniform(0, HEIGHT), dx * PROJECTILE_SPEED, dy * PROJECTILE_SPEED,
+                       5, rng.choice("AB"), ATTACK_DAMAGE)
+        return (0, 0)
+
+    return state, before_tick
+
+
+def healer_500_allies(spatial_hash=True):
+    """A Healer casting every tick over 500 wounded allies."""
+    state = new_match("1", "Healer", "2", "Knight", spatial_hash, seed=4)
+    _unkillable(state)
+    rng = random.Random(4)
+    allies = []
+    for _ in range(500):
+        ally = create_entity("Beast", "A", rng.uniform(0, WIDTH / 2), rng.uniform(0, HEIGHT), rng=rng)
+        ally.lifespan_timer = float("inf")
+        ally.attackCooldown = float("inf")
+        allies.append(ally)
+    state["entities"].extend(allies)
+    healer = state["player1"]
+
+    def before_tick(state):
+        for ally in allies:
+            ally.hp = 1
+        healer.skillCooldown = 0
+        return (IN_SKILL, 0)
+
+    return state, before_tick
+
+
+SCENARIOS = {
+    "idle_1v1": idle_1v1,
+    "summoner_200_beasts": summoner_200_beasts,
+    "projectiles_5000": projectiles_5000,
+    "healer_500_allies": healer_500_allies,
+}
@@ -0,0 +1,49 @@
+import argparse
+import os
+import random
+import sys
+
+from swap_solver import solve_many
+
+# Boards per second for swap_solver.solve_many() on random layouts. Run from
+# the repository root with ``python -m benchmarks.solver``.
+
+DEFAULT_BOARDS = 20000
+DEFAULT_SIZE = 8
+WALL_CHANCE = 0.2
+SWAP_CHANCE = 0.05
+
+
+def random_layouts(count, rows, cols, seed=0):
+    """Layouts of '.', 'X' and 'S'; the solver puts the goal on the centre cell."""
+    rng = random.Random(seed)
+    layouts = []
+    for _ in range(count):
+        cells = rng.choices(".XS", (1 - WALL_CHANCE - SWAP_CHANCE, WALL_CHANCE, SWAP_CHANCE), k=rows * cols)
+        cells[0] = "."  # somewhere to start
+        layouts.append(["".join(cells[i:i + cols]) for i in range(0, rows * cols, cols)])
+    return layouts
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Throughput of the SWAP1 board solver.")
+    parser.add_argument("-n", "--boards", type=int, default=DEFAULT_BOARDS)
+    parser.add_argument("--size", type=int, action="append", help="board side length (repeatable)")
+    parser.add_argument("-w", "--workers", type=int, action="append",
+                        help="worker processes (repeatable; default 1 and all cores)")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    workers = args.workers or sorted({1, os.cpu_count() or 1})
+    print(f"{'size':>6}{'workers':>9}{'boards/s':>12}{'solvable':>10}{'mean':>7}{'max':>5}")
+    for size in args.size or [DEFAULT_SIZE]:
+        layouts = random_layouts(args.boards, size, size, args.seed)
+        for count in workers:
+            _, report = solve_many(layouts, count)
+            print(f"{size:>6}{count:>9}{report['boards_per_sec']:>12.0f}{report['solvable']:>10}"
+                  f"{report['mean_distance'] or 0:>7.1f}{report['max_distance'] or 0:>5}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,58 @@
+import argparse
+import sys
+from time import perf_counter
+
+import numpy as np
+
+from arena_sim import IN_SKILL
+from arena_vec import VecArena
+
+# Env-steps per second for arena_vec.VecArena under random inputs. Run from
+# the repository root with ``python -m benchmarks.vec_env``.
+
+DEFAULT_ENVS = 4096
+DEFAULT_STEPS = 500
+WARMUP_STEPS = 20
+SKILL_CHANCE = 0.02  # per player per tick, so skills don't fire every time they come off cooldown
+
+
+def random_actions(rng, num_envs, steps):
+    actions = rng.integers(0, IN_SKILL, size=(steps, num_envs, 2))
+    actions |= (rng.random((steps, num_envs, 2)) < SKILL_CHANCE) * IN_SKILL
+    return actions
+
+
+def run(num_envs, steps, seed=0):
+    """Returns (env-steps per second, episodes finished) over steps ticks."""
+    env = VecArena(num_envs)
+    env.reset(list(range(seed, seed + num_envs)))
+    rng = np.random.default_rng(seed)
+    for actions in random_actions(rng, num_envs, WARMUP_STEPS):
+        env.step(actions)
+
+    actions = random_actions(rng, num_envs, steps)
+    episodes = 0
+    start = perf_counter()
+    for tick_actions in actions:
+        _, _, dones, _ = env.step(tick_actions)
+        episodes += int(dones.sum())
+    elapsed = perf_counter() - start
+    return num_envs * steps / elapsed, episodes
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Throughput of the vectorized arena.")
+    parser.add_argument("-k", "--envs", type=int, action="append", help="matches stepped together (repeatable)")
+    parser.add_argument("--steps", type=int, default=DEFAULT_STEPS, help="timed ticks per run")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    print(f"{'envs':>8}{'env-steps/s':>14}{'episodes':>10}")
+    for num_envs in args.envs or [DEFAULT_ENVS]:
+        rate, episodes = run(num_envs, args.steps, args.seed)
+        print(f"{num_envs:>8}{rate:>14.0f}{episodes:>10}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,54 @@
+# Entity store for a match. Entities are indexed by id, by team and by class
+# so rules that only care about one slice (a Healer's allies, every Beast)
+# don't walk the whole arena. Every index is an insertion-ordered dict, so
+# iterating any of them yields entities in the order they were added, the
+# same order the old flat list had.
+
+
+class EntityRegistry:
+    def __init__(self, entities=()):
+        self.by_id = {}
+        self.by_team = {}
+        self.by_class = {}
+        self.extend(entities)
+
+    def add(self, e):
+        """Registers e and returns it. A clashing id gets a numeric suffix."""
+        base = e.id
+        n = 1
+        while e.id in self.by_id:
+            n += 1
+            e.id = f"{base}-{n}"
+        self.by_id[e.id] = e
+        self.by_team.setdefault(e.team, {})[e.id] = e
+        self.by_class.setdefault(e.className, {})[e.id] = e
+        return e
+
+    def extend(self, entities):
+        for e in entities:
+            self.add(e)
+
+    def remove(self, e):
+        del self.by_id[e.id]
+        del self.by_team[e.team][e.id]
+        del self.by_class[e.className][e.id]
+
+    def get(self, entity_id):
+        return self.by_id.get(entity_id)
+
+    def team(self, team):
+        """Entities on team, in insertion order."""
+        return self.by_team.get(team, {}).values()
+
+    def of_class(self, class_name):
+        """Entities of class_name, in insertion order."""
+        return self.by_class.get(class_name, {}).values()
+
+    def __contains__(self, e):
+        return self.by_id.get(e.id) is e
+
+    def __iter__(self):
+        return iter(self.by_id.values())
+
+    def __len__(self):
+        return len(self.by_id)
@@ -0,0 +1,71 @@
+import csv
+import json
+from collections import deque
+from time import perf_counter_ns
+
+# Opt-in per-phase frame timing. Callers time a section with perf_counter_ns()
+# and add() it under a phase name; end_frame() closes the frame. Each phase
+# keeps a rolling window of per-frame totals for p50/p95/p99, and a longer
+# history of whole frames is kept for the CSV dump.
+
+PROFILE_WINDOW = 600  # frames in the rolling percentile window
+PROFILE_HISTORY = 36000  # frames kept for the CSV dump (10 min at 60 FPS)
+PERCENTILES = (50, 95, 99)
+
+
+def percentile(sorted_values, pct):
+    if not sorted_values:
+        return 0
+    k = min(len(sorted_values) - 1, max(0, round(pct / 100 * (len(sorted_values) - 1))))
+    return sorted_values[k]
+
+
+class FrameProfiler:
+    def __init__(self, window=PROFILE_WINDOW, history=PROFILE_HISTORY):
+        self.window = window
+        self.phases = []  # in first-seen order
+        self.samples = {}
+        self.current = {}
+        self.history = deque(maxlen=history)
+        self.frames = 0
+        self.frame_start = perf_counter_ns()
+
+    def add(self, phase, ns):
+        """Adds ns to phase for the frame in progress."""
+        if phase not in self.samples:
+            self.phases.append(phase)
+            self.samples[phase] = deque(maxlen=self.window)
+        self.current[phase] = self.current.get(phase, 0) + ns
+
+    def end_frame(self):
+        now = perf_counter_ns()
+        self.add("frame", now - self.frame_start)
+        self.frame_start = now
+        for phase in self.phases:
+            self.samples[phase].append(self.current.get(phase, 0))
+        self.history.append(self.current)
+        self.current = {}
+        self.frames += 1
+
+    def summary(self):
+        """{phase: {"p50": ns, "p95": ns, "p99": ns, "mean": ns}} over the rolling window."""
+        result = {}
+        for phase in self.phases:
+            values = sorted(self.samples[phase])
+            stats = {f"p{pct}": percentile(values, pct) for pct in PERCENTILES}
+            stats["mean"] = sum(values) / len(values) if values else 0
+            result[phase] = stats
+        return result
+
+    def dump_csv(self, path):
+        """One row per recorded frame, one column per phase, in nanoseconds."""
+        with open(path, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(["index"] + self.phases)
+            first = self.frames - len(self.history)
+            for i, frame in enumerate(self.history):
+                writer.writerow([first + i] + [frame.get(phase, 0) for phase in self.phases])
+
+    def dump_json(self, path):
+        with open(path, "w") as f:
+            json.dump({"frames": self.frames, "window": self.window, "phases": self.summary()}, f, indent=2)
@@ -0,0 +1,54 @@
+from itertools import islice
+
+# Preallocated projectile storage. Slots are reused Projectile objects, so
+# firing never allocates; live shots always occupy items[0:count] in the
+# order they were fired, and dead ones are swapped past the end during the
+# update pass.
+
+PROJECTILE_CAPACITY = 4096
+
+
+class Projectile:
+    __slots__ = ("x", "y", "dx", "dy", "radius", "team", "damage")
+
+    def __init__(self, x=0.0, y=0.0, dx=0.0, dy=0.0, radius=0, team=None, damage=0):
+        self.x = x
+        self.y = y
+        self.dx = dx
+        self.dy = dy
+        self.radius = radius
+        self.team = team
+        self.damage = damage
+
+
+class ProjectilePool:
+    def __init__(self, capacity=PROJECTILE_CAPACITY):
+        self.capacity = capacity
+        self.items = [Projectile() for _ in range(capacity)]
+        self.count = 0
+        self.dropped = 0  # spawns refused because the pool was full
+
+    def __len__(self):
+        return self.count
+
+    def __iter__(self):
+        return islice(self.items, self.count)
+
+    def spawn(self, x, y, dx, dy, radius, team, damage):
+        """Fills the next free slot and returns it, or None if the pool is full."""
+        if self.count == self.capacity:
+            self.dropped += 1
+            return None
+        proj = self.items[self.count]
+        proj.x = x
+        proj.y = y
+        proj.dx = dx
+        proj.dy = dy
+        proj.radius = radius
+        proj.team = team
+        proj.damage = damage
+        self.count += 1
+        return proj
+
+    def clear(self):
+        self.count = 0
@@ -0,0 +1,106 @@
+from collections import Counter
+
+import pygame
+
+from arena_sim import EV_HIT, EV_SKILL
+
+# Frame-batched sound playback on a reserved block of mixer channels. Events
+# are queued as the simulation emits them and flush() plays them once per
+# rendered frame: repeats of a sound in the same frame collapse into one
+# play, each sound is capped at a number of simultaneous voices, and when
+# every channel is busy a sound may cut off a lower-priority one. Anything
+# that can't get a channel is dropped rather than queued.
+
+RESERVED_CHANNELS = 8
+SOUND_PRIORITIES = {EV_SKILL: 2, EV_HIT: 1}  # higher wins a channel
+MAX_VOICES = {EV_SKILL: 2, EV_HIT: 3}
+DEFAULT_PRIORITY = 0
+DEFAULT_MAX_VOICES = 2
+
+
+class SoundDispatcher:
+    """Plays named sounds through a reserved channel pool.
+
+    lookup(name) returns the pygame Sound for name, or None while it isn't
+    loaded. Without an initialised mixer nothing is played.
+    """
+
+    def __init__(self, lookup, channels=RESERVED_CHANNELS, priorities=SOUND_PRIORITIES,
+                 max_voices=MAX_VOICES):
+        self.lookup = lookup
+        self.priorities = priorities
+        self.max_voices = max_voices
+        self.pending = Counter()
+        self.played = Counter()
+        self.coalesced = Counter()  # extra same-frame requests folded into one play
+        self.dropped = Counter()  # no free voice and nothing lower-priority to cut off
+        self.preempted = Counter()  # cut off to make room for a higher-priority sound
+        self.missing = Counter()  # requests for a sound not loaded yet, or with no mixer
+        self.channels = []
+        if pygame.mixer.get_init():
+            if pygame.mixer.get_num_channels() < channels:
+                pygame.mixer.set_num_channels(channels)
+            pygame.mixer.set_reserved(channels)
+            self.channels = [pygame.mixer.Channel(i) for i in range(channels)]
+        self.voices = [None] * len(self.channels)  # name last started on each channel
+
+    def queue(self, events):
+        """Adds one simulation tick's sound events to the current frame."""
+        for name in events:
+            self.pending[name] += 1
+
+    def flush(self):
+        """Plays this frame's queued sounds, highest priority first."""
+        if not self.pending:
+            return
+        order = sorted(self.pending, key=lambda name: -self.priorities.get(name, DEFAULT_PRIORITY))
+        for name in order:
+            if self._play(name):
+                self.coalesced[name] += self.pending[name] - 1
+            else:
+                self.missing[name] += self.pending[name]
+        self.pending.clear()
+
+    def _play(self, name):
+        """Plays or drops name; False when there is no sound or no channel to try."""
+        sound = self.lookup(name)
+        if sound is None or not self.channels:
+            return False
+        busy = [channel.get_busy() for channel in self.channels]
+        active = sum(1 for i, b in enumerate(busy) if b and self.voices[i] == name)
+        if active >= self.max_voices.get(name, DEFAULT_MAX_VOICES):
+            self.dropped[name] += 1
+            return True
+        index = busy.index(False) if False in busy else self._victim(name)
+        if index is None:
+            self.dropped[name] += 1
+            return True
+        if busy[index]:
+            self.preempted[self.voices[index]] += 1
+        self.channels[index].play(sound)
+        self.voices[index] = name
+        self.played[name] += 1
+        return True
+
+    def _victim(self, name):
+        """Busy channel holding the lowest-priority sound below name's, or None."""
+        priority = self.priorities.get(name, DEFAULT_PRIORITY)
+        best = None
+        for i, other in enumerate(self.voices):
+            other_priority = self.priorities.get(other, DEFAULT_PRIORITY)
+            if other_priority < priority and (best is None or other_priority < best[0]):
+                best = (other_priority, i)
+        return best[1] if best else None
+
+    def stats(self):
+        """{name: {"played", "coalesced", "dropped", "preempted", "missing"}} so far."""
+        names = set(self.played) | set(self.coalesced) | set(self.dropped) | set(self.preempted) | set(self.missing)
+        return {name: {"played": self.played[name], "coalesced": self.coalesced[name],
+                       "dropped": self.dropped[name], "preempted": self.preempted[name],
+                       "missing": self.missing[name]}
+                for name in sorted(names)}
+
+    def summary(self):
+        return "\n".join(f"{name:<14}played {s['played']:>6}  coalesced {s['coalesced']:>6}  "
+                         f"dropped {s['dropped']:>6}  preempted {s['preempted']:>6}  missing {s['missing']:>6}"
+                         for name, s in self.stats().items())
@@ -0,0 +1,57 @@
+# Uniform grid over the arena used as a broadphase for projectile hits.
+# Cells are at least as wide as the largest entity radius, so any entity a
+# point can touch is in the point's own cell or one of its eight neighbours.
+
+CELL_SIZE = 32
+
+
+class SpatialHash:
+    def __init__(self, width, height, cell_size=CELL_SIZE):
+        self.cell_size = cell_size
+        # One spare ring of cells on every side for entities pushed off-screen
+        self.cols = width // cell_size + 3
+        self.rows = height // cell_size + 3
+        self.cells = [[] for _ in range(self.cols * self.rows)]
+        self.used = []
+        # The 3x3 block of cell indices around every cell, clipped to the grid
+        self.neighbors = []
+        for row in range(self.rows):
+            for col in range(self.cols):
+                self.neighbors.append(tuple(
+                    r * self.cols + c
+                    for r in range(max(row - 1, 0), min(row + 2, self.rows))
+                    for c in range(max(col - 1, 0), min(col + 2, self.cols))
+                ))
+
+    def cell_of(self, x, y):
+        col = int(x // self.cell_size) + 1
+        row = int(y // self.cell_size) + 1
+        if col < 0:
+            col = 0
+        elif col >= self.cols:
+            col = self.cols - 1
+        if row < 0:
+            row = 0
+        elif row >= self.rows:
+            row = self.rows - 1
+        return row * self.cols + col
+
+    def clear(self):
+        for c in self.used:
+            self.cells[c].clear()
+        self.used.clear()
+
+    def rebuild(self, items):
+        """Buckets (order, entity) pairs by position; order breaks ties on query."""
+        self.clear()
+        cells, used = self.cells, self.used
+        for order, e in enumerate(items):
+            c = self.cell_of(e.x, e.y)
+            if not cells[c]:
+                used.append(c)
+            cells[c].append((order, e))
+
+    def near(self, x, y):
+        """Returns the non-empty buckets in the 3x3 block of cells around (x, y)."""
+        cells = self.cells
+        return [cells[c] for c in self.neighbors[self.cell_of(x, y)] if cells[c]]
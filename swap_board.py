@@ -0,0 +1,200 @@
+# Grid boards for SWAP1. A board is N x M cells numbered row-major, i = r *
+# cols + c. Walls, swap tiles and goal cells are each one int bitmask (bit i
+# = cell i), which keeps a board small, hashable and cheap to compare, and
+# lets a search expand a whole frontier with a few shifts. Per-cell flags in
+# a bytearray hold the same facts plus which neighbours are open, so moving,
+# swapping and testing for a win are all O(1) lookups.
+
+UP, DOWN, LEFT, RIGHT = range(4)
+DIRECTIONS = ((-1, 0), (1, 0), (0, -1), (0, 1))  # (dr, dc) by direction
+
+WALL = 1
+SWAP = 2
+GOAL = 4
+OPEN_SHIFT = 3  # bit OPEN_SHIFT + d is set when direction d leads to a floor cell
+
+SYMBOLS = {".": 0, "X": WALL, "S": SWAP, "G": GOAL}
+FLAGS = (WALL, SWAP, GOAL) + tuple(1 << (OPEN_SHIFT + d) for d in range(4))
+
+# str/bytes.translate tables: a layout string to a '0'/'1' string per
+# symbol, and a '0'/'1' string to one byte per cell holding 0 or a flag
+_SYMBOL_BITS = {symbol: {ord(other): "1" if other == symbol else "0" for other in SYMBOLS} for symbol in SYMBOLS}
+_FLAG_BYTES = {flag: bytes.maketrans(b"01", bytes((0, flag))) for flag in FLAGS}
+
+
+def _bits(mask, size):
+    """mask as a string of size '0'/'1' characters, cell 0 first."""
+    return format(mask, f"0{size}b")[::-1]
+
+
+def _mask(cells, symbol):
+    """Bitmask of where symbol appears in cells, a layout string with cell 0 first."""
+    return int(cells.translate(_SYMBOL_BITS[symbol])[::-1], 2)
+
+
+class BoardError(ValueError):
+    pass
+
+
+class Board:
+    """Walls, swap tiles and goals on a rows x cols grid.
+
+    Swapping from cell i jumps to the first swap tile in row-major order
+    that isn't i, as SWAP1 always has; with no such tile it stays put.
+    start is the cell a player begins on.
+    """
+    __slots__ = ("rows", "cols", "walls", "swaps", "goals", "start", "_flags", "swap_first", "swap_second")
+
+    def __init__(self, rows, cols, walls=0, swaps=0, goals=0, start=0):
+        if rows <= 0 or cols <= 0:
+            raise BoardError(f"board must be at least 1x1, got {rows}x{cols}")
+        size = rows * cols
+        full = (1 << size) - 1
+        if (walls | swaps | goals) & ~full:
+            raise BoardError(f"mask has cells outside a {rows}x{cols} board")
+        if walls & (swaps | goals):
+            raise BoardError("swap and goal cells can't be walls")
+        if not 0 <= start < size or walls >> start & 1:
+            raise BoardError(f"start cell {start} is off the board or a wall")
+        self.rows = rows
+        self.cols = cols
+        self.walls = walls
+        self.swaps = swaps
+        self.goals = goals
+        self.start = start
+        self._flags = None  # built on first use; a search only needs the masks
+
+        # Only the first two swap tiles can ever be a target
+        first = (swaps & -swaps).bit_length() - 1
+        rest = swaps & (swaps - 1)
+        self.swap_first = first
+        self.swap_second = (rest & -rest).bit_length() - 1
+
+    @classmethod
+    def from_strings(cls, lines, goals=0, start=None):
+        """Parses rows like 'X.S.X' ('X' wall, 'S' swap, 'G' goal, '.' floor).
+
+        Without start, a player begins on the last swap tile, or on the first
+        floor cell if there are none.
+        """
+        lines = [line.strip() for line in lines if line.strip()]
+        if not lines or len({len(line) for line in lines}) != 1:
+            raise BoardError("board rows must be non-empty and all the same length")
+        cols = len(lines[0])
+        cells = "".join(lines).upper()
+        unknown = set(cells) - set(SYMBOLS)
+        if unknown:
+            raise BoardError(f"unknown board symbol {sorted(unknown)[0]!r}")
+        walls = _mask(cells, "X")
+        swaps = _mask(cells, "S")
+        goals |= _mask(cells, "G")
+        if start is None:
+            if swaps:
+                start = swaps.bit_length() - 1
+            else:
+                floor = ~walls & ((1 << len(lines) * cols) - 1)
+                start = (floor & -floor).bit_length() - 1
+        return cls(len(lines), cols, walls, swaps, goals, start)
+
+    @classmethod
+    def from_matrix(cls, matrix, goals=0, start=None):
+        """Same as from_strings for a list of lists of single-character strings."""
+        return cls.from_strings(["".join(row) for row in matrix], goals, start)
+
+    def to_strings(self):
+        return ["".join(self.symbol(r * self.cols + c) for c in range(self.cols)) for r in range(self.rows)]
+
+    @property
+    def flags(self):
+        """bytearray of per-cell WALL/SWAP/GOAL and open-neighbour bits."""
+        if self._flags is None:
+            # Each mask becomes one byte per cell holding 0 or its flag bit;
+            # the flag bits don't overlap, so OR-ing those byte strings as big
+            # ints builds every cell's flags without a Python loop over cells
+            size = self.size
+            masks = [(WALL, self.walls), (SWAP, self.swaps), (GOAL, self.goals)]
+            masks += [(1 << (OPEN_SHIFT + d), self.open_from(d)) for d in range(4)]
+            combined = 0
+            for flag, mask in masks:
+                cells = _bits(mask, size).encode().translate(_FLAG_BYTES[flag])
+                combined |= int.from_bytes(cells, "big")
+            self._flags = bytearray(combined.to_bytes(size, "big"))
+        return self._flags
+
+    # ---- cells ----
+
+    @property
+    def size(self):
+        return self.rows * self.cols
+
+    def index(self, r, c):
+        return r * self.cols + c
+
+    def cell(self, i):
+        """(row, col) of cell i."""
+        return divmod(i, self.cols)
+
+    def symbol(self, i):
+        f = self.flags[i]
+        return "X" if f & WALL else "S" if f & SWAP else "G" if f & GOAL else "."
+
+    def is_wall(self, i):
+        return self.flags[i] & WALL != 0
+
+    def is_goal(self, i):
+        return self.flags[i] & GOAL != 0
+
+    def neighbours(self, i):
+        """4-bit mask of the directions open from cell i."""
+        return self.flags[i] >> OPEN_SHIFT & 15
+
+    # ---- moves ----
+
+    def move(self, i, d):
+        """Cell reached by stepping from i in direction d, or i if blocked."""
+        if self.flags[i] >> (OPEN_SHIFT + d) & 1:
+            return i + (-self.cols, self.cols, -1, 1)[d]
+        return i
+
+    def swap(self, i):
+        """Cell reached by swapping from i, or i if there is nowhere to go."""
+        target = self.swap_second if i == self.swap_first else self.swap_first
+        return i if target < 0 else target
+
+    # ---- whole-board masks ----
+
+    def open_from(self, d):
+        """Bitmask of every cell a step in direction d can leave from."""
+        cols = self.cols
+        floor = ((1 << self.size) - 1) & ~self.walls
+        if d == UP:
+            return floor & (floor << cols)
+        if d == DOWN:
+            return floor & (floor >> cols)
+        # Row-wrapping steps are masked off with the first or last column
+        first_col = int(("0" * (cols - 1) + "1") * self.rows, 2)
+        if d == LEFT:
+            return floor & (floor << 1) & ~first_col
+        return floor & (floor >> 1) & ~(first_col << (cols - 1))
+
+    def __eq__(self, other):
+        if not isinstance(other, Board):
+            return NotImplemented
+        return (self.rows, self.cols, self.walls, self.swaps, self.goals, self.start) == \
+            (other.rows, other.cols, other.walls, other.swaps, other.goals, other.start)
+
+    def __hash__(self):
+        return hash((self.rows, self.cols, self.walls, self.swaps, self.goals, self.start))
+
+    def __repr__(self):
+        return f"Board({self.rows}x{self.cols}, start={self.cell(self.start)})"
+
+
+def goal_mask(rows, cols, hit):
+    """Bitmask of the cells (r, c) for which hit(r, c) is true."""
+    mask = 0
+    for r in range(rows):
+        for c in range(cols):
+            if hit(r, c):
+                mask |= 1 << (r * cols + c)
+    return mask
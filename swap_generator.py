@@ -0,0 +1,198 @@
+import argparse
+import json
+import os
+import random
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from swap_board import Board, BoardError
+from swap_solver import bfs_levels
+
+# Seeded four-player board sets for SWAP1. Each set picks a target path
+# length; every player's board is then sampled until it has a cell whose
+# shortest route to the goal (the centre cell) is within the tolerance of
+# that target, and that cell becomes the player's start. So a set is fair by
+# construction and a rejected candidate only costs one board, never the set.
+# The check is a backwards BFS that stops at the far edge of the window.
+# Set n of a run depends only on the seed and n, so the output is the same
+# for any number of workers.
+
+PLAYERS = 4
+DEFAULT_SIZE = 5
+WALL_CHANCE = 0.3
+SWAP_CHANCE = 0.08
+MIN_DISTANCE = 4  # shortest optimal route worth playing
+MAX_DISTANCE = 8
+TOLERANCE = 1  # optimal route lengths in a set differ by at most this
+SETS_PER_TASK = 64
+REPORT_INTERVAL = 1.0  # seconds between progress lines
+
+
+class GeneratorError(Exception):
+    pass
+
+
+def random_board(rng, rows, cols):
+    """Walls and swap tiles at random, the goal on the centre cell."""
+    cells = rng.choices(".XS", (1 - WALL_CHANCE - SWAP_CHANCE, WALL_CHANCE, SWAP_CHANCE), k=rows * cols)
+    centre = (rows // 2) * cols + cols // 2
+    cells[centre] = "G"
+    return Board.from_strings(["".join(cells[i:i + cols]) for i in range(0, rows * cols, cols)], start=centre)
+
+
+def pick_bit(rng, mask):
+    """A uniformly chosen set bit of mask."""
+    bits = format(mask, "b")[::-1]
+    positions = [i for i, bit in enumerate(bits) if bit == "1"]
+    return rng.choice(positions)
+
+
+def generate_set(seed, index, rows=DEFAULT_SIZE, cols=DEFAULT_SIZE, tolerance=TOLERANCE,
+                 min_distance=MIN_DISTANCE, max_distance=MAX_DISTANCE, max_candidates=100000):
+    """Four boards with starts whose optimal routes are all within tolerance.
+
+    Returns (boards, distances, candidates screened).
+    """
+    rng = random.Random(f"{seed}:{index}")
+    target = rng.randint(min_distance, max(min_distance, max_distance - tolerance))
+    lo, hi = target, target + tolerance
+    boards, distances = [], []
+    candidates = 0
+    while len(boards) < PLAYERS:
+        if candidates >= max_candidates:
+            raise GeneratorError(f"no {rows}x{cols} board with a {lo}-{hi} step route "
+                                 f"in {max_candidates} candidates")
+        candidates += 1
+        board = random_board(rng, rows, cols)
+        levels = bfs_levels(board, hi)[lo:]
+        if not levels:
+            continue
+        # Each cell is in exactly one level, so picking a level by its size
+        # and then a cell in it picks uniformly from the whole window
+        weights = [mask.bit_count() for mask in levels]
+        distance = rng.choices(range(len(levels)), weights)[0]
+        start = pick_bit(rng, levels[distance])
+        boards.append(Board(board.rows, board.cols, board.walls, board.swaps, board.goals, start))
+        distances.append(lo + distance)
+    return boards, distances, candidates
+
+
+def set_record(seed, index, boards, distances):
+    return {
+        "seed": seed,
+        "index": index,
+        "distances": distances,
+        "boards": [{"layout": board.to_strings(), "start": list(board.cell(board.start))} for board in boards],
+    }
+
+
+def load_board_sets(path):
+    """Board sets written by this module, each a list of PLAYERS Boards."""
+    sets = []
+    with open(path) as f:
+        for line in f:
+            if line.strip():
+                boards = []
+                for b in json.loads(line)["boards"]:
+                    r, c = b["start"]
+                    boards.append(Board.from_strings(b["layout"], start=r * len(b["layout"][0]) + c))
+                sets.append(boards)
+    return sets
+
+
+def generate_batch(seed, first, count, rows, cols, tolerance, min_distance, max_distance):
+    """(JSON line per set, candidates screened) for sets first..first + count - 1."""
+    lines = []
+    candidates = 0
+    for index in range(first, first + count):
+        boards, distances, screened = generate_set(seed, index, rows, cols, tolerance, min_distance, max_distance)
+        candidates += screened
+        lines.append(json.dumps(set_record(seed, index, boards, distances)))
+    return lines, candidates
+
+
+def generate(out, sets, seed=0, rows=DEFAULT_SIZE, cols=DEFAULT_SIZE, tolerance=TOLERANCE,
+             min_distance=MIN_DISTANCE, max_distance=MAX_DISTANCE, workers=None, progress=sys.stderr):
+    """Streams sets board sets to out, one JSON object per line, and returns a report."""
+    workers = workers or os.cpu_count()
+    shape = (rows, cols, tolerance, min_distance, max_distance)
+    firsts = range(0, sets, SETS_PER_TASK)
+    start = last_report = time.perf_counter()
+    written = candidates = 0
+
+    def consume(lines, screened):
+        nonlocal written, candidates, last_report
+        out.write("\n".join(lines) + "\n")
+        written += len(lines)
+        candidates += screened
+        now = time.perf_counter()
+        if progress and now - last_report >= REPORT_INTERVAL:
+            elapsed = now - start
+            print(f"{written} sets, {candidates} candidates, {candidates / elapsed:.0f} boards/s", file=progress)
+            last_report = now
+
+    if workers == 1:
+        for first in firsts:
+            consume(*generate_batch(seed, first, min(SETS_PER_TASK, sets - first), *shape))
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(generate_batch, seed, first, min(SETS_PER_TASK, sets - first), *shape)
+                       for first in firsts]
+            for future in futures:
+                consume(*future.result())
+    elapsed = time.perf_counter() - start
+    return {
+        "sets": written,
+        "candidates": candidates,
+        "workers": workers,
+        "elapsed": elapsed,
+        "boards_per_sec": candidates / elapsed if elapsed else 0.0,
+        "sets_per_sec": written / elapsed if elapsed else 0.0,
+    }
+
+
+def parse_size(text):
+    """'5' or '7x9' -> (rows, cols)."""
+    rows, _, cols = text.lower().partition("x")
+    try:
+        size = (int(rows), int(cols or rows))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected N or ROWSxCOLS, got {text!r}")
+    if min(size) < 1:
+        raise argparse.ArgumentTypeError(f"board size must be positive, got {text!r}")
+    return size
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate fair four-player SWAP1 board sets.")
+    parser.add_argument("-n", "--sets", type=int, default=1000, help="board sets to write")
+    parser.add_argument("-o", "--output", default="-", help="JSON-lines file to write ('-' for stdout)")
+    parser.add_argument("--size", type=parse_size, default=(DEFAULT_SIZE, DEFAULT_SIZE), help="N or ROWSxCOLS")
+    parser.add_argument("--tolerance", type=int, default=TOLERANCE,
+                        help="most the players' optimal route lengths may differ by")
+    parser.add_argument("--min-distance", type=int, default=MIN_DISTANCE)
+    parser.add_argument("--max-distance", type=int, default=MAX_DISTANCE)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("-w", "--workers", type=int, default=os.cpu_count(), help="worker processes")
+    args = parser.parse_args(argv)
+
+    rows, cols = args.size
+    out = sys.stdout if args.output == "-" else open(args.output, "w")
+    try:
+        report = generate(out, args.sets, args.seed, rows, cols, args.tolerance,
+                          args.min_distance, args.max_distance, args.workers)
+    except (GeneratorError, BoardError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    finally:
+        if out is not sys.stdout:
+            out.close()
+    print(f"{report['sets']} sets from {report['candidates']} candidates in {report['elapsed']:.2f}s on "
+          f"{report['workers']} workers: {report['boards_per_sec']:.0f} boards/s, "
+          f"{report['sets_per_sec']:.0f} sets/s", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,141 @@
+from collections import deque
+from time import perf_counter
+
+import pygame
+
+from frame_profiler import percentile, PERCENTILES
+
+# Event-driven input for SWAP1. Every KEYDOWN on a bound key, and every click
+# on a player's swap button, queues exactly one action for that player, so
+# a tap is never lost between frames and a click goes through the same
+# path as a key. A held key repeats after REPEAT_DELAY_MS and then every
+# REPEAT_INTERVAL_MS of wall-clock time, whatever the frame rate, and the
+# most recently pressed key of a player is the one that repeats. Each
+# queued action keeps the time it was received (or, for a repeat, the time
+# it was due) so the game can report how long it took to reach the screen.
+
+REPEAT_DELAY_MS = 250  # hold time before the first repeat
+REPEAT_INTERVAL_MS = 150  # between repeats after that
+MAX_QUEUED = 8  # per player; more actions than this in one frame are dropped
+LATENCY_WINDOW = 1000  # most recent input-to-display samples kept
+
+
+def now_ms():
+    return perf_counter() * 1000
+
+
+class InputHandler:
+    """Per-player action queues fed by pygame events.
+
+    bindings is {pid: {action: key}}. buttons is {pid: rect}; a left click in
+    a player's rect queues "swap" for them.
+    """
+
+    def __init__(self, bindings, buttons=None, repeat_delay=REPEAT_DELAY_MS,
+                 repeat_interval=REPEAT_INTERVAL_MS, max_queued=MAX_QUEUED):
+        self.keymap = {key: (pid, action) for pid, keys in bindings.items() for action, key in keys.items()}
+        self.buttons = buttons or {}
+        self.repeat_delay = repeat_delay
+        self.repeat_interval = repeat_interval
+        self.max_queued = max_queued
+        self.queues = {pid: deque() for pid in bindings}
+        self.held = {pid: [] for pid in bindings}  # (key, action), most recent last
+        self.next_repeat = {}  # pid -> when its top held key repeats
+        self.latencies = deque(maxlen=LATENCY_WINDOW)
+        self.queued = 0
+        self.repeats = 0
+        self.dropped = 0
+
+    # ---- events ----
+
+    def handle(self, event, now=None):
+        """Queues the actions for one pygame event; other events are ignored."""
+        now = now_ms() if now is None else now
+        if event.type == pygame.KEYDOWN and event.key in self.keymap:
+            pid, action = self.keymap[event.key]
+            held = self.held[pid]
+            if any(key == event.key for key, _ in held):
+                return  # a system key repeat; held keys repeat on our own timer
+            held.append((event.key, action))
+            self.next_repeat[pid] = now + self.repeat_delay
+            self.push(pid, action, now)
+        elif event.type == pygame.KEYUP and event.key in self.keymap:
+            pid, _ = self.keymap[event.key]
+            held = self.held[pid]
+            was_top = held and held[-1][0] == event.key
+            held[:] = [entry for entry in held if entry[0] != event.key]
+            if not held:
+                self.next_repeat.pop(pid, None)
+            elif was_top:
+                # The key underneath has been down all along, so it carries on
+                # repeating rather than waiting out a fresh delay
+                self.next_repeat[pid] = now + self.repeat_interval
+        elif event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
+            for pid, rect in self.buttons.items():
+                if rect.collidepoint(event.pos):
+                    self.push(pid, "swap", now)
+        elif event.type == pygame.WINDOWFOCUSLOST:
+            # No KEYUP arrives for keys released while unfocused
+            self.release_all()
+
+    def push(self, pid, action, stamp):
+        queue = self.queues[pid]
+        if len(queue) >= self.max_queued:
+            self.dropped += 1
+            return
+        queue.append((action, stamp))
+        self.queued += 1
+
+    def release_all(self):
+        for held in self.held.values():
+            held.clear()
+        self.next_repeat.clear()
+
+    # ---- repeats ----
+
+    def poll(self, now=None):
+        """Queues one repeat for each held key that is due."""
+        now = now_ms() if now is None else now
+        for pid, due in list(self.next_repeat.items()):
+            if now >= due:
+                self.push(pid, self.held[pid][-1][1], due)
+                self.repeats += 1
+                # After a stall, skip the repeats that were missed instead of
+                # replaying them all in one frame
+                due += self.repeat_interval
+                self.next_repeat[pid] = due if due > now else now + self.repeat_interval
+
+    def timeout(self, now=None):
+        """ms until the next repeat is due, or None when no key is held."""
+        if not self.next_repeat:
+            return None
+        now = now_ms() if now is None else now
+        return max(0.0, min(self.next_repeat.values()) - now)
+
+    # ---- consuming ----
+
+    def drain(self):
+        """Every queued (pid, action, stamp), each player's in the order received."""
+        actions = []
+        for pid, queue in self.queues.items():
+            actions += [(pid, action, stamp) for action, stamp in queue]
+            queue.clear()
+        return actions
+
+    def presented(self, stamps, now=None):
+        """Records input-to-display latency for actions whose frame has just been shown."""
+        now = now_ms() if now is None else now
+        self.latencies.extend(now - stamp for stamp in stamps)
+
+    def summary(self):
+        """{"samples", "p50", "p95", "p99", "max"} in ms over the latency window."""
+        values = sorted(self.latencies)
+        result = {"samples": len(values), "max": values[-1] if values else 0}
+        result.update({f"p{pct}": percentile(values, pct) for pct in PERCENTILES})
+        return result
+
+    def report(self):
+        s = self.summary()
+        return (f"input latency over {s['samples']} actions: p50 {s['p50']:.1f} ms, p95 {s['p95']:.1f} ms, "
+                f"p99 {s['p99']:.1f} ms, max {s['max']:.1f} ms ({self.queued} queued, "
+                f"{self.repeats} repeats, {self.dropped} dropped)")
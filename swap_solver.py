@@ -0,0 +1,193 @@
+import hashlib
+import os
+import time
+from array import array
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+
+from swap_board import UP, DOWN, LEFT, RIGHT, Board
+
+# Shortest paths on SWAP1 boards. Every move and every swap costs one step.
+# distance_table() runs one breadth-first search backwards from the goal
+# cells over whole-board bitmasks, so each BFS level is a handful of shifts
+# and ANDs however big the board is, and the result answers "how far from
+# the goal" for every start cell at once. Tables are cached by a hash of the
+# board layout (the start cell doesn't change them), and solve_many() spreads
+# large board sets over a process pool.
+
+TABLE_CACHE_SIZE = 4096
+BATCHES_PER_WORKER = 8
+UNREACHABLE = -1
+SWAP_ACTION = "swap"
+ACTION_NAMES = {UP: "up", DOWN: "down", LEFT: "left", RIGHT: "right"}
+
+
+def as_board(board, start=None):
+    """Board from a Board, a list of row strings or a player_matrices-style list of lists.
+
+    start is a cell index or (row, col). A layout with no goal cells gets the
+    centre cell as its goal, which leaves it unsolvable if that is a wall.
+    """
+    if not isinstance(board, Board):
+        rows = ["".join(row) for row in board]
+        board = Board.from_strings(rows)
+    if not board.goals:
+        centre = 1 << board.index(board.rows // 2, board.cols // 2)
+        board = Board(board.rows, board.cols, board.walls, board.swaps, centre & ~board.walls, board.start)
+    if start is not None:
+        if isinstance(start, (tuple, list)):
+            start = board.index(*start)
+        board = Board(board.rows, board.cols, board.walls, board.swaps, board.goals, start)
+    return board
+
+
+def board_key(board):
+    """Stable digest of the layout (not the start cell), the same in every process."""
+    fields = (board.rows, board.cols, board.walls, board.swaps, board.goals)
+    return hashlib.blake2b(repr(fields).encode(), digest_size=16).digest()
+
+
+def bfs_levels(board, limit=None):
+    """Cell masks at distance 0, 1, 2, ... from the goal, found backwards.
+
+    With a limit the search stops after the mask for that distance.
+    """
+    cols = board.cols
+    floor = ((1 << board.size) - 1) & ~board.walls
+    # Cells a step in each direction can leave from
+    up, down, left, right = (board.open_from(d) for d in (UP, DOWN, LEFT, RIGHT))
+    first = board.swap_first
+    second = board.swap_second
+    first_bit = 1 << first if first >= 0 else 0
+    second_bit = 1 << second if second >= 0 else 0
+
+    frontier = board.goals & floor
+    seen = frontier
+    levels = []
+    while frontier:
+        levels.append(frontier)
+        if len(levels) - 1 == limit:
+            break
+        # Cells with a move into the frontier
+        prev = ((frontier << cols) & up) | ((frontier >> cols) & down) | \
+               ((frontier << 1) & left) | ((frontier >> 1) & right)
+        # Every floor cell but the first swap tile swaps onto it; the first swaps onto the second
+        if frontier & first_bit:
+            prev |= floor & ~first_bit
+        if frontier & second_bit:
+            prev |= first_bit
+        frontier = prev & ~seen
+        seen |= frontier
+    return levels
+
+
+def distance_table(board):
+    """array of steps to the nearest goal for every cell, UNREACHABLE for walls and dead ends."""
+    size = board.size
+    table = array("i", [UNREACHABLE]) * size
+    for distance, mask in enumerate(bfs_levels(board)):
+        bits = format(mask, f"0{size}b")[::-1]
+        i = bits.find("1")
+        while i >= 0:
+            table[i] = distance
+            i = bits.find("1", i + 1)
+    return table
+
+
+class TableCache:
+    """LRU cache of distance tables keyed by board_key()."""
+
+    def __init__(self, max_size=TABLE_CACHE_SIZE):
+        self.max_size = max_size
+        self.tables = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, board):
+        key = board_key(board)
+        table = self.tables.get(key)
+        if table is not None:
+            self.hits += 1
+            self.tables.move_to_end(key)
+            return table
+        self.misses += 1
+        table = self.tables[key] = distance_table(board)
+        if len(self.tables) > self.max_size:
+            self.tables.popitem(last=False)
+        return table
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {"size": len(self.tables), "hits": self.hits, "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0}
+
+
+TABLE_CACHE = TableCache()
+
+
+def solve(board, start=None, cache=TABLE_CACHE):
+    """Fewest moves and swaps from start (default: the board's start) to a goal, or None."""
+    board = as_board(board, start)
+    distance = cache.get(board)[board.start]
+    return None if distance == UNREACHABLE else distance
+
+
+def hint(board, pos, cache=TABLE_CACHE):
+    """The action ("up", "down", "left", "right" or "swap") that gets closest to the goal from pos.
+
+    None when pos is a goal or no goal can be reached.
+    """
+    board = as_board(board)
+    if isinstance(pos, (tuple, list)):
+        pos = board.index(*pos)
+    table = cache.get(board)
+    here = table[pos]
+    if here <= 0:
+        return None
+    for action, target in [(ACTION_NAMES[d], board.move(pos, d)) for d in (UP, DOWN, LEFT, RIGHT)] + \
+            [(SWAP_ACTION, board.swap(pos))]:
+        if table[target] == here - 1:
+            return action
+    return None
+
+
+# ---------------- BATCH SOLVING ----------------
+def pack(board):
+    """Picklable form of a Board; much smaller than its per-cell flags."""
+    return board.rows, board.cols, board.walls, board.swaps, board.goals, board.start
+
+
+def solve_packed(packed):
+    """Distances for a list of pack()ed boards, in order."""
+    return [solve(Board(*fields)) for fields in packed]
+
+
+def solve_many(boards, workers=None, start_cells=None):
+    """Solves boards (anything as_board() takes) over a process pool.
+
+    Returns (distances in input order with None for unsolvable, report). With
+    workers=1 everything runs in this process.
+    """
+    if start_cells is None:
+        start_cells = [None] * len(boards)
+    packed = [pack(as_board(board, start)) for board, start in zip(boards, start_cells)]
+    start = time.perf_counter()
+    workers = workers or os.cpu_count()
+    if workers == 1:
+        results = solve_packed(packed)
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            batch = max(1, len(packed) // (workers * BATCHES_PER_WORKER))
+            chunks = [packed[i:i + batch] for i in range(0, len(packed), batch)]
+            results = [d for chunk in pool.map(solve_packed, chunks) for d in chunk]
+    elapsed = time.perf_counter() - start
+    solved = [d for d in results if d is not None]
+    return results, {
+        "boards": len(results),
+        "solvable": len(solved),
+        "max_distance": max(solved, default=None),
+        "mean_distance": sum(solved) / len(solved) if solved else None,
+        "workers": workers,
+        "elapsed": elapsed,
+        "boards_per_sec": len(results) / elapsed if elapsed else 0.0,
+    }
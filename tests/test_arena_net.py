@@ -0,0 +1,89 @@
+import asyncio
+import unittest
+from types import SimpleNamespace
+
+from arena_net import (
+    DEFAULT_HOST, SNAPSHOT_HISTORY, ArenaClient, ArenaServer, NetIds, run_loopback,
+)
+from arena_sim import ATTACK_DAMAGE, IN_ATTACK
+
+# Runs the server against automated clients over 127.0.0.1. Run from the
+# repository root with ``python -m pytest tests``.
+
+MATCH_TIMEOUT = 10.0  # seconds
+
+
+async def _play_to_the_end():
+    """One match where side 0 keeps attacking and side 1 stands still at one hit from dying."""
+    server = ArenaServer(port=0, seed=1)
+    await server.start()
+    attacker, target = ArenaClient(), ArenaClient()
+    try:
+        await attacker.connect(DEFAULT_HOST, server.port, "duel", "attacker", "Mage")
+        await target.connect(DEFAULT_HOST, server.port, "duel", "target", "Knight")
+        state = server.matches["duel"].state
+        state["player2"].hp = ATTACK_DAMAGE
+
+        async def attack():
+            while not attacker.done.is_set():
+                await attacker.updated.wait()
+                attacker.updated.clear()
+                attacker.send_input(IN_ATTACK)
+
+        task = asyncio.create_task(attack())
+        await asyncio.wait_for(asyncio.gather(attacker.done.wait(), target.done.wait()), MATCH_TIMEOUT)
+        task.cancel()
+        return server, attacker, target, state["player1"].id
+    finally:
+        await attacker.close()
+        await target.close()
+        await server.close()
+
+
+class LoopbackTest(unittest.TestCase):
+    def test_client_snapshots_match_server(self):
+        metrics, consistent = asyncio.run(run_loopback(2, 1.0, seed=1))
+        self.assertTrue(consistent)
+        self.assertGreater(metrics["ticks"], 0)
+        self.assertEqual(len(metrics["clients"]), 4)
+        for client in metrics["clients"]:
+            self.assertEqual(client["full_snapshots"], 1)
+            self.assertGreater(client["delta_snapshots"], 0)
+
+    def test_match_result_reaches_both_clients(self):
+        server, attacker, target, attacker_id = asyncio.run(_play_to_the_end())
+        self.assertIsNone(attacker.error)
+        self.assertIsNone(target.error)
+        self.assertEqual(attacker.winner, attacker_id)
+        self.assertEqual(target.winner, attacker_id)
+        self.assertEqual(list(server.results), [("duel", attacker_id)])
+        self.assertEqual(server.metrics()["finished"], 1)
+        self.assertNotIn("duel", server.matches)
+
+
+class NetIdsTest(unittest.TestCase):
+    def test_ids_of_gone_entities_are_reused_after_the_history(self):
+        net_ids = NetIds()
+        net_ids.update([SimpleNamespace(id=0), SimpleNamespace(id=1)])
+        released = net_ids[1]
+        for _ in range(SNAPSHOT_HISTORY - 1):
+            net_ids.update([SimpleNamespace(id=0)])
+        net_ids.update([SimpleNamespace(id=0), SimpleNamespace(id=2)])
+        self.assertNotEqual(net_ids[2], released)
+
+        for _ in range(SNAPSHOT_HISTORY):
+            net_ids.update([SimpleNamespace(id=0)])
+        net_ids.update([SimpleNamespace(id=0), SimpleNamespace(id=3)])
+        self.assertEqual(net_ids[3], released)
+        self.assertEqual(len(net_ids), 2)
+
+    def test_ids_stay_bounded_over_a_long_match(self):
+        net_ids = NetIds()
+        for entity_id in range(100000):
+            net_ids.update([SimpleNamespace(id=0), SimpleNamespace(id=entity_id + 1)])
+        self.assertLess(net_ids.next_id, 2 * SNAPSHOT_HISTORY)
+        self.assertLess(len(net_ids.free), 2 * SNAPSHOT_HISTORY)
+
+
+if __name__ == "__main__":
+    unittest.main()
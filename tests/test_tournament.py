@@ -0,0 +1,36 @@
+import argparse
+import unittest
+
+from tournament import parse_override
+
+# --set parsing for the tournament runner. Run from the repository root with
+# ``python -m pytest tests``.
+
+
+class ParseOverrideTest(unittest.TestCase):
+    def test_constants_and_fields_the_sim_reads(self):
+        self.assertEqual(parse_override("ATTACK_DAMAGE=30"), (None, "ATTACK_DAMAGE", 30))
+        self.assertEqual(parse_override("Mage.speed=1.7"), ("Mage", "speed", 1.7))
+        self.assertEqual(parse_override("Warrior.charge_damage=40"), ("Warrior", "charge_damage", 40))
+        self.assertEqual(parse_override("Beast.attackDamage=25"), ("Beast", "attackDamage", 25))
+
+    def test_fields_the_sim_never_reads_are_rejected(self):
+        # The Mage fireball uses SKILL_DAMAGE; only Beast.attackDamage is read
+        for text in ("Mage.attackDamage=500", "Mage.color=3", "Mage.special_skill=1", "Knight.stealth_duration=5"):
+            with self.assertRaises(argparse.ArgumentTypeError):
+                parse_override(text)
+
+    def test_constants_that_dont_take_effect_are_rejected(self):
+        for text in ("TICK_RATE=60", "TICK_DT=0.01", "CLASSES=1", "WIDTH=1000", "Dragon.speed=2"):
+            with self.assertRaises(argparse.ArgumentTypeError):
+                parse_override(text)
+
+    def test_values_must_be_numbers(self):
+        with self.assertRaises(argparse.ArgumentTypeError):
+            parse_override("ATTACK_DAMAGE=lots")
+        with self.assertRaises(argparse.ArgumentTypeError):
+            parse_override("ATTACK_DAMAGE")
+
+
+if __name__ == "__main__":
+    unittest.main()
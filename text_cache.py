@@ -0,0 +1,52 @@
+from collections import OrderedDict
+
+# Shared cache of rendered text surfaces for gc.2.py and SWAP1.py. Most HUD
+# strings repeat frame after frame, so rasterising them once is enough.
+
+TEXT_CACHE_SIZE = 512
+
+
+class TextCache:
+    """LRU cache of font.render() results keyed by (font, text, colour)."""
+
+    def __init__(self, max_size=TEXT_CACHE_SIZE):
+        self.max_size = max_size
+        self.surfaces = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def render(self, font, text, color, antialias=True):
+        key = (font, text, tuple(color), antialias)
+        surface = self.surfaces.get(key)
+        if surface is not None:
+            self.hits += 1
+            self.surfaces.move_to_end(key)
+            return surface
+        self.misses += 1
+        surface = font.render(text, antialias, color)
+        self.surfaces[key] = surface
+        if len(self.surfaces) > self.max_size:
+            self.surfaces.popitem(last=False)
+            self.evictions += 1
+        return surface
+
+    def clear(self):
+        self.surfaces.clear()
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self.surfaces),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+
+TEXT_CACHE = TextCache()
+
+
+def render_text(font, text, color, antialias=True):
+    return TEXT_CACHE.render(font, text, color, antialias)
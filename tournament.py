@@ -0,0 +1,161 @@
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import arena_sim
+from arena_bots import ScriptedBot, bot_policy
+from arena_sim import CLASSES, ROLE_NAMES, TICK_RATE, new_match, run_match
+
+# Plays every ordered pairing of the selectable roles N times with scripted
+# bots and prints a win-rate matrix. Matches are spread over a process pool
+# in small batches of seeds so the per-task overhead stays low.
+
+BATCHES_PER_WORKER = 8
+# arena_sim constants that --set may change. Each is read from the module
+# at the point of use, so a new value takes effect in every worker; others
+# (TICK_RATE, WIDTH, CLASSES, ...) are derived from or imported elsewhere.
+OVERRIDABLE = (
+    "ATTACK_DAMAGE", "SKILL_DAMAGE", "UNIVERSAL_COOLDOWN", "ATTACK_COOLDOWN",
+    "MOVE_SCALE", "PROJECTILE_SPEED", "BEAST_ATTACK_RANGE",
+)
+# CLASSES fields the sim actually reads, per class. Other fields, such as
+# Mage.attackDamage (the fireball uses SKILL_DAMAGE), would parse but change
+# nothing, so they are rejected too.
+OVERRIDABLE_FIELDS = {
+    "Knight": ("maxHp", "speed", "shield_duration"),
+    "Assassin": ("maxHp", "speed", "stealth_duration"),
+    "Mage": ("maxHp", "speed"),
+    "Healer": ("maxHp", "speed"),
+    "Summoner": ("maxHp", "speed"),
+    "Warrior": ("maxHp", "speed", "charge_speed", "charge_duration", "charge_damage"),
+    "Beast": ("maxHp", "speed", "attackDamage", "attackCooldown", "lifespan"),
+}
+
+
+def parse_override(text):
+    """'ATTACK_DAMAGE=30' or 'Mage.speed=1.7' -> (target, key, value)."""
+    name, sep, raw = text.partition("=")
+    if not sep:
+        raise argparse.ArgumentTypeError(f"expected NAME=VALUE, got {text!r}")
+    try:
+        value = float(raw)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected a number for {name}, got {raw!r}") from None
+    if value.is_integer() and "." not in raw:
+        value = int(value)
+    cls, dot, field = name.partition(".")
+    if dot:
+        if cls not in OVERRIDABLE_FIELDS:
+            raise argparse.ArgumentTypeError(f"can't override {name!r}; choose a class from "
+                                             f"{', '.join(OVERRIDABLE_FIELDS)}")
+        if field not in OVERRIDABLE_FIELDS[cls]:
+            raise argparse.ArgumentTypeError(f"can't override {name!r}; choose from "
+                                             f"{', '.join(f'{cls}.{f}' for f in OVERRIDABLE_FIELDS[cls])}")
+        return cls, field, value
+    if name not in OVERRIDABLE:
+        raise argparse.ArgumentTypeError(f"can't override {name!r}; choose from {', '.join(OVERRIDABLE)}")
+    return None, name, value
+
+
+def apply_overrides(overrides):
+    for cls, key, value in overrides:
+        if cls is None:
+            setattr(arena_sim, key, value)
+        else:
+            CLASSES[cls][key] = value
+
+
+def play_batch(role1, role2, seeds, max_ticks):
+    """Plays one match per seed; returns a list of (winner side or None, ticks)."""
+    results = []
+    for seed in seeds:
+        state = new_match("1", role1, "2", role2, seed=seed)
+        policy = bot_policy(ScriptedBot(0, seed * 2 + 1), ScriptedBot(1, seed * 2 + 2))
+        winner = run_match(state, policy, max_ticks)
+        side = None if winner is None else (0 if winner == state["player1"].id else 1)
+        results.append((side, state["tick"]))
+    return results
+
+
+def run_tournament(n, workers, max_ticks, seed=0, overrides=()):
+    roles = ROLE_NAMES
+    # Enough batches per worker that a slow pairing can't leave cores idle
+    batch = max(1, min(n, len(roles) ** 2 * n // (workers * BATCHES_PER_WORKER)))
+    jobs = []
+    for i, role1 in enumerate(roles):
+        for j, role2 in enumerate(roles):
+            base = seed + (i * len(roles) + j) * n
+            for lo in range(base, base + n, batch):
+                jobs.append((role1, role2, list(range(lo, min(lo + batch, base + n)))))
+
+    wins = {a: {b: 0 for b in roles} for a in roles}
+    games = {a: {b: 0 for b in roles} for a in roles}
+    draws = 0
+    total_ticks = 0
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers, initializer=apply_overrides, initargs=(overrides,)) as pool:
+        futures = [pool.submit(play_batch, role1, role2, seeds, max_ticks) for role1, role2, seeds in jobs]
+        for (role1, role2, _), future in zip(jobs, futures):
+            for side, ticks in future.result():
+                total_ticks += ticks
+                # A mirror match counts as one game for each side
+                games[role1][role2] += 1
+                games[role2][role1] += 1
+                if side is None:
+                    draws += 1
+                else:
+                    winner, loser = (role1, role2) if side == 0 else (role2, role1)
+                    wins[winner][loser] += 1
+    elapsed = time.perf_counter() - start
+
+    matches = len(roles) ** 2 * n
+    return {
+        "roles": roles,
+        "matches": matches,
+        "draws": draws,
+        "workers": workers,
+        "elapsed": elapsed,
+        "matches_per_sec": matches / elapsed if elapsed else 0.0,
+        "avg_match_seconds": total_ticks / matches / TICK_RATE if matches else 0.0,
+        # Row role's win rate against the column role, both sides pooled
+        "win_rate": {a: {b: wins[a][b] / games[a][b] if games[a][b] else 0.0 for b in roles} for a in roles},
+    }
+
+
+def print_report(report, out=sys.stdout):
+    roles = report["roles"]
+    width = max(len(r) for r in roles) + 2
+    print("win rate (row vs column)".ljust(width) + "".join(r[:8].rjust(9) for r in roles), file=out)
+    for a in roles:
+        print(a.ljust(width) + "".join(f"{report['win_rate'][a][b]:9.2f}" for b in roles), file=out)
+    print(f"\n{report['matches']} matches, {report['draws']} draws, "
+          f"avg match {report['avg_match_seconds']:.1f}s", file=out)
+    print(f"{report['elapsed']:.2f}s on {report['workers']} workers, "
+          f"{report['matches_per_sec']:.1f} matches/s", file=out)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Round-robin class matchup tournament with scripted bots.")
+    parser.add_argument("-n", "--matches", type=int, default=20, help="matches per ordered pairing")
+    parser.add_argument("-w", "--workers", type=int, default=os.cpu_count(), help="worker processes")
+    parser.add_argument("--max-seconds", type=float, default=180, help="simulated time limit before a draw")
+    parser.add_argument("--seed", type=int, default=0, help="first match seed")
+    parser.add_argument("--set", dest="overrides", type=parse_override, action="append", default=[],
+                        metavar="NAME=VALUE", help="override a constant, e.g. ATTACK_DAMAGE=30 or Mage.speed=1.7")
+    parser.add_argument("--json", metavar="PATH", help="also write the report as JSON")
+    args = parser.parse_args(argv)
+
+    apply_overrides(args.overrides)
+    report = run_tournament(args.matches, args.workers, int(args.max_seconds * TICK_RATE),
+                            args.seed, args.overrides)
+    print_report(report)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()